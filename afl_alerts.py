@@ -0,0 +1,188 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from main_hedge_analysis import BettingOpportunity
+
+class OpportunityAlert(NamedTuple):
+    """One notification about a tracked opportunity"""
+    kind: str  # 'opened', 'updated' or 'closed'
+    key: tuple  # (match, opportunity type, outcomes, books)
+    opportunity: BettingOpportunity  # best-priced member; the last one seen for 'closed'
+    books: Tuple[str, ...]  # every book offering this edge (value bets at the same edge are coalesced)
+    first_seen: float
+    timestamp: float
+
+@dataclass
+class TrackedOpportunity:
+    """Tracker state for one opportunity, announced or still waiting out its minimum lifetime"""
+    key: tuple
+    opportunity: BettingOpportunity
+    books: Tuple[str, ...]
+    first_seen: float
+    last_seen: float
+    announced: bool = False
+    reported_profit: float = 0.0
+    reported_books: Tuple[str, ...] = ()
+
+def outcomes(opp: BettingOpportunity) -> Tuple[str, ...]:
+    """Teams the opportunity stakes on, sorted"""
+    return tuple(sorted({stake['team'] for stake in opp.stake_distribution.values()}))
+
+def coalesce(opportunities: Iterable[BettingOpportunity],
+             tolerance: float = 0.1) -> List[Tuple[BettingOpportunity, Tuple[str, ...]]]:
+    """
+    (best opportunity, books) groups: value bets on the same team whose edges are within tolerance
+    percentage points of each other become one group, every other opportunity is a group of its own
+    """
+    groups = []
+    value_bets: Dict[Tuple[str, Tuple[str, ...]], List[BettingOpportunity]] = {}
+    for opp in opportunities:
+        if opp.opportunity_type == 'value_bet':
+            value_bets.setdefault((opp.match, outcomes(opp)), []).append(opp)
+        else:
+            groups.append((opp, tuple(sorted(opp.stake_distribution))))
+    
+    for same_team in value_bets.values():
+        same_team.sort(key=lambda opp: opp.profit_percentage, reverse=True)
+        head, books = same_team[0], set(same_team[0].stake_distribution)
+        for opp in same_team[1:]:
+            if head.profit_percentage - opp.profit_percentage <= tolerance:
+                books.update(opp.stake_distribution)
+                continue
+            groups.append((head, tuple(sorted(books))))
+            head, books = opp, set(opp.stake_distribution)
+        groups.append((head, tuple(sorted(books))))
+    
+    return groups
+
+class OpportunityTracker:
+    def __init__(self, enter_threshold: float = 1.0, exit_threshold: float = 0.5, min_lifetime: float = 10.0,
+                 update_step: float = 0.25, coalesce_tolerance: float = 0.1,
+                 value_enter_threshold: float = 5.0, value_exit_threshold: float = 4.5):
+        """
+        Turn repeated opportunity snapshots into one 'opened' alert per opportunity, plus updates and a 'closed'
+        
+        An opportunity opens once it has stayed above exit_threshold for min_lifetime seconds and its profit is
+        at enter_threshold or better at that moment, then stays open until it drops below exit_threshold or
+        disappears. Value bets use value_enter_threshold/value_exit_threshold on their edge instead. Run the
+        finder with min_profit_percentage at (or below) exit_threshold and min_value_edge at (or below)
+        value_exit_threshold so the band in between is visible.
+        
+        Args:
+            enter_threshold: Profit percentage a new opportunity needs before it's tracked
+            exit_threshold: Profit percentage below which a tracked opportunity is dropped
+            min_lifetime: Seconds an opportunity must persist before it's announced
+            update_step: Profit change (percentage points) since the last alert before an 'updated' fires
+            coalesce_tolerance: Value bets on one team within this many percentage points are one alert
+            value_enter_threshold: Edge percentage a new value bet needs before it's tracked
+            value_exit_threshold: Edge percentage below which a tracked value bet is dropped
+        """
+        if exit_threshold > enter_threshold or value_exit_threshold > value_enter_threshold:
+            raise ValueError("exit thresholds must not be above their enter thresholds")
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        # opportunity type -> (enter, exit); arbitrage and anything else use the profit thresholds
+        self.thresholds = {'value_bet': (value_enter_threshold, value_exit_threshold)}
+        self.min_lifetime = min_lifetime
+        self.update_step = update_step
+        self.coalesce_tolerance = coalesce_tolerance
+        
+        # key -> state for every opportunity above the exit threshold
+        self.tracked: Dict[tuple, TrackedOpportunity] = {}
+        # (match, opportunity type, outcomes) -> keys of tracked opportunities, so moved groups are found directly
+        self.by_outcome: Dict[tuple, Set[tuple]] = {}
+        
+        self.observed = 0
+        self.suppressed = 0  # opportunities that vanished before min_lifetime
+        self.alerts = {'opened': 0, 'updated': 0, 'closed': 0}
+    
+    def observe(self, opportunities: Iterable[BettingOpportunity], now: Optional[float] = None,
+                matches: Optional[Iterable[str]] = None) -> List[OpportunityAlert]:
+        """
+        Feed the current opportunities and get back the alerts they cause
+        
+        Pass matches (match names) when only those were re-evaluated; tracked opportunities on other
+        matches are then left alone instead of being treated as gone.
+        """
+        now = time.time() if now is None else now
+        scope = set(matches) if matches is not None else None
+        alerts = []
+        seen = set()
+        
+        for opp, books in coalesce(opportunities, self.coalesce_tolerance):
+            self.observed += 1
+            key = (opp.match, opp.opportunity_type, outcomes(opp), books)
+            state = self.tracked.get(key) or self._find_moved(key, seen)
+            enter_threshold, exit_threshold = self.thresholds.get(
+                opp.opportunity_type, (self.enter_threshold, self.exit_threshold))
+            
+            if state is None:
+                if opp.profit_percentage < enter_threshold:
+                    continue
+                state = TrackedOpportunity(key, opp, books, first_seen=now, last_seen=now)
+            elif opp.profit_percentage < exit_threshold:
+                continue
+            
+            if state.key != key:
+                # Same edge, but a book joined or left the group (or the best book moved)
+                self._untrack(state.key)
+                state.key = key
+            self.tracked[key] = state
+            self.by_outcome.setdefault(key[:3], set()).add(key)
+            state.opportunity, state.books, state.last_seen = opp, books, now
+            seen.add(key)
+            
+            if not state.announced:
+                # A dip into the band keeps it tracked, but it's only announced while back at the enter bar
+                if now - state.first_seen >= self.min_lifetime and opp.profit_percentage >= enter_threshold:
+                    state.announced = True
+                    alerts.append(self._alert('opened', state, now))
+            elif (abs(opp.profit_percentage - state.reported_profit) >= self.update_step
+                  or books != state.reported_books):
+                alerts.append(self._alert('updated', state, now))
+        
+        for key, state in list(self.tracked.items()):
+            if key in seen or (scope is not None and key[0] not in scope):
+                continue
+            self._untrack(key)
+            if state.announced:
+                alerts.append(self._alert('closed', state, now))
+            else:
+                self.suppressed += 1
+        
+        return alerts
+    
+    def active(self) -> List[TrackedOpportunity]:
+        """Announced opportunities that are still open"""
+        return [state for state in self.tracked.values() if state.announced]
+    
+    def report(self) -> Dict:
+        return {'observed': self.observed, 'suppressed': self.suppressed, 'open': len(self.active()), **self.alerts}
+    
+    def print_report(self):
+        stats = self.report()
+        print(f"\nAlerts: {stats['opened']} opened, {stats['updated']} updated, {stats['closed']} closed "
+              f"from {stats['observed']} observed opportunities ({stats['suppressed']} flickers suppressed, "
+              f"{stats['open']} still open)")
+    
+    def _find_moved(self, key: tuple, seen: set) -> Optional[TrackedOpportunity]:
+        """Not-yet-seen tracked opportunity on the same match and outcomes sharing a book with this key"""
+        books = set(key[3])
+        for candidate in self.by_outcome.get(key[:3], ()):
+            if candidate not in seen and books.intersection(candidate[3]):
+                return self.tracked[candidate]
+        return None
+    
+    def _untrack(self, key: tuple):
+        del self.tracked[key]
+        keys = self.by_outcome[key[:3]]
+        keys.discard(key)
+        if not keys:
+            del self.by_outcome[key[:3]]
+    
+    def _alert(self, kind: str, state: TrackedOpportunity, now: float) -> OpportunityAlert:
+        self.alerts[kind] += 1
+        state.reported_profit = state.opportunity.profit_percentage
+        state.reported_books = state.books
+        return OpportunityAlert(kind, state.key, state.opportunity, state.books, state.first_seen, now)
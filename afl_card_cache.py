@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+class CardCache:
+    def __init__(self, max_entries: int = 256):
+        """
+        Reuse the parsed records of event cards whose HTML is unchanged since an earlier poll
+        
+        Args:
+            max_entries: Cards remembered per bookmaker; the least recently seen (finished or re-priced) go first
+        """
+        self.max_entries = max_entries
+        
+        # bookmaker -> card HTML digest -> records parsed from that card, most recently seen last
+        self._entries: Dict[str, OrderedDict] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def digest(card_html: str) -> bytes:
+        return hashlib.blake2b(card_html.encode('utf-8'), digest_size=16).digest()
+    
+    def parse(self, name: str, card_html: List[str],
+              parse_cards: Callable[[List[str]], List[List[Dict]]]) -> List[Dict]:
+        """Records for every card, running parse_cards only on the cards not seen before"""
+        keys = [self.digest(html) for html in card_html]
+        
+        with self._lock:
+            entries = self._entries.setdefault(name, OrderedDict())
+            misses = [i for i, key in enumerate(keys) if key not in entries]
+        
+        parsed = parse_cards([card_html[i] for i in misses]) if misses else []
+        
+        with self._lock:
+            for i, records in zip(misses, parsed):
+                entries[keys[i]] = records
+            
+            matches = []
+            for key in keys:
+                entries.move_to_end(key)
+                # Copies, so callers updating a record in place can't corrupt the cache
+                matches.extend(dict(record) for record in entries[key])
+            
+            evictions = 0
+            while len(entries) > max(self.max_entries, len(keys)):
+                entries.popitem(last=False)
+                evictions += 1
+            
+            stats = self.stats.setdefault(name, {'hits': 0, 'misses': 0, 'evictions': 0})
+            stats['hits'] += len(keys) - len(misses)
+            stats['misses'] += len(misses)
+            stats['evictions'] += evictions
+        
+        return matches
+    
+    def clear(self, name: Optional[str] = None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+    
+    def report(self) -> Dict[str, Dict]:
+        """Hit rate, cached cards and evictions per bookmaker"""
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    'hit_rate': stats['hits'] / (stats['hits'] + stats['misses']) if stats['hits'] + stats['misses'] else 0.0,
+                    'cached': len(self._entries.get(name, ()))
+                }
+                for name, stats in self.stats.items()
+            }
+    
+    def print_report(self):
+        print("\nEvent card cache:")
+        for name, stats in self.report().items():
+            print(f"  {name}: {stats['hit_rate']:.0%} hit rate ({stats['hits']} hits, {stats['misses']} parsed), "
+                  f"{stats['cached']} cached, {stats['evictions']} evicted")
@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional
+
+class CircuitBreaker:
+    """Consecutive-failure tracking with exponential backoff for one bookmaker"""
+    
+    def __init__(self, failure_threshold: int = 2, base_backoff: float = 60.0, max_backoff: float = 30 * 60):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.state = 'closed'  # 'closed' (scrape), 'open' (skip until open_until), 'half_open' (one trial scrape)
+        self.consecutive_failures = 0
+        self.trips = 0  # times opened since the last success; sets the backoff exponent
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self.failures = 0
+        self.successes = 0
+    
+    def allow(self, now: float) -> bool:
+        if self.state == 'open' and now >= self.open_until:
+            self.state = 'half_open'
+        return self.state != 'open'
+    
+    def record_success(self):
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.successes += 1
+    
+    def record_failure(self, reason: str, now: float) -> bool:
+        """Count a failure; returns True when it opened the circuit"""
+        self.consecutive_failures += 1
+        self.failures += 1
+        self.last_error = reason
+        
+        # A failed trial reopens straight away, with the next (doubled) backoff
+        if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+            self.trips += 1
+            self.state = 'open'
+            self.open_until = now + self.backoff()
+            return True
+        return False
+    
+    def backoff(self) -> float:
+        return min(self.max_backoff, self.base_backoff * 2 ** max(0, self.trips - 1))
+
+class CircuitBreakers:
+    def __init__(self, failure_threshold: int = 2, base_backoff: float = 60.0, max_backoff: float = 30 * 60):
+        """
+        One circuit breaker per bookmaker, so a book that keeps failing stops costing every snapshot
+        
+        Args:
+            failure_threshold: Consecutive failed snapshots (error, no odds or missed deadline) that open the circuit
+            base_backoff: Seconds the first opening skips the book for; doubles on each reopening
+            max_backoff: Upper bound on the skip period
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+    
+    def breaker(self, name: str) -> CircuitBreaker:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(self.failure_threshold, self.base_backoff, self.max_backoff)
+        return self.breakers[name]
+    
+    def allow(self, name: str) -> bool:
+        """True if the book should be scraped this snapshot (closed, or due a half-open trial)"""
+        with self._lock:
+            return self.breaker(name).allow(time.time())
+    
+    def record_success(self, name: str):
+        with self._lock:
+            breaker = self.breaker(name)
+            recovered = breaker.state == 'half_open'
+            breaker.record_success()
+        if recovered:
+            print(f"🔌 {name} recovered; circuit closed")
+    
+    def record_failure(self, name: str, reason: str):
+        with self._lock:
+            breaker = self.breaker(name)
+            opened = breaker.record_failure(reason, time.time())
+        if opened:
+            print(f"🔌 {name} circuit opened after {breaker.consecutive_failures} failed snapshots ({reason}); "
+                  f"skipping it for {breaker.backoff():.0f}s")
+    
+    def describe(self, name: str) -> str:
+        breaker = self.breaker(name)
+        return f"{breaker.last_error}, retry in {max(0.0, breaker.open_until - time.time()):.0f}s"
+    
+    def report(self) -> Dict[str, Dict]:
+        """Breaker state per bookmaker, for the snapshot metrics"""
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    'state': breaker.state,
+                    'consecutive_failures': breaker.consecutive_failures,
+                    'trips': breaker.trips,
+                    'retry_in': max(0.0, breaker.open_until - now) if breaker.state == 'open' else 0.0,
+                    'last_error': breaker.last_error,
+                    'failures': breaker.failures,
+                    'successes': breaker.successes
+                }
+                for name, breaker in self.breakers.items()
+            }
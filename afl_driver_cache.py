@@ -0,0 +1,96 @@
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.afl_chromedriver.json')
+
+def chrome_version() -> Optional[str]:
+    """Installed Chrome version from the local binary/registry, without touching the network"""
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+def major_version(version: Optional[str]) -> Optional[str]:
+    return version.split('.')[0] if version else None
+
+class DriverCache:
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH,
+                 install: Optional[Callable[[], str]] = None):
+        """
+        Remember which ChromeDriver binary matches the installed Chrome, so startup is a filesystem lookup
+        
+        Args:
+            index_path: JSON file mapping Chrome major version -> resolved driver path
+            install: Fallback that downloads/locates a matching driver (default ChromeDriverManager().install)
+        """
+        self.index_path = index_path
+        self.install = install or (lambda: ChromeDriverManager().install())
+        
+        # How the most recent resolve() was answered: source ('cache' / 'manager' / 'stale'), seconds, version
+        self.last_resolution: Dict = {}
+    
+    def resolve(self) -> str:
+        """Path to a ChromeDriver for the installed Chrome; only asks the manager on a version mismatch"""
+        start = time.perf_counter()
+        index = self._load_index()
+        version = chrome_version()
+        major = major_version(version)
+        
+        entry = index.get(major) if major else None
+        if entry and self._usable(entry['path']):
+            return self._resolved(entry['path'], 'cache', version, start)
+        
+        try:
+            path = self.install()
+        except Exception:
+            # Offline: better to try the newest driver we already have than not start at all
+            fallback = self._newest_entry(index)
+            if fallback is None:
+                raise
+            print(f"⚠ ChromeDriver lookup failed; reusing the driver for Chrome {fallback['chrome_version']}")
+            return self._resolved(fallback['path'], 'stale', version, start)
+        
+        if major:
+            index[major] = {'path': path, 'chrome_version': version, 'resolved_at': time.time()}
+            self._save_index(index)
+        return self._resolved(path, 'manager', version, start)
+    
+    def clear(self):
+        """Forget every cached driver path (the binaries themselves are left in place)"""
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+    
+    def _resolved(self, path: str, source: str, version: Optional[str], start: float) -> str:
+        self.last_resolution = {
+            'source': source,
+            'seconds': time.perf_counter() - start,
+            'chrome_version': version,
+            'path': path
+        }
+        return path
+    
+    def _usable(self, path: str) -> bool:
+        return os.path.isfile(path) and os.access(path, os.X_OK)
+    
+    def _newest_entry(self, index: Dict[str, Dict]) -> Optional[Dict]:
+        usable = [entry for entry in index.values() if self._usable(entry['path'])]
+        return max(usable, key=lambda entry: entry['resolved_at'], default=None)
+    
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_index(self, index: Dict[str, Dict]):
+        # Write-then-rename so a parallel start never reads a half-written index
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
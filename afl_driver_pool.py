@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, List, Optional
+
+# Seconds acquire() waits for a busy pool before giving up
+DEFAULT_ACQUIRE_TIMEOUT = 120.0
+
+class PooledSession:
+    """A long-lived Chrome session plus the bookmaker tabs it keeps open"""
+    
+    def __init__(self, session_id: int, driver):
+        self.session_id = session_id
+        self.driver = driver
+        self.tabs: Dict[str, str] = {}  # tab key (bookmaker) -> window handle
+        self.created_at = time.time()
+        self.uses = 0
+        self.last_js_heap_mb = 0.0
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+class DriverPool:
+    def __init__(self, create_driver: Callable, size: int = 1, max_js_heap_mb: float = 1024,
+                 max_uses: int = 500, max_age_seconds: float = 6 * 60 * 60):
+        """
+        Keep a fixed number of warm Chrome sessions alive across snapshots
+        
+        Args:
+            create_driver: Zero-argument callable that launches a new WebDriver
+            size: Maximum number of concurrent browser sessions
+            max_js_heap_mb: Recycle a session once its tabs' JS heaps (performance.memory) exceed this total;
+                a leak guard for the pages, not a cap on the browser process's own memory
+            max_uses: Recycle a session after this many acquire/release cycles
+            max_age_seconds: Recycle a session once it has been alive this long
+        """
+        self.create_driver = create_driver
+        self.size = size
+        self.max_js_heap_mb = max_js_heap_mb
+        self.max_uses = max_uses
+        self.max_age_seconds = max_age_seconds
+        
+        # Idle sessions; waiters are woken when one comes back or a failed launch frees its slot
+        self._idle: Deque[PooledSession] = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._sessions: List[PooledSession] = []
+        # Slots reserved by launches in progress (Chrome starts outside the lock)
+        self._launching = 0
+        self._next_id = 1
+        self._closed = False
+        
+        self.stats = {
+            'created': 0,
+            'recycled': 0,
+            'health_failures': 0,
+            'js_heap_recycles': 0
+        }
+    
+    def acquire(self, timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT) -> PooledSession:
+        """Get a warm session, launching a new one while the pool has a free slot (timeout None waits forever)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    return self._idle.popleft()
+                if len(self._sessions) + self._launching < self.size:
+                    # Reserve the slot, then start Chrome without holding up other callers
+                    self._launching += 1
+                    break
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser session became free within {timeout}s")
+                self._available.wait(remaining)
+        
+        return self._launch_session()
+    
+    def release(self, session: PooledSession):
+        """Return a session to the pool, recycling it if it is unhealthy or leaking"""
+        session.uses += 1
+        
+        if self._closed:
+            self._quit(session)
+            return
+        
+        reason = self._recycle_reason(session)
+        if reason:
+            print(f"♻ Recycling browser session {session.session_id}: {reason}")
+            session = self._replace(session)
+            if session is None:
+                return
+        
+        with self._available:
+            self._idle.append(session)
+            self._available.notify()
+    
+    @contextmanager
+    def session(self, timeout: Optional[float] = DEFAULT_ACQUIRE_TIMEOUT):
+        """Context manager wrapper around acquire/release"""
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+    
+    def open_tab(self, session: PooledSession, key: str) -> bool:
+        """Switch the session to the tab kept for key, creating it if needed. Returns True if it was warm."""
+        driver = session.driver
+        handle = session.tabs.get(key)
+        
+        if handle and handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            return True
+        
+        if not session.tabs:
+            # Reuse the window Chrome opened with for the first tab
+            handle = driver.current_window_handle
+        else:
+            driver.switch_to.new_window('tab')
+            handle = driver.current_window_handle
+        
+        session.tabs[key] = handle
+        return False
+    
+    def health_check(self, session: PooledSession) -> bool:
+        """Ping every tab in the session and refresh its memory reading"""
+        try:
+            driver = session.driver
+            handles = set(driver.window_handles)
+            total_bytes = 0
+            
+            for key, handle in list(session.tabs.items()):
+                if handle not in handles:
+                    # Tab crashed or was closed - forget it, it'll be reopened on demand
+                    del session.tabs[key]
+                    continue
+                driver.switch_to.window(handle)
+                used = driver.execute_script(
+                    "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0"
+                )
+                total_bytes += used or 0
+            
+            if not session.tabs:
+                driver.execute_script("return 1")
+            
+            session.last_js_heap_mb = total_bytes / (1024 * 1024)
+            return True
+        except Exception as e:
+            print(f"⚠ Browser session {session.session_id} failed health check: {e}")
+            return False
+    
+    def close(self):
+        """Quit every browser session in the pool"""
+        with self._available:
+            self._closed = True
+            sessions = list(self._sessions)
+            self._sessions.clear()
+            self._idle.clear()
+            # Waiters wake up to find the pool closed
+            self._available.notify_all()
+        
+        for session in sessions:
+            self._quit(session)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _launch_session(self) -> PooledSession:
+        """Start a new browser session into a slot the caller reserved (called without the lock held)"""
+        try:
+            driver = self.create_driver()
+        except Exception:
+            with self._available:
+                # Give the slot back and let a waiter try the launch
+                self._launching -= 1
+                self._available.notify()
+            raise
+        
+        with self._available:
+            self._launching -= 1
+            closed = self._closed
+            if not closed:
+                session = PooledSession(self._next_id, driver)
+                self._next_id += 1
+                self._sessions.append(session)
+                self.stats['created'] += 1
+                print(f"✓ Browser session {session.session_id} started ({len(self._sessions)}/{self.size})")
+        
+        if closed:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            raise RuntimeError("Driver pool closed while a browser session was starting")
+        return session
+    
+    def _recycle_reason(self, session: PooledSession) -> Optional[str]:
+        """Work out whether a session should be thrown away"""
+        if not self.health_check(session):
+            self.stats['health_failures'] += 1
+            return "failed health check"
+        
+        if session.last_js_heap_mb > self.max_js_heap_mb:
+            self.stats['js_heap_recycles'] += 1
+            return f"JS heap {session.last_js_heap_mb:.0f}MB over {self.max_js_heap_mb:.0f}MB cap"
+        
+        if session.uses >= self.max_uses:
+            return f"reached {self.max_uses} uses"
+        
+        if session.age >= self.max_age_seconds:
+            return f"older than {self.max_age_seconds:.0f}s"
+        
+        return None
+    
+    def _replace(self, session: PooledSession) -> Optional[PooledSession]:
+        """Quit a session and start a fresh one in its slot"""
+        self._quit(session)
+        self.stats['recycled'] += 1
+        
+        with self._available:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            self._launching += 1
+        
+        try:
+            return self._launch_session()
+        except Exception as e:
+            # _launch_session already freed the slot and woke a waiter to retry the launch
+            print(f"✗ Error relaunching browser session: {e}")
+            return None
+    
+    def _quit(self, session: PooledSession):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
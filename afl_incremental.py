@@ -0,0 +1,119 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from afl_market_book import MarketBook
+from main_hedge_analysis import AFLOpportunityFinder, BettingOpportunity
+
+# Most recent update() timings kept for the latency percentiles
+SAMPLE_WINDOW = 10000
+
+class OpportunityChange(NamedTuple):
+    """An opportunity that appeared, moved or went away after a price update"""
+    kind: str  # 'added', 'changed' or 'removed'
+    match_key: Hashable
+    opportunity_id: tuple  # ('arbitrage',) or ('value_bet', bookmaker, side)
+    opportunity: BettingOpportunity  # the new version, or the last one seen for 'removed'
+
+def opportunity_id(opp: BettingOpportunity) -> tuple:
+    if opp.opportunity_type == 'arbitrage':
+        return ('arbitrage',)
+    bookmaker, stake = next(iter(opp.stake_distribution.items()))
+    return ('value_bet', bookmaker, 'home' if stake['team'] == opp.home_team else 'away')
+
+class IncrementalEvaluator:
+    def __init__(self, finder: AFLOpportunityFinder, book: Optional[MarketBook] = None):
+        """
+        Re-evaluate only the matches a price update touches and report how their opportunities changed
+        
+        Args:
+            finder: Opportunity finder supplying the thresholds and stake sizing
+            book: Market book to evaluate against (a new empty one by default); share the watcher's
+                book and call refresh() if something else applies the prices
+        """
+        self.finder = finder
+        # Not `book or ...`: a shared book is usually still empty (falsy, it has a __len__) when handed over
+        self.book = book if book is not None else MarketBook()
+        
+        # match key -> fair (home, away) probabilities from its latest evaluation
+        self.fair: Dict[Hashable, Tuple[float, float]] = {}
+        # match key -> opportunity id -> opportunity currently open on that match
+        self.current: Dict[Hashable, Dict[tuple, BettingOpportunity]] = {}
+        
+        self.updates = 0
+        self.update_seconds: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self.max_update_seconds = 0.0
+    
+    def load(self, matches: Iterable[Dict]) -> List[OpportunityChange]:
+        """Add consolidated matches to the book and evaluate them all once"""
+        return self.refresh(self.book.load(matches))
+    
+    def update(self, match_key: Hashable, bookmaker: str, side: str,
+               price: Optional[float]) -> List[OpportunityChange]:
+        """Apply one (match, bookmaker, outcome, new price) update; None withdraws the price"""
+        start = time.perf_counter()
+        changes = self.refresh([match_key]) if self.book.set_quote(match_key, bookmaker, side, price) else []
+        elapsed = time.perf_counter() - start
+        self.updates += 1
+        self.update_seconds.append(elapsed)
+        self.max_update_seconds = max(self.max_update_seconds, elapsed)
+        return changes
+    
+    def apply(self, updates: Iterable[Tuple[Hashable, str, str, Optional[float]]]) -> List[OpportunityChange]:
+        """Apply a stream of updates in order, returning every change they caused"""
+        changes = []
+        for match_key, bookmaker, side, price in updates:
+            changes.extend(self.update(match_key, bookmaker, side, price))
+        return changes
+    
+    def refresh(self, keys: Iterable[Hashable]) -> List[OpportunityChange]:
+        """Re-evaluate these matches against the book's current prices"""
+        changes = []
+        for key in dict.fromkeys(keys):
+            if key not in self.book.matches:
+                continue
+            
+            odds = self.book.odds(key)
+            fair = self.finder._calculate_fair_probabilities(odds)
+            self.fair[key] = fair
+            
+            found = {}
+            arbitrage = self.finder._book_arbitrage(self.book, key)
+            if arbitrage:
+                found[('arbitrage',)] = arbitrage
+            match = {**self.book.matches[key], 'odds': odds}
+            for opp in self.finder._match_value_bets(match, fair_probabilities=fair):
+                found[opportunity_id(opp)] = opp
+            
+            previous = self.current.get(key, {})
+            for opp_id, opp in found.items():
+                if opp_id not in previous:
+                    changes.append(OpportunityChange('added', key, opp_id, opp))
+                elif opp != previous[opp_id]:
+                    changes.append(OpportunityChange('changed', key, opp_id, opp))
+            for opp_id, opp in previous.items():
+                if opp_id not in found:
+                    changes.append(OpportunityChange('removed', key, opp_id, opp))
+            
+            if found:
+                self.current[key] = found
+            else:
+                self.current.pop(key, None)
+        return changes
+    
+    def opportunities(self) -> List[BettingOpportunity]:
+        """Every opportunity currently open, across all matches"""
+        return [opp for found in self.current.values() for opp in found.values()]
+    
+    def report(self) -> Dict:
+        """Per-update latency percentiles (seconds) over the latest SAMPLE_WINDOW updates, max over all of them"""
+        samples = sorted(self.update_seconds)
+        if not samples:
+            return {'updates': 0}
+        return {
+            'updates': self.updates,
+            'p50': samples[len(samples) // 2],
+            'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+            'max': self.max_update_seconds,
+            'open': sum(len(found) for found in self.current.values())
+        }
@@ -0,0 +1,302 @@
+import json
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
+
+from afl_network_capture import NetworkCapture
+from afl_odds_watch import OddsDelta, OddsWatcher
+from afl_selenium_scraper_NEW import AFLSeleniumScraper
+from main_hedge_analysis import AFLOpportunityFinder, BettingOpportunity
+
+# Latency samples kept for the percentile report; older ones roll off in the run-forever loop
+SAMPLE_WINDOW = 10000
+
+def _percentile(samples: Deque[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class InPlayWatcher(OddsWatcher):
+    def __init__(self, scraper: AFLSeleniumScraper, finder: Optional[AFLOpportunityFinder] = None,
+                 idle_sleep: float = 0.02, record_path: Optional[str] = None, quiet: bool = True,
+                 on_opportunity: Optional[Callable[[List[BettingOpportunity]], None]] = None):
+        """
+        Apply bookmaker WebSocket price frames to the in-memory odds book as they arrive
+        
+        Args:
+            scraper: Scraper whose bookmaker pages stay open in one pooled session
+            finder: Opportunity finder run on the updated match after every applied frame
+            idle_sleep: Seconds to wait when the performance log had no new frames
+            record_path: Append every received frame to this JSONL frame log (replay it with bench_inplay.py)
+            quiet: Silence the per-card parser/finder logging
+            on_opportunity: Callback receiving each newly opened arbitrage
+        """
+        # WebSocket frames only reach get_log('performance') when the log is on before Chrome starts
+        if scraper.driver_pool is not None:
+            print("⚠ Driver pool already running; in-play frames need network_capture=True on its scraper")
+        NetworkCapture.enable(scraper.chrome_options)
+        
+        super().__init__(scraper, finder, quiet=quiet, on_opportunity=on_opportunity)
+        self.idle_sleep = idle_sleep
+        self.record_path = record_path
+        
+        # WebSocket requestId -> bookmaker, learned from Network.webSocketCreated
+        self.sockets: Dict[str, str] = {}
+        
+        # match_key -> arbitrage currently open on it (alerts fire when one opens)
+        self.active_arbitrage: Dict[Tuple[int, int], BettingOpportunity] = {}
+        
+        self.frames = 0
+        self.updates = 0
+        self.alerts = 0
+        # bookmaker -> pushed prices whose frame listed the match the other way round from the odds book
+        # (kept here: the scraper's orientation_conflicts only describes its last full consolidation)
+        self.realigned_updates: Counter = Counter()
+        # Seconds spent handling each frame, and from frame arrival (epoch) to its alert, latest SAMPLE_WINDOW
+        self.frame_seconds: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self.alert_latencies: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self._record_file: Optional[TextIO] = None
+        self._started_at = time.time()
+    
+    def start(self):
+        """Load every bookmaker page once and seed the odds book from the rendered cards"""
+        super().start()
+        
+        for name, config in self.scraper.bookmakers.items():
+            self.scraper.driver_pool.open_tab(self.session, name)
+            with self._maybe_quiet():
+                records = self.scraper.read_event_cards(name, config, self.session.driver)
+            self.apply_records(name, records)
+            print(f"  ✓ Seeded {len(records)} {name} matches")
+        
+        self._started_at = time.time()
+    
+    def stop(self):
+        super().stop()
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+    
+    def run(self, max_frames: Optional[int] = None):
+        """Apply pushed frames until interrupted (or max_frames frames)"""
+        print(f"⚡ In-play mode: listening for price frames from {len(self.scraper.bookmakers)} bookmakers...")
+        self.start()
+        
+        try:
+            while max_frames is None or self.frames < max_frames:
+                frames = self.read_frames(self.session.driver)
+                if not frames:
+                    time.sleep(self.idle_sleep)
+                    continue
+                
+                for bookmaker, payload, received_at in frames:
+                    self.handle_frame(bookmaker, payload, received_at)
+        except KeyboardInterrupt:
+            print("\nStopping in-play watcher...")
+        finally:
+            self.stop()
+            self.print_report()
+    
+    def read_frames(self, driver) -> List[Tuple[str, str, float]]:
+        """
+        Drain the performance log, returning (bookmaker, payload, received_at) for every bookmaker text frame
+        
+        received_at is the log entry's own timestamp (epoch seconds), so latencies measured from it include
+        the time frames sat in the log between get_log calls.
+        """
+        frames = []
+        
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message']).get('message', {})
+            method = message.get('method')
+            params = message.get('params', {})
+            
+            if method == 'Network.webSocketCreated':
+                url = params.get('url', '')
+                for name, config in self.scraper.bookmakers.items():
+                    if config['selectors']['ws_url'].search(url):
+                        self.sockets[params['requestId']] = name
+                        print(f"  🔌 {name} socket opened: {url}")
+                        break
+            
+            elif method == 'Network.webSocketFrameReceived':
+                name = self.sockets.get(params.get('requestId'))
+                response = params.get('response', {})
+                # opcode 1 = text; binary frames aren't used for prices
+                if name and response.get('opcode') == 1:
+                    received_at = entry['timestamp'] / 1000 if entry.get('timestamp') else time.time()
+                    frames.append((name, response.get('payloadData', ''), received_at))
+            
+            elif method == 'Network.webSocketClosed' and params.get('requestId') in self.sockets:
+                print(f"  ⚠ {self.sockets.pop(params['requestId'])} socket closed")
+        
+        return frames
+    
+    def handle_frame(self, bookmaker: str, payload: str, received_at: Optional[float] = None) -> List[BettingOpportunity]:
+        """Decode one frame (received_at: its arrival, epoch seconds), apply its prices and check for arbitrage"""
+        start = time.perf_counter()
+        if received_at is None:
+            received_at = time.time()
+        self.frames += 1
+        
+        if self.record_path:
+            self._record(bookmaker, payload, received_at)
+        
+        try:
+            updates = self.scraper.bookmakers[bookmaker]['frame_decoder'](payload)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return []
+        
+        deltas = []
+        for update in updates:
+            delta = self.apply_update(bookmaker, update)
+            if delta:
+                deltas.append(delta)
+        
+        opportunities = []
+        for key in dict.fromkeys(delta.match_key for delta in deltas):
+            opp = self.check_arbitrage(key, received_at)
+            if opp:
+                opportunities.append(opp)
+        
+        self.frame_seconds.append(time.perf_counter() - start)
+        return opportunities
+    
+    def apply_update(self, bookmaker: str, update: Dict) -> Optional[OddsDelta]:
+        """Apply a single pushed price to the odds book, returning the delta if the price moved"""
+        key = self.scraper.teams.match_key(update['home_team'], update['away_team'])
+        record = self.records[bookmaker].get(key)
+        if record is None:
+            # First price for a match the rendered page didn't list; the other side follows in a later frame
+            record = {
+                'home_team': update['home_team'],
+                'away_team': update['away_team'],
+                'home_odds': None,
+                'away_odds': None,
+                'match_time': None,
+                'bookmaker': bookmaker
+            }
+            self.records[bookmaker][key] = record
+        
+        side = update['side']
+        if self.scraper.teams.team_id(update['home_team']) != self.scraper.teams.team_id(record['home_team']):
+            # The frame lists the match the other way round: its home price is the record's away price
+            side = self._other(side)
+            self.realigned_updates[bookmaker] += 1
+        
+        field = f"{side}_odds"
+        old_price = record[field]
+        if old_price == update['price']:
+            return None
+        
+        record[field] = update['price']
+        self.updates += 1
+        # Like the consolidated scans, a book joins the market book once it has priced both sides of the match
+        other = self._other(side)
+        if record[f"{other}_odds"] is not None:
+            if old_price is None:
+                self.book.update(bookmaker, record['home_team'], record['away_team'], other, record[f"{other}_odds"])
+            self.book.update(bookmaker, record['home_team'], record['away_team'], side, update['price'])
+        return OddsDelta(key, bookmaker, side, record['home_team'], record['away_team'],
+                         old_price, update['price'])
+    
+    def check_arbitrage(self, key: Tuple[int, int], received_at: float) -> Optional[BettingOpportunity]:
+        """Re-check one match's best prices; alert when an arbitrage opens, note when it closes"""
+        if self.evaluator is None:
+            return None
+        
+        # The frame's prices are already in the market book: re-evaluate just this match from its best prices
+        self.evaluator.refresh([key])
+        opp = self.evaluator.current.get(key, {}).get(('arbitrage',))
+        
+        if opp is None:
+            closed = self.active_arbitrage.pop(key, None)
+            if closed:
+                print(f"   ✖ Arbitrage closed: {closed.match}")
+            return None
+        
+        is_new = key not in self.active_arbitrage
+        self.active_arbitrage[key] = opp
+        if not is_new:
+            return None
+        
+        latency = time.time() - received_at
+        self.alerts += 1
+        self.alert_latencies.append(latency)
+        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        print(f"[{timestamp}] 🚨 ARBITRAGE: {opp.match} ({opp.profit_percentage:.2f}%) "
+              f"{latency * 1000:.2f}ms after the price frame")
+        if self.on_opportunity:
+            self.on_opportunity([opp])
+        return opp
+    
+    def report(self) -> Dict:
+        """Frame throughput and price-to-alert latency since start"""
+        elapsed = time.time() - self._started_at
+        return {
+            'frames': self.frames,
+            'updates': self.updates,
+            'elapsed': elapsed,
+            'updates_per_s': self.updates / elapsed if elapsed > 0 else 0.0,
+            'frame_p50_ms': _percentile(self.frame_seconds, 50) * 1000,
+            'frame_p99_ms': _percentile(self.frame_seconds, 99) * 1000,
+            'alerts': self.alerts,
+            'realigned': sum(self.realigned_updates.values()),
+            'alert_p50_ms': _percentile(self.alert_latencies, 50) * 1000,
+            'alert_p99_ms': _percentile(self.alert_latencies, 99) * 1000,
+            'alert_max_ms': max(self.alert_latencies, default=0.0) * 1000
+        }
+    
+    def print_report(self):
+        report = self.report()
+        print(f"\nIn-play: {report['frames']} frames, {report['updates']} price updates "
+              f"in {report['elapsed']:.1f}s ({report['updates_per_s']:.0f} updates/s)")
+        print(f"  frame handling p50={report['frame_p50_ms']:.3f}ms p99={report['frame_p99_ms']:.3f}ms")
+        print(f"  price-to-alert ({report['alerts']} alerts) p50={report['alert_p50_ms']:.3f}ms "
+              f"p99={report['alert_p99_ms']:.3f}ms max={report['alert_max_ms']:.3f}ms")
+        if self.realigned_updates:
+            books = ', '.join(f"{name}: {count}" for name, count in self.realigned_updates.items())
+            print(f"  ↔ Realigned {report['realigned']} reversed home/away price frames ({books})")
+    
+    @staticmethod
+    def _other(side: str) -> str:
+        return 'away' if side == 'home' else 'home'
+    
+    def _record(self, bookmaker: str, payload: str, received_at: float):
+        if self._record_file is None:
+            self._record_file = open(self.record_path, 'a')
+        
+        self._record_file.write(json.dumps({
+            't': round(received_at - self._started_at, 4),
+            'bookmaker': bookmaker,
+            'payload': payload
+        }) + "\n")
+
+def main():
+    """Main function to run the in-play watcher"""
+    
+    # Configure your settings
+    BANKROLL = 1000
+    MIN_PROFIT_PERCENTAGE = 1.0
+    MAX_STAKE_PERCENTAGE = 25.0
+    RECORD_PATH = None  # e.g. "inplay_frames.jsonl" to capture a frame log for bench_inplay.py
+    
+    scraper = AFLSeleniumScraper(headless=True, network_capture=True)
+    finder = AFLOpportunityFinder(
+        bankroll=BANKROLL,
+        min_profit_percentage=MIN_PROFIT_PERCENTAGE,
+        max_stake_percentage=MAX_STAKE_PERCENTAGE
+    )
+    
+    watcher = InPlayWatcher(scraper, finder, record_path=RECORD_PATH)
+    try:
+        watcher.run()
+    finally:
+        # No pool when start() failed before creating it; don't mask that error with an AttributeError
+        if scraper.driver_pool is not None:
+            scraper.driver_pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+In-browser odds extractors, run with driver.execute_script
+
+Each script mirrors the matching _parse_*_selenium parser but runs against the live
+DOM and returns only {home_team, away_team, home_odds, away_odds, match_time} records,
+so the page never has to be serialized and re-parsed in Python.
+"""
+
+# Shared helpers prepended to every extractor
+_HELPERS = """
+const text = el => (el ? el.textContent.trim() : '');
+const price = el => {
+    const t = text(el);
+    const n = t === '' ? NaN : Number(t);
+    return Number.isFinite(n) ? n : null;
+};
+const closestMatching = (el, tag, pattern) => {
+    for (let node = el.parentElement; node; node = node.parentElement) {
+        if (node.tagName === tag && pattern.test(node.getAttribute('class') || '')) {
+            return node;
+        }
+    }
+    return null;
+};
+const records = [];
+"""
+
+SPORTSBET_EXTRACTOR = _HELPERS + """
+for (const card of document.querySelectorAll('div[data-automation-id*="competition-event-card"]')) {
+    if (!/\\d+-competition-event-card/.test(card.getAttribute('data-automation-id'))) continue;
+
+    const one = card.querySelector('div[data-automation-id="participant-one"]');
+    const two = card.querySelector('div[data-automation-id="participant-two"]');
+    if (!one || !two) continue;
+
+    // Prefer the Head to Head column, fall back to the first prices on the card
+    let prices = null;
+    for (const label of card.querySelectorAll('div[data-automation-id="market-coupon-label"]')) {
+        if (label.textContent.includes('Head to Head')) {
+            const column = label.closest('div.gridColumn_frfjtr6');
+            if (column) {
+                prices = column.querySelectorAll('span[data-automation-id="price-text"]');
+                break;
+            }
+        }
+    }
+    if (!prices) prices = card.querySelectorAll('span[data-automation-id="price-text"]');
+    if (prices.length < 2) continue;
+
+    const homeOdds = price(prices[0]);
+    const awayOdds = price(prices[1]);
+    if (homeOdds === null || awayOdds === null) continue;
+
+    const timeSpan = card.querySelector('span[data-automation-id="competition-event-card-time"]');
+    const timeEl = timeSpan ? timeSpan.querySelector('time') : null;
+
+    records.push({
+        home_team: text(one),
+        away_team: text(two),
+        home_odds: homeOdds,
+        away_odds: awayOdds,
+        match_time: timeEl ? timeEl.getAttribute('datetime') : null
+    });
+}
+return records;
+"""
+
+LADBROKES_EXTRACTOR = _HELPERS + """
+for (const container of document.querySelectorAll('div[data-testid="team-vs-team"]')) {
+    const card = closestMatching(container, 'DIV', /.*flex.*cursor-pointer.*/);
+    if (!card) continue;
+
+    const teams = container.querySelectorAll('div.flex-shrink');
+    if (teams.length < 2) continue;
+
+    const buttons = card.querySelectorAll('button[data-testid*="price-button-"]');
+    if (buttons.length < 2) continue;
+
+    const homeOdds = price(buttons[0].querySelector('span[data-testid="price-button-odds"]'));
+    const awayOdds = price(buttons[1].querySelector('span[data-testid="price-button-odds"]'));
+    if (homeOdds === null || awayOdds === null) continue;
+
+    const countdown = card.querySelector('div[class*="countdown-badge"]');
+    const countdownSpan = countdown ? countdown.querySelector('span') : null;
+
+    records.push({
+        home_team: text(teams[0]),
+        away_team: text(teams[1]),
+        home_odds: homeOdds,
+        away_odds: awayOdds,
+        match_time: countdownSpan ? text(countdownSpan) : null
+    });
+}
+return records;
+"""
+
+POINTSBET_EXTRACTOR = _HELPERS + """
+for (const event of document.querySelectorAll('div[data-test="event"]')) {
+    const links = event.querySelectorAll('a[data-test*="EventTeamNameWrapperLinkLink"]');
+    if (links.length < 2) continue;
+
+    const teams = [];
+    for (const link of links) {
+        const p = link.querySelector('p');
+        if (p) teams.push(text(p));
+    }
+    if (teams.length < 2) continue;
+
+    const top = event.querySelector('button[data-test*="EventTopMarket0OddsButton"]');
+    const bottom = event.querySelector('button[data-test*="EventBottomMarket0OddsButton"]');
+    if (!top || !bottom) continue;
+
+    const homeOdds = price(top.querySelector('span.fheif50'));
+    const awayOdds = price(bottom.querySelector('span.fheif50'));
+    if (homeOdds === null || awayOdds === null) continue;
+
+    let matchTime = null;
+    const footer = event.querySelector('div[data-test*="EventEventFooter"]');
+    const timeSpan = footer ? footer.querySelector('span[data-test="timeOfDay"]') : null;
+    if (timeSpan) {
+        let dateText = '';
+        for (const span of footer.querySelectorAll('span')) {
+            const t = text(span);
+            if (t === 'Today' || t === 'Tomorrow' || t.toLowerCase().includes('day')) {
+                dateText = t;
+                break;
+            }
+        }
+        matchTime = dateText ? `${dateText}, ${text(timeSpan)}` : text(timeSpan);
+    }
+
+    records.push({
+        home_team: teams[0],
+        away_team: teams[1],
+        home_odds: homeOdds,
+        away_odds: awayOdds,
+        match_time: matchTime
+    });
+}
+return records;
+"""
@@ -0,0 +1,120 @@
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# The bookmakers render wall-clock times ("Today, 7:20pm") in Melbourne time
+BOOKMAKER_TZ = ZoneInfo('Australia/Melbourne')
+
+# Seconds per unit of a ladbrokes countdown badge ("2h 10m", "4 days", "45s")
+COUNTDOWN_UNITS = {'d': 86400, 'day': 86400, 'days': 86400, 'h': 3600, 'hr': 3600, 'hrs': 3600,
+                   'm': 60, 'min': 60, 'mins': 60, 's': 1, 'sec': 1, 'secs': 1}
+COUNTDOWN_PART = re.compile(r'(\d+)\s*(days?|d|hrs?|h|mins?|m|secs?|s)\b', re.IGNORECASE)
+
+WEEKDAYS = {name: i for i, names in enumerate([
+    ('mon', 'monday'), ('tue', 'tues', 'tuesday'), ('wed', 'wednesday'), ('thu', 'thur', 'thurs', 'thursday'),
+    ('fri', 'friday'), ('sat', 'saturday'), ('sun', 'sunday')
+]) for name in names}
+MONTHS = {name: i + 1 for i, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])}
+
+CLOCK_TIME = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?', re.IGNORECASE)
+DAY_MONTH = re.compile(r'(\d{1,2})\s+([a-z]{3})', re.IGNORECASE)
+
+# Badges shown once a match is under way; they carry no kickoff time
+IN_PLAY_BADGES = {'live', 'in play', 'in-play', 'started'}
+
+def parse_kickoff(match_time: Optional[str], observed_at: Optional[float] = None,
+                  tz: ZoneInfo = BOOKMAKER_TZ) -> Optional[Tuple[float, float]]:
+    """
+    Turn any bookmaker's match_time into (epoch seconds, resolution in seconds), or None if it has no kickoff
+    
+    ISO timestamps come from sportsbet and the JSON feeds, countdown badges ("2h 10m", relative to
+    observed_at) from ladbrokes and day/clock text ("Today, 7:20pm", in tz) from pointsbet.
+    """
+    if not match_time:
+        return None
+    text = match_time.strip()
+    if text.lower() in IN_PLAY_BADGES:
+        return None
+    observed_at = time.time() if observed_at is None else observed_at
+    
+    try:
+        kickoff = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    else:
+        if kickoff.tzinfo is None:
+            kickoff = kickoff.replace(tzinfo=tz)
+        return kickoff.timestamp(), 0.0
+    
+    clock = CLOCK_TIME.search(text)
+    if clock:
+        return _parse_day_clock(text, clock, observed_at, tz)
+    
+    parts = COUNTDOWN_PART.findall(text)
+    if parts:
+        units = [COUNTDOWN_UNITS[unit.lower()] for _, unit in parts]
+        seconds = sum(int(value) * unit for (value, _), unit in zip(parts, units))
+        # The badge is truncated to its smallest unit, so the kickoff is anywhere within that unit
+        return observed_at + seconds, float(min(units))
+    
+    return None
+
+def _parse_day_clock(text: str, clock: re.Match, observed_at: float, tz: ZoneInfo) -> Optional[Tuple[float, float]]:
+    """'Today, 7:20pm', 'Tomorrow, 1:45pm', 'Sat, 4:35pm', 'Sat 14 Jun, 7:15pm' or a bare '7:20pm'"""
+    hour = int(clock.group(1)) % 12 + (12 if clock.group(3).lower() == 'p' else 0)
+    minute = int(clock.group(2) or 0)
+    now = datetime.fromtimestamp(observed_at, tz)
+    day_text = text[:clock.start()].strip(' ,').lower()
+    
+    day_month = DAY_MONTH.search(day_text)
+    words = re.findall(r'[a-z]+', day_text)
+    if day_month and day_month.group(2).lower() in MONTHS:
+        day, month = int(day_month.group(1)), MONTHS[day_month.group(2).lower()]
+        # No year on the page: take the nearest one (fixtures run into the next year around December)
+        candidates = []
+        for year in (now.year - 1, now.year, now.year + 1):
+            try:
+                candidates.append(datetime(year, month, day, hour, minute, tzinfo=tz))
+            except ValueError:
+                continue
+        if not candidates:
+            return None
+        kickoff = min(candidates, key=lambda candidate: abs((candidate - now).total_seconds()))
+    else:
+        if 'tomorrow' in words:
+            date = now.date() + timedelta(days=1)
+        elif any(word in WEEKDAYS for word in words):
+            weekday = next(WEEKDAYS[word] for word in words if word in WEEKDAYS)
+            date = now.date() + timedelta(days=(weekday - now.weekday()) % 7)
+        elif not words or 'today' in words:
+            date = now.date()
+        else:
+            return None
+        kickoff = datetime(date.year, date.month, date.day, hour, minute, tzinfo=tz)
+    
+    return kickoff.timestamp(), 60.0
+
+def normalize_kickoffs(records: List[Dict], observed_at: Optional[float] = None,
+                       tz: ZoneInfo = BOOKMAKER_TZ) -> List[Dict]:
+    """Stamp each record with kickoff_ts / kickoff_resolution from its match_time (None when unparseable)"""
+    observed_at = time.time() if observed_at is None else observed_at
+    for record in records:
+        parsed = parse_kickoff(record.get('match_time'), observed_at, tz)
+        record['kickoff_ts'], record['kickoff_resolution'] = parsed if parsed else (None, None)
+    return records
+
+def authoritative_kickoff(records: List[Dict]) -> Optional[Dict]:
+    """The record whose kickoff is known most precisely (an exact timestamp beats a countdown badge)"""
+    timed = [record for record in records if record.get('kickoff_ts') is not None]
+    if not timed:
+        return None
+    return min(timed, key=lambda record: record.get('kickoff_resolution') or 0.0)
+
+def format_kickoff(kickoff_ts: Optional[float], tz: ZoneInfo = BOOKMAKER_TZ) -> Optional[str]:
+    """ISO timestamp in the bookmakers' time zone, for display and the saved snapshot"""
+    if kickoff_ts is None:
+        return None
+    return datetime.fromtimestamp(kickoff_ts, tz).isoformat()
@@ -0,0 +1,178 @@
+from itertools import islice
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from afl_teams import TeamRegistry
+
+OUTCOMES = ('home', 'away')
+
+class MarketBook:
+    def __init__(self, teams: Optional[TeamRegistry] = None):
+        """
+        Live best-price book: every (match, outcome) keeps its bookmaker prices sorted best first
+        
+        Best price is the head of a SortedList, so a price update costs O(log n) and best/top-N reads
+        don't rescan the books. Each match's overround (1/best home + 1/best away) is refreshed on every
+        update and kept in a second SortedList, so arbitrage candidates are a prefix of it.
+        
+        Args:
+            teams: Team registry used to key updates that arrive as team names (the scraper's registry)
+        """
+        self.teams = teams or TeamRegistry()
+        
+        # match key -> {'home_team', 'away_team', 'home_id', 'away_id'} in canonical orientation
+        self.matches: Dict[Hashable, Dict] = {}
+        # match key -> bookmaker -> {'home': price, 'away': price}
+        self.quotes: Dict[Hashable, Dict[str, Dict[str, float]]] = {}
+        
+        # (match key, outcome) -> (-price, bookmaker order, bookmaker); first listed book wins price ties
+        self._ladders: Dict[Tuple[Hashable, str], SortedList] = {}
+        self._book_order: Dict[Hashable, Dict[str, int]] = {}
+        # (match key, outcome) -> (best price, bookmaker), refreshed only when a ladder's head changes
+        self._best: Dict[Tuple[Hashable, str], Optional[Tuple[float, str]]] = {}
+        
+        # (overround, match sequence number) for every match with both outcomes priced
+        self._overround: Dict[Hashable, float] = {}
+        self._by_overround = SortedList()
+        self._seq: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        
+        self.updates = 0
+    
+    @classmethod
+    def from_matches(cls, matches: Iterable[Dict], teams: Optional[TeamRegistry] = None) -> 'MarketBook':
+        """A book holding consolidated matches (AFLSeleniumScraper.consolidate_odds output or a saved snapshot)"""
+        book = cls(teams)
+        book.load(matches)
+        return book
+    
+    def load(self, matches: Iterable[Dict]) -> List[Hashable]:
+        """Add consolidated matches' prices to the book; returns their keys in order"""
+        keys = []
+        for match in matches:
+            if 'home_id' in match:
+                key = self.add_match(match['home_team'], match['away_team'], match['home_id'], match['away_id'])
+                reversed_listing = match['home_id'] != self.matches[key]['home_id']
+            else:
+                key, reversed_listing = self.resolve(match['home_team'], match['away_team'])
+            
+            for bookmaker, prices in match['odds'].items():
+                for side in OUTCOMES:
+                    self.set_quote(key, bookmaker, self._flip(side) if reversed_listing else side, prices[side])
+            keys.append(key)
+        return keys
+    
+    def add_match(self, home_team: str, away_team: str, home_id: int, away_id: int) -> Hashable:
+        """Register a match in this orientation unless it's already known; returns its key"""
+        key = (home_id, away_id) if home_id <= away_id else (away_id, home_id)
+        if key not in self.matches:
+            self.matches[key] = {'home_team': home_team, 'away_team': away_team, 'home_id': home_id, 'away_id': away_id}
+            self.quotes[key] = {}
+            self._book_order[key] = {}
+            self._seq[key] = len(self._keys)
+            self._keys.append(key)
+            for side in OUTCOMES:
+                self._ladders[(key, side)] = SortedList()
+                self._best[(key, side)] = None
+        return key
+    
+    def resolve(self, home_team: str, away_team: str) -> Tuple[Hashable, bool]:
+        """(match key, True if this listing is the reverse of the book's orientation)"""
+        home_id, away_id = self.teams.team_id(home_team), self.teams.team_id(away_team)
+        key = self.add_match(home_team, away_team, home_id, away_id)
+        return key, self.matches[key]['home_id'] != home_id
+    
+    def update(self, bookmaker: str, home_team: str, away_team: str, side: str, price: Optional[float]) -> Hashable:
+        """Apply one streamed price as listed by the bookmaker (None withdraws it); returns the match key"""
+        key, reversed_listing = self.resolve(home_team, away_team)
+        self.set_quote(key, bookmaker, self._flip(side) if reversed_listing else side, price)
+        return key
+    
+    def set_quote(self, key: Hashable, bookmaker: str, side: str, price: Optional[float]) -> bool:
+        """Set a bookmaker's price for an outcome in canonical orientation; False if it didn't change"""
+        book_quotes = self.quotes[key].get(bookmaker, {})
+        old = book_quotes.get(side)
+        if old == price:
+            return False
+        
+        ladder = self._ladders[(key, side)]
+        head = self._best[(key, side)]
+        order = self._book_order[key].setdefault(bookmaker, len(self._book_order[key]))
+        if old is not None and old > 0:
+            ladder.remove((-old, order, bookmaker))
+        
+        if price is None:
+            book_quotes.pop(side, None)
+            if not book_quotes:
+                self.quotes[key].pop(bookmaker, None)
+        else:
+            self.quotes[key][bookmaker] = book_quotes
+            book_quotes[side] = price
+            # Like the dict scans, a non-positive price is kept as quoted but can never be the best
+            if price > 0:
+                ladder.add((-price, order, bookmaker))
+        
+        self.updates += 1
+        # Moves behind the best price leave the best price and overround alone
+        if ladder:
+            neg_price, _, best_book = ladder[0]
+            best = (-neg_price, best_book)
+        else:
+            best = None
+        if best != head:
+            self._best[(key, side)] = best
+            self._refresh_overround(key)
+        return True
+    
+    def remove_bookmaker(self, key: Hashable, bookmaker: str):
+        """Withdraw all of a bookmaker's prices on a match"""
+        for side in OUTCOMES:
+            self.set_quote(key, bookmaker, side, None)
+    
+    def best(self, key: Hashable, side: str) -> Optional[Tuple[float, str]]:
+        """(best price, bookmaker) for an outcome, or None when no book prices it"""
+        return self._best[(key, side)]
+    
+    def top(self, key: Hashable, side: str, n: int = 3) -> List[Tuple[float, str]]:
+        """The n best (price, bookmaker) pairs for an outcome"""
+        return [(-neg_price, bookmaker) for neg_price, _, bookmaker in islice(self._ladders[(key, side)], n)]
+    
+    def overround(self, key: Hashable) -> Optional[float]:
+        """1/best home + 1/best away (below 1 is an arbitrage), or None until both outcomes are priced"""
+        return self._overround.get(key)
+    
+    def arbitrage_keys(self, max_overround: float = 1.0) -> List[Hashable]:
+        """Matches whose best prices overround below max_overround, lowest (most profitable) first"""
+        end = self._by_overround.bisect_left((max_overround,))
+        return [self._keys[seq] for _, seq in islice(self._by_overround, end)]
+    
+    def odds(self, key: Hashable) -> Dict[str, Dict[str, float]]:
+        """Bookmakers pricing both outcomes, in the consolidated {'home', 'away'} shape"""
+        return {bookmaker: prices for bookmaker, prices in self.quotes[key].items() if len(prices) == 2}
+    
+    def as_match(self, key: Hashable) -> Dict:
+        """The match as a consolidated-odds dict, for code that still walks match['odds']"""
+        return {**self.matches[key], 'odds': self.odds(key)}
+    
+    def keys(self) -> List[Hashable]:
+        return list(self._keys)
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    def _refresh_overround(self, key: Hashable):
+        seq = self._seq[key]
+        old = self._overround.pop(key, None)
+        if old is not None:
+            self._by_overround.remove((old, seq))
+        
+        home, away = self._best[(key, 'home')], self._best[(key, 'away')]
+        if home and away:
+            overround = 1 / home[0] + 1 / away[0]
+            self._overround[key] = overround
+            self._by_overround.add((overround, seq))
+    
+    @staticmethod
+    def _flip(side: str) -> str:
+        return 'away' if side == 'home' else 'home'
@@ -0,0 +1,325 @@
+"""
+Capture bookmaker odds straight from the JSON feeds their pages fetch
+
+With Chrome's performance log enabled (goog:loggingPrefs), every Network.* DevTools
+event is buffered by the driver. NetworkCapture picks out the responses whose URL
+matches a bookmaker's feed pattern, pulls their bodies with Network.getResponseBody
+and decodes them into the same match records the DOM parsers produce, so nothing
+has to wait for layout/render or be parsed out of HTML.
+
+The same log carries Network.webSocketFrameReceived events; the *_frame decoders turn
+in-play push frames into single price updates (see afl_inplay.py).
+
+The decoders are plain functions over parsed JSON, so they are exercised offline
+against fixtures/<bookmaker>_feed.json response bodies (test_network_capture.py,
+bench_parsers.py feeds) and fixtures/inplay_frames.jsonl push frames (test_inplay.py,
+bench_inplay.py).
+
+The feed URL patterns and payload layouts are modelled on the sites' public APIs. The
+checked-in bodies are reconstructed from the HTML fixtures in those layouts (each says
+so in its "note"), not recorded from the live sites, so they pin the decoders to the
+HTML parse but can't prove the layouts (the frame log is likewise hand-written). Until
+live captures replace them, capture is off by default
+(AFLSeleniumScraper(network_capture=False)) and gives up quickly when no response
+matches a bookmaker's pattern.
+"""
+
+import base64
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+def _h2h_market(markets: Iterable[Dict], name_key: str) -> Optional[Dict]:
+    """First market whose name looks like Head to Head"""
+    for market in markets or []:
+        name = (market.get(name_key) or '').lower().replace(' ', '')
+        if name in ('headtohead', 'h2h', 'matchresult'):
+            return market
+    return None
+
+def _side_prices(outcomes: Iterable[Dict], home_team: str, away_team: str, side_key: str, price_of) -> Dict[str, float]:
+    """Map outcomes to home/away prices, by explicit side marker or else by team name"""
+    prices = {}
+    for outcome in outcomes or []:
+        side = str(outcome.get(side_key) or '').lower()
+        if side not in ('home', 'away', 'h', 'a'):
+            name = outcome.get('name')
+            side = 'home' if name == home_team else 'away' if name == away_team else ''
+        price = price_of(outcome)
+        if side and price:
+            prices['home' if side in ('home', 'h') else 'away'] = float(price)
+    return prices
+
+def decode_sportsbet_feed(payload: Dict) -> List[Dict]:
+    """Sportsbet competition feed: events[] with participant1/2 and marketList[].selections[]"""
+    matches = []
+    for event in payload.get('events', []):
+        home_team = event.get('participant1')
+        away_team = event.get('participant2')
+        market = _h2h_market(event.get('marketList'), 'name')
+        if not home_team or not away_team or not market:
+            continue
+        
+        prices = _side_prices(market.get('selections'), home_team, away_team, 'resultType',
+                              lambda selection: (selection.get('price') or {}).get('winPrice'))
+        if len(prices) < 2:
+            continue
+        
+        start = event.get('startTime')
+        matches.append({
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_odds': prices['home'],
+            'away_odds': prices['away'],
+            'match_time': datetime.fromtimestamp(start, timezone.utc).isoformat() if start else None
+        })
+    return matches
+
+def decode_ladbrokes_feed(payload: Dict) -> List[Dict]:
+    """Ladbrokes event-request feed: normalized events/markets/entrants/prices maps keyed by id"""
+    events = payload.get('events') or {}
+    markets = payload.get('markets') or {}
+    entrants = payload.get('entrants') or {}
+    
+    # Price keys look like "<entrant id>:<product id>:"; fractional odds -> decimal
+    prices = {}
+    for key, price in (payload.get('prices') or {}).items():
+        odds = price.get('odds') or {}
+        if odds.get('denominator'):
+            prices[key.split(':')[0]] = round(1 + odds['numerator'] / odds['denominator'], 2)
+    
+    matches = []
+    for event in events.values():
+        market = _h2h_market(
+            (markets.get(market_id, {}) for market_id in event.get('main_markets', [])), 'name'
+        )
+        if not market:
+            continue
+        
+        home = away = None
+        for entrant_id in market.get('entrant_ids', []):
+            entrant = entrants.get(entrant_id, {})
+            if entrant.get('home_away') == 'HOME':
+                home = entrant
+            elif entrant.get('home_away') == 'AWAY':
+                away = entrant
+        if not home or not away or home['id'] not in prices or away['id'] not in prices:
+            continue
+        
+        matches.append({
+            'home_team': home['name'],
+            'away_team': away['name'],
+            'home_odds': prices[home['id']],
+            'away_odds': prices[away['id']],
+            'match_time': event.get('advertised_start')
+        })
+    return matches
+
+def decode_pointsbet_feed(payload: Dict) -> List[Dict]:
+    """PointsBet featured-events feed: events[] with homeTeam/awayTeam and fixedOddsMarkets[].outcomes[]"""
+    matches = []
+    for event in payload.get('events', []):
+        home_team = event.get('homeTeam')
+        away_team = event.get('awayTeam')
+        market = _h2h_market(event.get('fixedOddsMarkets'), 'eventClass')
+        if not home_team or not away_team or not market:
+            continue
+        
+        prices = _side_prices(market.get('outcomes'), home_team, away_team, 'side',
+                              lambda outcome: outcome.get('price'))
+        if len(prices) < 2:
+            continue
+        
+        matches.append({
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_odds': prices['home'],
+            'away_odds': prices['away'],
+            'match_time': event.get('startsAt')
+        })
+    return matches
+
+def _price_updates(home_team: str, away_team: str, prices: Dict[str, float]) -> List[Dict]:
+    return [
+        {'home_team': home_team, 'away_team': away_team, 'side': side, 'price': price}
+        for side, price in prices.items()
+    ]
+
+def decode_sportsbet_frame(frame: str) -> List[Dict]:
+    """Sportsbet push frame: a MarketUpdate carrying the changed Head to Head selections"""
+    message = json.loads(frame)
+    if message.get('type') != 'MarketUpdate' or _h2h_market([message], 'marketName') is None:
+        return []
+    
+    home_team, away_team = message.get('participant1'), message.get('participant2')
+    prices = _side_prices(message.get('selections'), home_team, away_team, 'resultType',
+                          lambda selection: (selection.get('price') or {}).get('winPrice'))
+    return _price_updates(home_team, away_team, prices)
+
+def decode_ladbrokes_frame(frame: str) -> List[Dict]:
+    """Ladbrokes push frame: one price_update per entrant with fractional odds"""
+    message = json.loads(frame)
+    if message.get('type') != 'price_update':
+        return []
+    
+    event = message.get('event') or {}
+    odds = message.get('odds') or {}
+    side = {'HOME': 'home', 'AWAY': 'away'}.get((message.get('entrant') or {}).get('home_away'))
+    if not side or not odds.get('denominator') or _h2h_market([message], 'market') is None:
+        return []
+    
+    price = round(1 + odds['numerator'] / odds['denominator'], 2)
+    return _price_updates(event.get('home'), event.get('away'), {side: price})
+
+def decode_pointsbet_frame(frame: str) -> List[Dict]:
+    """PointsBet SignalR frame: \x1e-separated invocations of FixedOddsPriceUpdate"""
+    updates = []
+    for part in frame.split('\x1e'):
+        if not part.strip():
+            continue
+        
+        message = json.loads(part)
+        if message.get('target') != 'FixedOddsPriceUpdate':
+            continue  # handshakes, pings (type 6) and other hub methods
+        
+        for event in message.get('arguments', []):
+            if _h2h_market([event], 'eventClass') is None:
+                continue
+            home_team, away_team = event.get('homeTeam'), event.get('awayTeam')
+            prices = _side_prices(event.get('outcomes'), home_team, away_team, 'side',
+                                  lambda outcome: outcome.get('price'))
+            updates.extend(_price_updates(home_team, away_team, prices))
+    return updates
+
+class NetworkCapture:
+    def __init__(self, timeout: float = 10.0, first_match_timeout: float = 2.0, poll_interval: float = 0.2,
+                 record_dir: Optional[str] = None):
+        """
+        Read bookmaker odds from their feed responses via the driver's performance log
+        
+        Args:
+            timeout: Give up waiting for a feed response after this many seconds
+            first_match_timeout: Give up sooner when no response URL has matched the feed pattern by then
+                (a wrong pattern then costs this long before the DOM fallback, not the full timeout)
+            poll_interval: Seconds between performance log reads
+            record_dir: Save each capture's response bodies as <bookmaker>_feed.json here (offline fixtures)
+        """
+        self.timeout = timeout
+        self.first_match_timeout = first_match_timeout
+        self.poll_interval = poll_interval
+        self.record_dir = record_dir
+        
+        # Per-bookmaker stats from the most recent capture
+        self.last_capture: Dict[str, Dict] = {}
+        # Per-bookmaker performance-log entries the most recent capture drained (for the page's byte count)
+        self.last_entries: Dict[str, List[Dict]] = {}
+    
+    @staticmethod
+    def enable(chrome_options):
+        """Turn on the performance log so Network.* DevTools events are buffered for get_log"""
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    def drain(self, driver):
+        """Discard buffered events so the next capture only sees the coming page load"""
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+    
+    def capture(self, driver, name: str, config: Dict) -> List[Dict]:
+        """Collect and decode the bookmaker's feed responses for the page that is loading"""
+        feed_url = config['selectors']['feed_url']
+        start = time.perf_counter()
+        pending = {}
+        responses = []
+        matches = []
+        matched = 0
+        entries = self.last_entries[name] = []
+        
+        while time.perf_counter() - start < self.timeout:
+            for entry in driver.get_log('performance'):
+                entries.append(entry)
+                message = json.loads(entry['message']).get('message', {})
+                method = message.get('method')
+                params = message.get('params', {})
+                
+                if method == 'Network.responseReceived':
+                    url = params.get('response', {}).get('url', '')
+                    if feed_url.search(url):
+                        pending[params['requestId']] = url
+                        matched += 1
+                
+                elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+                    url = pending.pop(params['requestId'])
+                    body = self._response_body(driver, params['requestId'])
+                    if body is not None:
+                        responses.append({'url': url, 'body': body})
+            
+            # Done once the feeds seen so far are in and they held odds
+            if responses and not pending:
+                matches = self.decode_responses(name, config, responses)
+                if matches:
+                    break
+            
+            if not matched and time.perf_counter() - start >= self.first_match_timeout:
+                break
+            
+            time.sleep(self.poll_interval)
+        
+        self.last_capture[name] = {
+            'elapsed': time.perf_counter() - start,
+            'matched_urls': matched,
+            'responses': len(responses),
+            'bytes': sum(len(response['body']) for response in responses),
+            'matches': len(matches)
+        }
+        
+        if self.record_dir and responses:
+            self.save_responses(name, responses)
+        
+        return matches
+    
+    def decode_responses(self, name: str, config: Dict, responses: List[Dict]) -> List[Dict]:
+        """Decode recorded or live feed bodies into match records, later responses overriding earlier ones"""
+        decoder = config['feed_decoder']
+        by_match = {}
+        
+        for response in responses:
+            try:
+                payload = json.loads(response['body'])
+            except ValueError:
+                continue
+            
+            try:
+                records = decoder(payload)
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                print(f"    ✗ Could not decode {name} feed {response.get('url', '')}: {e}")
+                continue
+            
+            for record in records:
+                record['bookmaker'] = name
+                by_match[(record['home_team'], record['away_team'])] = record
+        
+        return list(by_match.values())
+    
+    def save_responses(self, name: str, responses: List[Dict]):
+        """Save captured feed bodies as an offline fixture"""
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir, f"{name}_feed.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(responses, f, indent=2)
+        print(f"  Saved {len(responses)} feed responses to {path}")
+    
+    def _response_body(self, driver, request_id: str) -> Optional[str]:
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            # Body already evicted from the DevTools buffer (or the request was a redirect)
+            return None
+        
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
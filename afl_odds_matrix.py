@@ -0,0 +1,126 @@
+from itertools import chain
+from typing import Dict, List, NamedTuple, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+OUTCOMES = ('home', 'away')
+
+class ArbitrageRow(NamedTuple):
+    """A match whose best home and away prices overround below 1"""
+    match_index: int
+    home_odds: float
+    home_book: str
+    away_odds: float
+    away_book: str
+
+class ValueEdge(NamedTuple):
+    """A (match, bookmaker, outcome) price that beats the fair odds"""
+    match_index: int
+    bookmaker: str
+    side: str
+    odds: float
+    value_percentage: float
+
+class OddsMatrix:
+    def __init__(self, matches: List[Dict]):
+        """
+        Lay consolidated odds out as one numpy outcome x book slot x match price array
+        
+        Not every bookmaker prices every match, so slot r of match m holds the r-th bookmaker in that
+        match's odds dict and missing slots are 0 (never a best price, never a valid quote). Keeping each
+        match's own book order makes ties and the fair-probability sums come out exactly as the per-match
+        dict scans do; with matches on the innermost axis every slot is one contiguous run of prices.
+        
+        Args:
+            matches: Consolidated matches as produced by AFLSeleniumScraper.consolidate_odds
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("OddsMatrix needs numpy (pip install numpy)")
+        
+        self.matches = matches
+        odds_rows = [match['odds'] for match in matches]
+        counts = np.fromiter(map(len, odds_rows), dtype=np.intp, count=len(odds_rows))
+        
+        # Flat quote columns in match order (compressed rows), then scattered into the padded slot array
+        self.quote_books: List[str] = list(chain.from_iterable(odds_rows))
+        quotes = list(chain.from_iterable(row.values() for row in odds_rows))
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+        rows = np.repeat(np.arange(len(odds_rows)), counts)
+        slots = np.arange(len(quotes)) - self.offsets[rows]
+        
+        self.n_matches = len(odds_rows)
+        self.n_slots = int(counts.max()) if len(counts) else 0
+        self.n_books = len(set(self.quote_books))
+        self.prices = np.zeros((len(OUTCOMES), max(self.n_slots, 1), self.n_matches))
+        for side_index, side in enumerate(OUTCOMES):
+            self.prices[side_index, slots, rows] = [odds[side] for odds in quotes]
+    
+    def best(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """(best price, slot) per outcome and match; the first slot wins ties, as in the dict scan"""
+        slots = self.prices.argmax(axis=1)
+        return np.take_along_axis(self.prices, slots[:, None, :], axis=1)[:, 0, :], slots
+    
+    def fair_probabilities(self) -> 'np.ndarray':
+        """Margin-free home/away probabilities per match, averaged over the books pricing both outcomes"""
+        home, away = self.prices
+        valid = (home > 0) & (away > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            home_prob, away_prob = 1 / home, 1 / away
+            total_prob = home_prob + away_prob
+            normalized = (np.where(valid, home_prob / total_prob, 0.0),
+                          np.where(valid, away_prob / total_prob, 0.0))
+        
+        # Summed slot by slot (vectorised across matches) so the float additions happen in the dict order
+        sums = np.zeros((len(OUTCOMES), self.n_matches))
+        for slot in range(self.n_slots):
+            sums[0] += normalized[0][slot]
+            sums[1] += normalized[1][slot]
+        
+        counts = valid.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(counts > 0, sums / counts, 0.0)
+    
+    def arbitrage_rows(self, min_profit_percentage: float) -> List[ArbitrageRow]:
+        """Matches whose best prices lock in at least min_profit_percentage"""
+        (best_home, best_away), (home_slots, away_slots) = self.best()
+        with np.errstate(divide='ignore'):
+            total_prob = 1 / best_home + 1 / best_away
+            profit = (1 / total_prob - 1) * 100
+        hits = np.flatnonzero((best_home > 0) & (best_away > 0) & (total_prob < 1.0)
+                              & (profit >= min_profit_percentage))
+        
+        offsets = self.offsets[hits]
+        return [ArbitrageRow(m, home_odds, self.quote_books[home_quote], away_odds, self.quote_books[away_quote])
+                for m, home_odds, home_quote, away_odds, away_quote in zip(
+                    hits.tolist(), best_home[hits].tolist(), (offsets + home_slots[hits]).tolist(),
+                    best_away[hits].tolist(), (offsets + away_slots[hits]).tolist())]
+    
+    def value_edges(self, min_value_edge: float, min_value_percentage: float) -> List[ValueEdge]:
+        """
+        Prices beating their match's fair odds by min_value_edge percent, in match, book and outcome order
+        
+        Args:
+            min_value_edge: Percentage a price must beat the fair odds by (5% = 5.0)
+            min_value_percentage: Lowest value percentage reported
+        """
+        fair = self.fair_probabilities()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fair_odds = np.where(fair > 0, 1 / fair, 0.0)[:, None, :]
+            value_percentage = (self.prices / fair_odds - 1) * 100
+        edge_factor = 1 + min_value_edge / 100
+        hits = ((fair_odds > 0) & (self.prices > fair_odds * edge_factor)
+                & (value_percentage >= min_value_percentage))
+        
+        sides, slots, matches = np.nonzero(hits)
+        # The dict scan walks match, then book, then home before away
+        order = np.lexsort((sides, slots, matches))
+        sides, slots, matches = sides[order], slots[order], matches[order]
+        return [ValueEdge(m, self.quote_books[quote], OUTCOMES[side], odds, percentage)
+                for m, quote, side, odds, percentage in zip(
+                    matches.tolist(), (self.offsets[matches] + slots).tolist(), sides.tolist(),
+                    self.prices[sides, slots, matches].tolist(),
+                    value_percentage[sides, slots, matches].tolist())]
@@ -0,0 +1,329 @@
+import contextlib
+import io
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from afl_alerts import OpportunityAlert, OpportunityTracker
+from afl_card_cache import CardCache
+from afl_incremental import IncrementalEvaluator, OpportunityChange
+from afl_market_book import MarketBook
+from afl_scheduler import RefreshScheduler, kickoff_timestamp
+from afl_selenium_scraper_NEW import AFLSeleniumScraper
+from main_hedge_analysis import AFLOpportunityFinder, BettingOpportunity
+
+class OddsDelta(NamedTuple):
+    """A single (match, bookmaker, side) price change"""
+    match_key: Tuple[int, int]  # TeamRegistry.match_key
+    bookmaker: str
+    side: str  # 'home' or 'away'
+    home_team: str
+    away_team: str
+    old_price: Optional[float]  # None when the price is new
+    new_price: Optional[float]  # None when the match disappeared from the book
+
+class OddsWatcher:
+    def __init__(self, scraper: AFLSeleniumScraper, finder: Optional[AFLOpportunityFinder] = None,
+                 interval: float = 5.0, reload_interval: float = 15 * 60, quiet: bool = True,
+                 on_delta: Optional[Callable[[List[OddsDelta]], None]] = None,
+                 on_opportunity: Optional[Callable[[List[BettingOpportunity]], None]] = None,
+                 scheduler: Optional[RefreshScheduler] = None, tracker: Optional[OpportunityTracker] = None,
+                 max_empty_reads: int = 3):
+        """
+        Keep bookmaker pages open and poll only their price elements
+        
+        Args:
+            scraper: Scraper providing bookmaker configs, parsers and the driver pool
+            finder: Opportunity finder fed with the matches touched by each tick's deltas
+            interval: Seconds between polls
+            reload_interval: Seconds before a bookmaker page is fully reloaded
+            quiet: Silence the per-card parser/finder logging on every tick
+            on_delta: Callback receiving each tick's non-empty delta list
+            on_opportunity: Callback receiving opportunities that opened or moved on the changed matches
+            scheduler: Poll each bookmaker on its own kickoff/volatility-driven interval instead of every `interval`
+            tracker: Alert on opportunities with hysteresis and a minimum lifetime (run the finder at its
+                exit_threshold); on_opportunity then receives opened and updated alerts' opportunities
+            max_empty_reads: Consecutive polls a bookmaker may return no event cards before its last
+                prices are dropped (retained prices also drop at their kickoff)
+        """
+        self.scraper = scraper
+        self.finder = finder
+        self.interval = interval
+        self.reload_interval = reload_interval
+        self.quiet = quiet
+        self.on_delta = on_delta
+        self.on_opportunity = on_opportunity
+        self.scheduler = scheduler
+        self.tracker = tracker
+        self.max_empty_reads = max_empty_reads
+        
+        # bookmaker -> match_key -> latest parsed record
+        self.records: Dict[str, Dict[Tuple[int, int], Dict]] = {name: {} for name in scraper.bookmakers}
+        # Best prices per (match, outcome), kept current from the deltas
+        self.book = MarketBook(scraper.teams)
+        # Opportunities currently open, re-evaluated only on the matches each tick touched
+        self.evaluator = IncrementalEvaluator(finder, self.book) if finder else None
+        self.loaded_at: Dict[str, float] = {}
+        # bookmaker -> consecutive polls that came back without event cards
+        self.empty_reads: Dict[str, int] = {}
+        self.session = None
+        self.ticks = 0
+    
+    def start(self):
+        """Borrow a warm browser session and load every bookmaker page once"""
+        if self.scraper.driver_pool is None:
+            self.scraper.create_driver_pool(size=1)
+        
+        self.session = self.scraper.driver_pool.acquire()
+        for name, config in self.scraper.bookmakers.items():
+            self._load_page(name, config)
+            if self.scheduler:
+                self.scheduler.add_page(name)
+    
+    def stop(self):
+        """Hand the browser session back to the pool"""
+        if self.session is not None:
+            self.scraper.driver_pool.release(self.session)
+            self.session = None
+    
+    def run(self, max_ticks: Optional[int] = None):
+        """Poll at the configured cadence until interrupted (or max_ticks polls)"""
+        cadence = "on an adaptive schedule" if self.scheduler else f"every {self.interval}s"
+        print(f"👀 Watching {len(self.scraper.bookmakers)} bookmakers {cadence}...")
+        self.start()
+        
+        try:
+            while max_ticks is None or self.ticks < max_ticks:
+                if self.scheduler:
+                    due = self.scheduler.due()
+                    if due:
+                        self.poll_once(due)
+                    else:
+                        time.sleep(self.scheduler.seconds_until_next())
+                    continue
+                
+                tick_start = time.perf_counter()
+                self.poll_once()
+                
+                elapsed = time.perf_counter() - tick_start
+                time.sleep(max(0.0, self.interval - elapsed))
+        except KeyboardInterrupt:
+            print("\nStopping watcher...")
+        finally:
+            self.stop()
+            if self.scraper.card_cache:
+                self.scraper.card_cache.print_report()
+            if self.scheduler:
+                self.scheduler.print_report()
+            if self.tracker:
+                self.tracker.print_report()
+    
+    def poll_once(self, names: Optional[List[str]] = None) -> List[OddsDelta]:
+        """Re-read every bookmaker's prices (or just `names`) and process whatever changed"""
+        self.ticks += 1
+        deltas = []
+        
+        for name in names or list(self.scraper.bookmakers):
+            config = self.scraper.bookmakers[name]
+            try:
+                self.scraper.driver_pool.open_tab(self.session, name)
+                
+                if time.time() - self.loaded_at.get(name, 0) > self.reload_interval:
+                    self._load_page(name, config)
+                
+                with self._maybe_quiet():
+                    records = self.scraper.read_event_cards(name, config, self.session.driver)
+                
+                if not records and self.records[name]:
+                    # A page that listed matches last poll now shows none: treat it as a failed read (not
+                    # ready, selector miss) rather than every match being withdrawn at once
+                    deltas.extend(self.retain_records(name))
+                    self.loaded_at.pop(name, None)
+                    if self.scheduler:
+                        self.scheduler.observe(name, [])
+                    continue
+                self.empty_reads.pop(name, None)
+                
+                if self.scheduler:
+                    # Started matches leave the book (their in-running prices aren't pre-match odds)
+                    records = self.scheduler.filter_active(name, records)
+                
+                book_deltas = self.apply_records(name, records)
+                deltas.extend(book_deltas)
+                
+                if self.scheduler:
+                    self.scheduler.observe(name, book_deltas)
+            except Exception as e:
+                print(f"✗ Error polling {name}: {e}")
+                if self.scheduler:
+                    self.scheduler.observe(name, [])
+        
+        if deltas:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] {len(deltas)} price changes")
+            if self.on_delta:
+                self.on_delta(deltas)
+        # Even a quiet tick ages the tracker's pending opportunities toward their minimum lifetime
+        if deltas or self.tracker:
+            self.evaluate(deltas)
+        
+        return deltas
+    
+    def apply_records(self, bookmaker: str, records: List[Dict]) -> List[OddsDelta]:
+        """Merge freshly parsed records for a bookmaker and return only the changed prices"""
+        previous = self.records[bookmaker]
+        current = {}
+        deltas = []
+        
+        for record in records:
+            key = self.scraper.teams.match_key(record['home_team'], record['away_team'])
+            current[key] = record
+            old = previous.get(key)
+            
+            for side in ('home', 'away'):
+                new_price = record[f'{side}_odds']
+                old_price = old[f'{side}_odds'] if old else None
+                if new_price != old_price:
+                    deltas.append(OddsDelta(key, bookmaker, side, record['home_team'], record['away_team'],
+                                            old_price, new_price))
+        
+        # Matches that dropped off the page (started, suspended or finished)
+        for key, old in previous.items():
+            if key not in current:
+                for side in ('home', 'away'):
+                    deltas.append(OddsDelta(key, bookmaker, side, old['home_team'], old['away_team'],
+                                            old[f'{side}_odds'], None))
+        
+        self.records[bookmaker] = current
+        for delta in deltas:
+            self.book.update(bookmaker, delta.home_team, delta.away_team, delta.side, delta.new_price)
+        return deltas
+    
+    def retain_records(self, bookmaker: str, now: Optional[float] = None) -> List[OddsDelta]:
+        """
+        Keep a bookmaker's last prices through an empty read, minus matches that have kicked off since;
+        after max_empty_reads empty reads in a row they are all dropped
+        """
+        now = time.time() if now is None else now
+        self.empty_reads[bookmaker] = self.empty_reads.get(bookmaker, 0) + 1
+        previous = list(self.records[bookmaker].values())
+        
+        if self.empty_reads[bookmaker] >= self.max_empty_reads:
+            print(f"  ⚠ {bookmaker} returned no event cards {self.empty_reads[bookmaker]} polls running; "
+                  f"dropping its last prices")
+            retained = []
+        else:
+            print(f"  ⚠ {bookmaker} returned no event cards; keeping its last prices and reloading next poll")
+            kickoffs = [(record, kickoff_timestamp(record)) for record in previous]
+            retained = [record for record, kickoff in kickoffs if kickoff is None or kickoff > now]
+        
+        if len(retained) == len(previous):
+            return []
+        return self.apply_records(bookmaker, retained)
+    
+    def evaluate(self, deltas: List[OddsDelta]) -> List[BettingOpportunity]:
+        """Re-evaluate the matches whose prices changed; returns the opportunities that opened or moved"""
+        if self.evaluator is None:
+            return []
+        
+        with self._maybe_quiet():
+            changes = self.evaluator.refresh(delta.match_key for delta in deltas)
+        
+        if self.tracker:
+            opportunities = self.report_alerts(self.tracker.observe(self.evaluator.opportunities()))
+        else:
+            opportunities = self.report_changes(changes)
+        
+        if opportunities and self.on_opportunity:
+            self.on_opportunity(opportunities)
+        
+        return opportunities
+    
+    def report_changes(self, changes: List[OpportunityChange]) -> List[BettingOpportunity]:
+        """Log opened/closed opportunities; returns the ones that opened or moved"""
+        opportunities = []
+        for change in changes:
+            opp = change.opportunity
+            type_name = "ARBITRAGE" if opp.opportunity_type == 'arbitrage' else "VALUE BET"
+            if change.kind == 'removed':
+                print(f"   ✗ {type_name} closed: {opp.match}")
+                continue
+            if change.kind == 'added':
+                print(f"   🚨 {type_name}: {opp.match} ({opp.profit_percentage:.2f}%)")
+            opportunities.append(opp)
+        return opportunities
+    
+    def report_alerts(self, alerts: List[OpportunityAlert]) -> List[BettingOpportunity]:
+        """Log the tracker's alerts; returns the opportunities of opened and updated ones"""
+        opportunities = []
+        for alert in alerts:
+            opp = alert.opportunity
+            type_name = "ARBITRAGE" if opp.opportunity_type == 'arbitrage' else "VALUE BET"
+            books = ", ".join(alert.books)
+            if alert.kind == 'closed':
+                print(f"   ✗ {type_name} closed: {opp.match} after {alert.timestamp - alert.first_seen:.0f}s")
+                continue
+            if alert.kind == 'opened':
+                print(f"   🚨 {type_name}: {opp.match} ({opp.profit_percentage:.2f}%) at {books}")
+            else:
+                print(f"   ↻ {type_name}: {opp.match} now {opp.profit_percentage:.2f}% at {books}")
+            opportunities.append(opp)
+        return opportunities
+    
+    def _load_page(self, name: str, config: Dict):
+        """Navigate the bookmaker's tab and wait for its event cards"""
+        self.scraper.driver_pool.open_tab(self.session, name)
+        driver = self.session.driver
+        
+        print(f"  Loading {config['url']}...")
+        self.scraper._load_url(driver, config['url'])
+        result = self.scraper.page_waiter.wait(driver, name, config)
+        if not result.ready:
+            print(f"  ⚠ {name} not ready after {result.elapsed:.1f}s ({result.reason})")
+        
+        self.loaded_at[name] = time.time()
+    
+    def _maybe_quiet(self):
+        """Swallow stdout while quiet mode is on"""
+        if self.quiet:
+            return contextlib.redirect_stdout(io.StringIO())
+        return contextlib.nullcontext()
+
+def main():
+    """Main function to run the odds watcher"""
+    
+    # Configure your settings
+    POLL_INTERVAL = 5.0  # Seconds between price polls
+    ADAPTIVE_SCHEDULE = False  # Poll near-kickoff and fast-moving books more often than POLL_INTERVAL
+    BANKROLL = 1000
+    MIN_PROFIT_PERCENTAGE = 1.0  # Alert once an opportunity reaches this...
+    EXIT_PROFIT_PERCENTAGE = 0.5  # ...and keep it open until it drops below this
+    VALUE_EDGE = 5.0  # Value bets alert once a price beats fair odds by this percentage...
+    EXIT_VALUE_EDGE = 4.5  # ...and stay open until the edge drops below this
+    MIN_LIFETIME = 10.0  # Seconds an opportunity must last before it's alerted
+    MAX_STAKE_PERCENTAGE = 25.0
+    
+    # Cards whose HTML hasn't changed since the last poll reuse their parsed record. The cache works on the
+    # card-HTML path, so in-browser JS extraction is off: each poll ships the cards' outer HTML instead of
+    # ready-made records, but only re-priced cards are parsed in Python, which wins when few cards change a tick
+    scraper = AFLSeleniumScraper(headless=True, js_extract=False, card_cache=CardCache())
+    finder = AFLOpportunityFinder(
+        bankroll=BANKROLL,
+        min_profit_percentage=EXIT_PROFIT_PERCENTAGE,
+        max_stake_percentage=MAX_STAKE_PERCENTAGE,
+        min_value_edge=EXIT_VALUE_EDGE
+    )
+    tracker = OpportunityTracker(MIN_PROFIT_PERCENTAGE, EXIT_PROFIT_PERCENTAGE, min_lifetime=MIN_LIFETIME,
+                                 value_enter_threshold=VALUE_EDGE, value_exit_threshold=EXIT_VALUE_EDGE)
+    
+    scheduler = RefreshScheduler(scraper.teams.match_key) if ADAPTIVE_SCHEDULE else None
+    watcher = OddsWatcher(scraper, finder, interval=POLL_INTERVAL, scheduler=scheduler, tracker=tracker)
+    try:
+        watcher.run()
+    finally:
+        # No pool when start() failed before creating it; don't mask that error with an AttributeError
+        if scraper.driver_pool is not None:
+            scraper.driver_pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Bulk check of saved snapshots for bookmakers whose home/away prices were crossed
+
+Snapshots written since consolidation became orientation-aware list the realigned
+books per match. Older ones don't, so a book is flagged when swapping its two
+prices lands it much closer to the other books' consensus than it is now.
+
+    python afl_orientation.py                                  # every afl_odds_selenium_*.json here
+    python afl_orientation.py snapshots/*.json --tolerance 0.1
+"""
+
+import argparse
+import glob
+import json
+from statistics import median
+from typing import Dict, List, Optional
+
+def home_probability(prices: Dict[str, float]) -> Optional[float]:
+    """Margin-free probability of the home side from one book's two prices"""
+    if not prices.get('home') or not prices.get('away'):
+        return None
+    home, away = 1 / prices['home'], 1 / prices['away']
+    return home / (home + away)
+
+def crossed_books(match: Dict, tolerance: float = 0.15) -> Optional[List[str]]:
+    """
+    Books whose prices look swapped relative to the consensus of all books on the match
+    
+    Returns None when two books disagree that way, since either of them could be the crossed one.
+    """
+    probabilities = {book: home_probability(prices) for book, prices in match['odds'].items()}
+    probabilities = {book: p for book, p in probabilities.items() if p is not None}
+    
+    if len(probabilities) == 2:
+        p, q = probabilities.values()
+        return None if abs(p - q) > tolerance and abs((1 - p) - q) < abs(p - q) else []
+    
+    # The median is robust to one crossed book among three or more
+    consensus = median(probabilities.values()) if probabilities else 0.5
+    # 1 - p is the book's home probability if its prices were swapped
+    return [book for book, p in probabilities.items()
+            if abs(p - consensus) > tolerance and abs((1 - p) - consensus) < abs(p - consensus)]
+
+def has_arbitrage(odds: Dict[str, Dict[str, float]]) -> bool:
+    best_home = max((prices['home'] for prices in odds.values() if prices.get('home')), default=0)
+    best_away = max((prices['away'] for prices in odds.values() if prices.get('away')), default=0)
+    return best_home > 0 and best_away > 0 and 1 / best_home + 1 / best_away < 1
+
+def validate_snapshots(paths: List[str], tolerance: float = 0.15) -> Dict:
+    """Per-book counts of crossed listings (recorded or suspected) and the phantom arbitrages they produced"""
+    report = {'files': 0, 'unreadable': 0, 'matches': 0, 'ambiguous': 0, 'phantom_arbitrage': 0, 'books': {}}
+    
+    for path in paths:
+        try:
+            with open(path) as f:
+                matches = json.load(f).get('matches', [])
+        except (OSError, ValueError) as e:
+            print(f"⚠ Skipping {path}: {e}")
+            report['unreadable'] += 1
+            continue
+        report['files'] += 1
+        
+        for match in matches:
+            report['matches'] += 1
+            for book in match['odds']:
+                report['books'].setdefault(book, {'quotes': 0, 'realigned': 0, 'suspected': 0})['quotes'] += 1
+            
+            if 'realigned' in match:
+                # Already fixed at consolidation time; the snapshot's prices are correct
+                for book in match['realigned']:
+                    report['books'][book]['realigned'] += 1
+                continue
+            
+            crossed = crossed_books(match, tolerance)
+            if crossed is None:
+                report['ambiguous'] += 1
+                continue
+            for book in crossed:
+                report['books'][book]['suspected'] += 1
+            
+            if crossed and has_arbitrage(match['odds']):
+                fixed = {
+                    book: {'home': prices['away'], 'away': prices['home']} if book in crossed else prices
+                    for book, prices in match['odds'].items()
+                }
+                if not has_arbitrage(fixed):
+                    report['phantom_arbitrage'] += 1
+    
+    return report
+
+def print_validation(report: Dict):
+    print(f"Orientation check: {report['matches']} matches in {report['files']} snapshot files"
+          + (f" ({report['unreadable']} unreadable)" if report['unreadable'] else ""))
+    print("=" * 60)
+    for book, stats in sorted(report['books'].items()):
+        crossed = stats['realigned'] + stats['suspected']
+        rate = crossed / stats['quotes'] if stats['quotes'] else 0.0
+        print(f"  {book:<12} {stats['quotes']:>6} quotes  {stats['realigned']:>4} realigned  "
+              f"{stats['suspected']:>4} suspected crossed  ({rate:.1%})")
+    print(f"  Two-book matches whose prices disagree in orientation (book unknown): {report['ambiguous']}")
+    print(f"  Arbitrages that only existed because of crossed prices: {report['phantom_arbitrage']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('patterns', nargs='*', default=['afl_odds_selenium_*.json'], help="snapshot files or globs")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="home-probability gap from the consensus before a book counts as crossed")
+    args = parser.parse_args()
+    
+    paths = sorted({path for pattern in args.patterns for path in glob.glob(pattern)})
+    if not paths:
+        print(f"❌ No snapshot files match {' '.join(args.patterns)}")
+        return
+    
+    print_validation(validate_snapshots(paths, args.tolerance))
+
+if __name__ == "__main__":
+    main()
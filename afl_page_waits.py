@@ -0,0 +1,176 @@
+import bisect
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+# Snapshot of everything the waiter needs in one round trip to the browser
+READINESS_SCRIPT = """
+const [cardSelector, priceSelector] = arguments;
+const prices = [];
+for (const el of document.querySelectorAll(priceSelector)) {
+    prices.push(el.textContent.trim());
+}
+return {
+    readyState: document.readyState,
+    title: document.title || '',
+    bodyChildren: document.body ? document.body.childElementCount : 0,
+    cards: document.querySelectorAll(cardSelector).length,
+    prices: prices
+};
+"""
+
+# Page titles that mean the bookmaker served a block/error page instead of odds
+ERROR_TITLE_MARKERS = [
+    'access denied',
+    'attention required',
+    'just a moment',
+    'forbidden',
+    'page not found',
+    '404',
+    '403',
+    'service unavailable',
+    'site maintenance'
+]
+
+@dataclass
+class WaitResult:
+    """Outcome of waiting for a bookmaker page to settle"""
+    ready: bool
+    reason: str
+    elapsed: float
+    card_count: int = 0
+    price_count: int = 0
+    
+    @property
+    def failed(self) -> bool:
+        """True when the page clearly didn't load and isn't worth parsing"""
+        return not self.ready and self.card_count == 0
+
+class ReadinessHistogram:
+    """Fixed-bucket histogram of time-to-ready for one bookmaker"""
+    
+    BUCKETS = [0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0]
+    SAMPLE_WINDOW = 1000  # most recent waits kept for the percentiles; the buckets count every wait
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.samples: Deque[float] = deque(maxlen=self.SAMPLE_WINDOW)
+        self.outcomes: Dict[str, int] = {}
+    
+    def record(self, seconds: float, outcome: str):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.samples.append(seconds)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+    
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+    
+    def summary(self) -> Dict:
+        return {
+            'count': sum(self.counts),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'max': max(self.samples) if self.samples else 0.0,
+            'outcomes': dict(self.outcomes),
+            'buckets': {
+                (f"<={bound}s" if i < len(self.BUCKETS) else f">{self.BUCKETS[-1]}s"): count
+                for i, (bound, count) in enumerate(zip(self.BUCKETS + [None], self.counts))
+            }
+        }
+
+class PageReadyWaiter:
+    def __init__(self, timeout: float = 15.0, poll_interval: float = 0.25,
+                 stable_polls: int = 3, fail_fast_after: float = 4.0):
+        """
+        Wait until a bookmaker page has its odds rendered and settled
+        
+        Args:
+            timeout: Hard upper bound on the wait in seconds
+            poll_interval: Seconds between readiness snapshots
+            stable_polls: Consecutive identical price snapshots required before the page counts as ready
+            fail_fast_after: Give up this many seconds after document load if no event cards exist
+        """
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stable_polls = stable_polls
+        self.fail_fast_after = fail_fast_after
+        
+        self.histograms: Dict[str, ReadinessHistogram] = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, driver, name: str, config: Dict, timeout: Optional[float] = None) -> WaitResult:
+        """Block until the page's prices are present and stable, it clearly failed, or the timeout hits"""
+        start = time.perf_counter()
+        # A caller's deadline can only shorten the configured timeout
+        timeout = self.timeout if timeout is None else min(self.timeout, timeout)
+        card_selector = config['wait_selector']
+        price_selector = config['price_selector']
+        
+        last_prices = None
+        stable = 0
+        loaded_at = None
+        snapshot = {}
+        
+        while True:
+            elapsed = time.perf_counter() - start
+            try:
+                snapshot = driver.execute_script(READINESS_SCRIPT, card_selector, price_selector) or {}
+            except Exception as e:
+                # Page mid-navigation; try again on the next poll
+                snapshot = {}
+                if elapsed >= timeout:
+                    return self._finish(name, 'script_error', WaitResult(False, f"script error: {e}", elapsed))
+            
+            cards = snapshot.get('cards', 0)
+            prices = snapshot.get('prices', [])
+            title = snapshot.get('title', '').lower()
+            
+            if any(marker in title for marker in ERROR_TITLE_MARKERS):
+                return self._finish(name, 'error_page', WaitResult(False, f"error page: {snapshot.get('title')}", elapsed))
+            
+            if snapshot.get('readyState') == 'complete' and loaded_at is None:
+                loaded_at = elapsed
+            
+            if cards and prices:
+                if prices == last_prices:
+                    stable += 1
+                    if stable >= self.stable_polls:
+                        return self._finish(name, 'ready', WaitResult(True, 'stable', elapsed, cards, len(prices)))
+                else:
+                    stable = 0
+                last_prices = prices
+            elif loaded_at is not None and not cards and elapsed - loaded_at >= self.fail_fast_after:
+                if snapshot.get('bodyChildren', 0) == 0:
+                    return self._finish(name, 'empty_page', WaitResult(False, 'empty page', elapsed))
+                reason = f"no event cards {self.fail_fast_after:.0f}s after load"
+                return self._finish(name, 'no_cards', WaitResult(False, reason, elapsed))
+            
+            if elapsed >= timeout:
+                return self._finish(name, 'timeout', WaitResult(False, 'timeout', elapsed, cards, len(prices)))
+            
+            time.sleep(self.poll_interval)
+    
+    def report(self) -> Dict[str, Dict]:
+        """Per-bookmaker time-to-ready summaries"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in self.histograms.items()}
+    
+    def print_report(self):
+        """Print the time-to-ready histograms so wait settings can be tuned"""
+        print("\nTime-to-ready by bookmaker:")
+        for name, summary in self.report().items():
+            print(f"  {name}: n={summary['count']} p50={summary['p50']:.2f}s "
+                  f"p90={summary['p90']:.2f}s max={summary['max']:.2f}s {summary['outcomes']}")
+            buckets = ' '.join(f"{label}:{count}" for label, count in summary['buckets'].items() if count)
+            print(f"    {buckets}")
+    
+    def _finish(self, name: str, outcome: str, result: WaitResult) -> WaitResult:
+        with self._lock:
+            self.histograms.setdefault(name, ReadinessHistogram()).record(result.elapsed, outcome)
+        return result
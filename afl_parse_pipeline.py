@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Marks the end of the work for one parser worker
+_STOP = object()
+
+class ParsePipeline:
+    def __init__(self, parse: Callable[[str, str], List[Dict]], workers: int = 1, max_pending: int = 2):
+        """
+        Parse fetched pages on worker threads while the browser moves on to the next site
+        
+        Args:
+            parse: Callable(bookmaker, page_source) -> match records (AFLSeleniumScraper.parse_page)
+            workers: Parser worker threads
+            max_pending: Page sources allowed to wait in the queue; submit() blocks beyond this (back-pressure)
+        """
+        self.parse = parse
+        self.workers = workers
+        self.max_pending = max_pending
+        
+        self.results: Dict[str, List[Dict]] = {}
+        # bookmaker -> exception its parse raised (its result is then an empty list, as for a failed scrape)
+        self.errors: Dict[str, Exception] = {}
+        self.parse_seconds: Dict[str, float] = {}
+        
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._started_at = 0.0
+        self._finished_at = 0.0
+        
+        self.stats = {
+            'submitted': 0,
+            'parsed': 0,
+            'errors': 0,
+            'fetch_busy': 0.0,
+            'parse_busy': 0.0,
+            'producer_blocked': 0.0,
+            'max_depth': 0,
+            'depth_samples': []
+        }
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.join()
+    
+    def start(self):
+        self._started_at = time.perf_counter()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"parser-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def submit(self, name: str, page_source: str, fetch_seconds: float = 0.0):
+        """Queue a page for parsing, blocking while max_pending pages are already waiting"""
+        self._sample_depth()
+        put_start = time.perf_counter()
+        self._queue.put((name, page_source, time.perf_counter()))
+        
+        with self._lock:
+            self.stats['submitted'] += 1
+            self.stats['fetch_busy'] += fetch_seconds
+            self.stats['producer_blocked'] += time.perf_counter() - put_start
+    
+    def put_result(self, name: str, odds: List[Dict], fetch_seconds: float = 0.0):
+        """Record odds that needed no parsing (feed capture / in-browser extraction / failed load)"""
+        with self._lock:
+            self.results[name] = odds
+            self.stats['fetch_busy'] += fetch_seconds
+    
+    def join(self) -> Dict[str, List[Dict]]:
+        """Wait for every queued page to be parsed and return all results"""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._finished_at = time.perf_counter()
+        return self.results
+    
+    def report(self) -> Dict:
+        """Queue depth and how busy each stage was over the pipeline's lifetime"""
+        wall = (self._finished_at or time.perf_counter()) - self._started_at
+        samples = self.stats['depth_samples']
+        return {
+            'wall': wall,
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'submitted': self.stats['submitted'],
+            'parsed': self.stats['parsed'],
+            'errors': self.stats['errors'],
+            'fetch_utilisation': self.stats['fetch_busy'] / wall if wall > 0 else 0.0,
+            'parse_utilisation': self.stats['parse_busy'] / (wall * self.workers) if wall > 0 else 0.0,
+            'producer_blocked': self.stats['producer_blocked'],
+            'max_depth': self.stats['max_depth'],
+            'mean_depth': sum(samples) / len(samples) if samples else 0.0,
+            'parse_seconds': dict(self.parse_seconds)
+        }
+    
+    def print_report(self):
+        report = self.report()
+        print(f"\nParse pipeline ({report['workers']} workers, queue limit {report['max_pending']}):")
+        print(f"  fetch stage busy {report['fetch_utilisation']:.0%}, parse stage busy {report['parse_utilisation']:.0%}"
+              f" of {report['wall']:.1f}s")
+        print(f"  queue depth max {report['max_depth']} mean {report['mean_depth']:.1f}, "
+              f"fetch blocked {report['producer_blocked']:.2f}s on back-pressure")
+        for name, seconds in report['parse_seconds'].items():
+            print(f"  {name}: parsed in {seconds:.2f}s")
+    
+    def _sample_depth(self):
+        depth = self._queue.qsize()
+        with self._lock:
+            self.stats['depth_samples'].append(depth)
+            self.stats['max_depth'] = max(self.stats['max_depth'], depth)
+    
+    def _work(self):
+        while True:
+            self._sample_depth()
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            
+            name, page_source, queued_at = item
+            parse_start = time.perf_counter()
+            try:
+                odds = self.parse(name, page_source)
+                error: Optional[Exception] = None
+            except Exception as e:
+                odds, error = [], e
+            elapsed = time.perf_counter() - parse_start
+            
+            with self._lock:
+                self.results[name] = odds
+                if error is not None:
+                    self.errors[name] = error
+                self.parse_seconds[name] = elapsed
+                self.stats['parse_busy'] += elapsed
+                self.stats['parsed' if error is None else 'errors'] += 1
+            
+            if error is not None:
+                print(f"✗ Error parsing {name}: {error}")
+            else:
+                print(f"✓ Parsed {len(odds)} matches from {name} in {elapsed:.2f}s "
+                      f"(waited {parse_start - queued_at:.2f}s in the queue)")
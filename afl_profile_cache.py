@@ -0,0 +1,183 @@
+import copy
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List
+
+# Profile subdirectories that are pure cache; cookies, consent and local storage stay put
+CACHE_SUBDIRS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'GPUCache'),
+    os.path.join('Default', 'Service Worker', 'CacheStorage'),
+    os.path.join('Default', 'Service Worker', 'ScriptCache'),
+    'ShaderCache',
+    'GrShaderCache',
+    'cache'
+]
+
+SINGLETON_FILES = ['SingletonLock', 'SingletonCookie', 'SingletonSocket']
+
+def dir_size(path: str) -> int:
+    """Total bytes of every file under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass  # Chrome rotates cache files while we walk
+    return total
+
+class ProfileCache:
+    def __init__(self, root: str = 'chrome_profiles', budget_mb: float = 1024, disk_cache_mb: float = 200):
+        """
+        Persistent per-bookmaker Chrome profiles whose HTTP caches survive between runs
+        
+        Args:
+            root: Directory holding one user-data-dir per bookmaker
+            budget_mb: Total size all profiles may reach before their caches are cleaned, least recently used first
+            disk_cache_mb: Per-profile cap passed to Chrome's --disk-cache-size
+        """
+        self.root = os.path.abspath(root)
+        self.budget_mb = budget_mb
+        self.disk_cache_mb = disk_cache_mb
+        self.timings_path = os.path.join(self.root, 'load_timings.jsonl')
+        
+        # profile -> 'cold' / 'warm' as of the last time a driver was launched on it
+        self.state: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        
+        os.makedirs(self.root, exist_ok=True)
+        self.enforce_budget()
+    
+    def profile_dir(self, name: str) -> str:
+        return os.path.join(self.root, name)
+    
+    def is_warm(self, name: str) -> bool:
+        """True once the profile's HTTP cache holds something from an earlier load"""
+        return dir_size(os.path.join(self.profile_dir(name), 'cache')) > 0
+    
+    def options_for(self, chrome_options, name: str):
+        """Copy of the Chrome options pointed at the bookmaker's persistent profile and disk cache"""
+        path = self.profile_dir(name)
+        os.makedirs(path, exist_ok=True)
+        self._clear_stale_lock(path)
+        
+        with self._lock:
+            self.state[name] = 'warm' if self.is_warm(name) else 'cold'
+        
+        options = copy.deepcopy(chrome_options)
+        options.add_argument(f"--user-data-dir={path}")
+        options.add_argument(f"--disk-cache-dir={os.path.join(path, 'cache')}")
+        options.add_argument(f"--disk-cache-size={int(self.disk_cache_mb * 1024 * 1024)}")
+        return options
+    
+    def release(self, name: str):
+        """Mark a profile as just used (for LRU cleanup) once its browser has quit"""
+        with open(os.path.join(self.profile_dir(name), 'last_used'), 'w') as f:
+            f.write(str(time.time()))
+    
+    def enforce_budget(self) -> int:
+        """Delete cache subdirectories of the least recently used profiles until under budget; returns bytes freed"""
+        with self._lock:
+            profiles = [
+                entry for entry in os.listdir(self.root)
+                if os.path.isdir(os.path.join(self.root, entry))
+            ]
+            sizes = {name: dir_size(self.profile_dir(name)) for name in profiles}
+            total = sum(sizes.values())
+            budget = self.budget_mb * 1024 * 1024
+            freed = 0
+            
+            for name in sorted(profiles, key=self._last_used):
+                if total <= budget:
+                    break
+                if self._in_use(self.profile_dir(name)):
+                    continue
+                
+                before = sizes[name]
+                for subdir in CACHE_SUBDIRS:
+                    shutil.rmtree(os.path.join(self.profile_dir(name), subdir), ignore_errors=True)
+                after = dir_size(self.profile_dir(name))
+                
+                freed += before - after
+                total -= before - after
+                print(f"🧹 Cleared {(before - after) / 1024 / 1024:.0f} MB of cache from the {name} profile")
+            
+            if total > budget:
+                print(f"⚠ Chrome profiles use {total / 1024 / 1024:.0f} MB, over the {self.budget_mb:.0f} MB budget")
+            return freed
+    
+    def record_load(self, name: str, report: Dict):
+        """Append one page load's timings, tagged cold/warm, to the persistent timing log"""
+        entry = {
+            'timestamp': time.time(),
+            'bookmaker': name,
+            'cache': self.state.get(name, 'cold'),
+            'time_to_odds': report.get('time_to_odds'),
+            'bytes': report.get('bytes'),
+            'requests': report.get('requests')
+        }
+        with self._lock, open(self.timings_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+    
+    def load_timings(self) -> List[Dict]:
+        if not os.path.exists(self.timings_path):
+            return []
+        with open(self.timings_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def print_report(self):
+        """Median time-to-odds and transfer size for cold versus warm loads, per bookmaker"""
+        grouped: Dict[str, Dict[str, List[Dict]]] = {}
+        for entry in self.load_timings():
+            grouped.setdefault(entry['bookmaker'], {}).setdefault(entry['cache'], []).append(entry)
+        
+        def median(values):
+            ordered = sorted(value for value in values if value is not None)
+            return ordered[len(ordered) // 2] if ordered else 0.0
+        
+        print("\nCold vs warm profile loads (median time-to-odds / transferred):")
+        for name, by_state in grouped.items():
+            parts = []
+            for state in ('cold', 'warm'):
+                entries = by_state.get(state, [])
+                if entries:
+                    parts.append(f"{state} n={len(entries)} {median(e['time_to_odds'] for e in entries):.1f}s "
+                                 f"{median(e['bytes'] for e in entries) / 1024:.0f} KB")
+            print(f"  {name}: {' | '.join(parts)}")
+    
+    def _last_used(self, name: str) -> float:
+        try:
+            with open(os.path.join(self.profile_dir(name), 'last_used'), 'r') as f:
+                return float(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0.0
+    
+    def _in_use(self, path: str) -> bool:
+        return os.path.lexists(os.path.join(path, 'SingletonLock'))
+    
+    def _clear_stale_lock(self, path: str):
+        """Remove the singleton lock a crashed Chrome left behind, so the profile can be reopened"""
+        lock = os.path.join(path, 'SingletonLock')
+        if not os.path.islink(lock):
+            return
+        
+        # The lock links to "<hostname>-<pid>"
+        try:
+            pid = int(os.readlink(lock).rsplit('-', 1)[1])
+            os.kill(pid, 0)
+            return  # still running
+        except (ValueError, IndexError, ProcessLookupError):
+            pass
+        except PermissionError:
+            return  # alive, owned by someone else
+        
+        for filename in SINGLETON_FILES:
+            try:
+                os.remove(os.path.join(path, filename))
+            except OSError:
+                pass
@@ -0,0 +1,120 @@
+import json
+from typing import Dict, Iterable, List, Optional, Union
+
+# Network.setBlockedURLs patterns ('*' matches anything, including query strings)
+IMAGE_PATTERNS = ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*']
+FONT_PATTERNS = ['*.woff*', '*.ttf*', '*.otf*', '*.eot*']
+MEDIA_PATTERNS = ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*']
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*segment.io*',
+    '*cdn.segment.com*',
+    '*nr-data.net*',
+    '*newrelic.com*',
+    '*optimizely.com*',
+    '*bat.bing.com*',
+    '*analytics.tiktok.com*',
+    '*scorecardresearch.com*',
+    '*quantserve.com*',
+    '*branch.io*',
+    '*braze.com*',
+    '*intercom.io*',
+    '*zdassets.com*',
+    '*livechatinc.com*'
+]
+STYLESHEET_PATTERNS = ['*.css*']
+
+# The parsers and extractors only read team names and prices from the DOM, so
+# nothing visual is needed; 'aggressive' also drops CSS, which some sites use to
+# gate lazy rendering, so validate it per site with bench_blocking.py first
+BLOCK_PROFILES = {
+    'off': [],
+    'trackers': TRACKER_PATTERNS,
+    'lean': IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS,
+    'aggressive': IMAGE_PATTERNS + FONT_PATTERNS + MEDIA_PATTERNS + TRACKER_PATTERNS + STYLESHEET_PATTERNS
+}
+
+def network_usage(entries: Iterable[Dict]) -> Dict:
+    """
+    Bytes received and request count from performance-log entries, by DevTools resource type
+    
+    Sums encodedDataLength from Network.loadingFinished, which counts cross-origin resources too;
+    Resource Timing's transferSize is 0 for third-party assets without Timing-Allow-Origin, which
+    are exactly the ones the block lists target.
+    """
+    types = {}
+    by_type = {}
+    requests = 0
+    for entry in entries:
+        message = json.loads(entry['message']).get('message', {})
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.responseReceived':
+            types[params.get('requestId')] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            resource_type = types.get(params.get('requestId'), 'Other')
+            by_type[resource_type] = by_type.get(resource_type, 0) + params.get('encodedDataLength', 0)
+            requests += 1
+    return {'bytes': sum(by_type.values()), 'requests': requests, 'byType': by_type}
+
+class ResourceBlocker:
+    def __init__(self, profile: Union[str, Dict[str, str]] = 'lean',
+                 extra_patterns: Optional[Dict[str, List[str]]] = None):
+        """
+        Block resources the odds extraction doesn't need, per bookmaker tab
+        
+        Args:
+            profile: BLOCK_PROFILES name for every bookmaker, or {bookmaker: profile name} ('off' where missing)
+            extra_patterns: Additional site-specific URL patterns per bookmaker
+        """
+        names = profile.values() if isinstance(profile, dict) else [profile]
+        for name in names:
+            if name not in BLOCK_PROFILES:
+                raise ValueError(f"Unknown block profile '{name}' (choose from {', '.join(BLOCK_PROFILES)})")
+        
+        if isinstance(profile, dict):
+            self.profiles = dict(profile)
+            self.default_profile = 'off'
+        else:
+            self.profiles = {}
+            self.default_profile = profile
+        self.extra_patterns = extra_patterns or {}
+        
+        # (session, window) pairs that already have the Network domain enabled
+        self._prepared = set()
+    
+    def profile_for(self, name: str) -> str:
+        return self.profiles.get(name, self.default_profile)
+    
+    def patterns_for(self, name: str) -> List[str]:
+        return BLOCK_PROFILES[self.profile_for(name)] + self.extra_patterns.get(name, [])
+    
+    def apply(self, driver, name: str):
+        """Install the bookmaker's block list on the current tab before it navigates"""
+        tab = (driver.session_id, driver.current_window_handle)
+        if tab not in self._prepared:
+            driver.execute_cdp_cmd('Network.enable', {})
+            self._prepared.add(tab)
+        
+        # Always set, so a pooled tab reused for another profile doesn't keep stale patterns
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns_for(name)})
+    
+    @staticmethod
+    def usage(driver, earlier_entries: Iterable[Dict] = ()) -> Dict:
+        """
+        Bytes received and request count since the performance log was last drained
+        
+        Needs the performance log on (NetworkCapture.enable); earlier_entries are log entries another
+        reader already drained for the same page load (the feed capture).
+        """
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return {}
+        return network_usage([*earlier_entries, *entries])
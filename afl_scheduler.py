@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+from urllib.parse import urlparse
+
+from afl_kickoff import parse_kickoff
+
+def kickoff_timestamp(record: Dict) -> Optional[float]:
+    """Epoch seconds of a record's kickoff (stamped at scrape time; parsed here only for unstamped records)"""
+    if 'kickoff_ts' in record:
+        return record['kickoff_ts']
+    parsed = parse_kickoff(record.get('match_time'))
+    return parsed[0] if parsed else None
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`; each request spends one"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Take a token, waiting for one if needed; returns seconds waited, or None if that would exceed timeout"""
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return now - start
+                wait = (1 - self.tokens) / self.rate
+            
+            if timeout is not None and time.monotonic() - start + wait > timeout:
+                return None
+            time.sleep(wait)
+
+class DomainRateLimiter:
+    def __init__(self, requests_per_minute: float = 20.0, burst: float = 2.0):
+        """
+        Per-domain token buckets for page navigations
+        
+        Args:
+            requests_per_minute: Sustained navigations allowed per bookmaker domain
+            burst: Navigations a domain can take back to back after being idle
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.waited: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def domain(url: str) -> str:
+        netloc = urlparse(url).netloc.lower()
+        return netloc[4:] if netloc.startswith('www.') else netloc
+    
+    def acquire(self, url: str, timeout: Optional[float] = None) -> bool:
+        """Wait for the URL's domain to allow another request; False if it can't within timeout"""
+        domain = self.domain(url)
+        with self._lock:
+            if domain not in self.buckets:
+                self.buckets[domain] = TokenBucket(self.requests_per_minute / 60, self.burst)
+            bucket = self.buckets[domain]
+        
+        waited = bucket.acquire(timeout)
+        if waited is None:
+            return False
+        
+        with self._lock:
+            self.waited[domain] = self.waited.get(domain, 0.0) + waited
+        if waited > 0.05:
+            print(f"  ⏳ Rate limited {domain} for {waited:.1f}s")
+        return True
+
+class RefreshScheduler:
+    def __init__(self, match_key: Callable[[str, str], Hashable], min_interval: float = 5.0, max_interval: float = 600.0,
+                 default_interval: float = 60.0, proximity_factor: float = 1 / 60,
+                 volatility_window: float = 600.0, volatility_weight: float = 1.0):
+        """
+        Give each bookmaker page its own refresh interval from its matches' kickoff proximity and price volatility
+        
+        Args:
+            match_key: Function (home_team, away_team) -> match key (TeamRegistry.match_key)
+            min_interval: Fastest refresh for any page, in seconds
+            max_interval: Slowest refresh (pages whose matches are days away, or with no active matches)
+            default_interval: Refresh for matches whose kickoff time is unknown
+            proximity_factor: Interval as a fraction of the time to kickoff (1/60: 20 minutes out -> 20s)
+            volatility_window: Seconds of price moves counted towards a match's volatility
+            volatility_weight: How strongly moves per minute shorten the interval
+        """
+        self.match_key = match_key
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.proximity_factor = proximity_factor
+        self.volatility_window = volatility_window
+        self.volatility_weight = volatility_weight
+        
+        # page -> match_key -> kickoff epoch seconds (None if unknown), for matches still before kickoff
+        self.active: Dict[str, Dict[str, Optional[float]]] = {}
+        # (page, match_key) -> timestamps of recent price moves
+        self.moves: Dict[tuple, Deque[float]] = {}
+        self.intervals: Dict[str, float] = {}
+        self.next_due: Dict[str, float] = {}
+        
+        self.polls: Dict[str, int] = {}
+        self.useful_polls: Dict[str, int] = {}
+        self.started: Dict[str, set] = {}
+    
+    def add_page(self, name: str, now: Optional[float] = None):
+        """Register a page as due immediately"""
+        self.next_due.setdefault(name, time.time() if now is None else now)
+    
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Pages whose refresh interval has elapsed, most overdue first"""
+        now = time.time() if now is None else now
+        return sorted((name for name, due in self.next_due.items() if due <= now), key=self.next_due.get)
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return max(0.0, min(self.next_due.values(), default=now + self.max_interval) - now)
+    
+    def filter_active(self, name: str, records: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """Drop matches that have kicked off and remember the kickoff of the rest"""
+        now = time.time() if now is None else now
+        active = {}
+        kept = []
+        
+        for record in records:
+            key = self.match_key(record['home_team'], record['away_team'])
+            kickoff = kickoff_timestamp(record)
+            if kickoff is not None and kickoff <= now:
+                self.started.setdefault(name, set()).add(key)
+                continue
+            active[key] = kickoff
+            kept.append(record)
+        
+        for key in self.active.get(name, {}):
+            if key not in active:
+                self.moves.pop((name, key), None)
+        
+        self.active[name] = active
+        return kept
+    
+    def observe(self, name: str, deltas: List, now: Optional[float] = None) -> float:
+        """Record a poll's price moves and schedule the page's next refresh; returns the new interval"""
+        now = time.time() if now is None else now
+        
+        for delta in deltas:
+            if delta.old_price is not None and delta.new_price is not None:
+                self.moves.setdefault((name, delta.match_key), deque()).append(now)
+        
+        self.polls[name] = self.polls.get(name, 0) + 1
+        if deltas:
+            self.useful_polls[name] = self.useful_polls.get(name, 0) + 1
+        
+        interval = min(
+            (self.match_interval(kickoff, self.moves_per_minute(name, key, now), now)
+             for key, kickoff in self.active.get(name, {}).items()),
+            default=self.max_interval
+        )
+        self.intervals[name] = interval
+        self.next_due[name] = now + interval
+        return interval
+    
+    def match_interval(self, kickoff: Optional[float], moves_per_minute: float, now: float) -> float:
+        if kickoff is None:
+            interval = self.default_interval
+        else:
+            interval = (kickoff - now) * self.proximity_factor
+        interval /= 1 + self.volatility_weight * moves_per_minute
+        return min(self.max_interval, max(self.min_interval, interval))
+    
+    def moves_per_minute(self, name: str, key: str, now: float) -> float:
+        moves = self.moves.get((name, key))
+        if not moves:
+            return 0.0
+        while moves and moves[0] < now - self.volatility_window:
+            moves.popleft()
+        return len(moves) / (self.volatility_window / 60)
+    
+    def report(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                'interval': self.intervals.get(name),
+                'active_matches': len(self.active.get(name, {})),
+                'polls': self.polls.get(name, 0),
+                'useful_polls': self.useful_polls.get(name, 0),
+                'dropped_started': len(self.started.get(name, ()))
+            }
+            for name in self.next_due
+        }
+    
+    def print_report(self):
+        print("\nRefresh schedule:")
+        for name, stats in self.report().items():
+            interval = f"{stats['interval']:.0f}s" if stats['interval'] is not None else "-"
+            useful = stats['useful_polls'] / stats['polls'] if stats['polls'] else 0.0
+            print(f"  {name}: every {interval}, {stats['active_matches']} active matches, "
+                  f"{stats['polls']} polls ({useful:.0%} with price changes), "
+                  f"{stats['dropped_started']} started matches dropped")
@@ -1,21 +1,98 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from afl_card_cache import CardCache
+from afl_circuit_breaker import CircuitBreakers
+from afl_driver_cache import DriverCache
+from afl_driver_pool import DriverPool
+from afl_kickoff import normalize_kickoffs, authoritative_kickoff, format_kickoff
+from afl_parse_pipeline import ParsePipeline
+from afl_page_waits import PageReadyWaiter
+from afl_profile_cache import ProfileCache
+from afl_resource_blocking import ResourceBlocker
+from afl_scheduler import DomainRateLimiter
+from afl_teams import TeamRegistry
+from afl_js_extractors import SPORTSBET_EXTRACTOR, LADBROKES_EXTRACTOR, POINTSBET_EXTRACTOR
+from afl_network_capture import (NetworkCapture, decode_sportsbet_feed, decode_ladbrokes_feed, decode_pointsbet_feed,
+                                 decode_sportsbet_frame, decode_ladbrokes_frame, decode_pointsbet_frame)
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 import json
+import os
+import threading
 import time
 import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    # The compiled module, not the bare package: a broken lxml build still imports as 'lxml'
+    # and only fails later inside BeautifulSoup with FeatureNotFound
+    from lxml import etree  # noqa: F401 - only needed so BeautifulSoup can use the 'lxml' tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# ChromeDriver's own page load timeout, restored after a deadline-bounded navigation
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+
+# Collects the outerHTML of every event card matching a selector, optionally widened
+# to the closest ancestor that holds the card's prices (ladbrokes nests them)
+EVENT_CARDS_SCRIPT = """
+const [selector, closest] = arguments;
+const seen = new Set();
+const cards = [];
+for (const el of document.querySelectorAll(selector)) {
+    const card = closest ? (el.closest(closest) || el) : el;
+    if (!seen.has(card)) {
+        seen.add(card);
+        cards.push(card.outerHTML);
+    }
+}
+return cards;
+"""
 
 class AFLSeleniumScraper:
-    def __init__(self, headless=True):
-        """Initialize the Selenium-based AFL scraper"""
+    def __init__(self, headless=True, parallel=False, max_workers=3, driver_pool: Optional[DriverPool] = None,
+                 fast_parse=True, js_extract=True, debug_html_dir: Optional[str] = None, network_capture=False,
+                 block_profile: Union[str, Dict[str, str], None] = None, page_load_strategy='normal',
+                 profile_cache: Optional[ProfileCache] = None, driver_cache: Optional[DriverCache] = None,
+                 parse_workers=0, parse_queue_size=2, card_cache: Optional[CardCache] = None,
+                 snapshot_deadline: Optional[float] = None, circuit_breakers: Optional[CircuitBreakers] = None,
+                 metrics_file: Optional[str] = None, rate_limiter: Optional[DomainRateLimiter] = None,
+                 team_registry: Optional[TeamRegistry] = None):
+        """
+        Initialize the Selenium-based AFL scraper
+        
+        Args:
+            headless: Run Chrome without a visible window
+            parallel: Scrape bookmakers concurrently, one browser session per site
+            max_workers: Maximum number of browser sessions running at once in parallel mode
+            driver_pool: Warm browser pool to reuse across snapshots (None = one-shot start_driver/stop_driver)
+            fast_parse: Parse with lxml restricted to the event-card subtrees instead of html.parser over the whole page
+            js_extract: Extract odds records in the browser, falling back to page_source parsing when that finds nothing
+            debug_html_dir: Save each rendered page as <bookmaker>_selenium_debug.html here (fixtures for bench_parsers.py)
+            network_capture: Read odds from the bookmakers' JSON feed responses via DevTools, falling back to the DOM
+                (off by default until the feed patterns are verified against recorded live responses)
+            block_profile: Resource blocking profile name, or {bookmaker: profile} (see afl_resource_blocking.BLOCK_PROFILES)
+            page_load_strategy: 'normal', 'eager' (return at DOMContentLoaded) or 'none' (return immediately);
+                the price-stability wait decides when the odds are actually there
+            profile_cache: Persistent per-bookmaker Chrome profiles, so JS bundles and assets come from a warm disk
+                cache (each bookmaker then gets its own browser session, as in parallel mode)
+            driver_cache: ChromeDriver path lookup keyed by installed Chrome version (default ~/.afl_chromedriver.json)
+            parse_workers: Parse page sources on this many worker threads while the browser loads the next site
+                (0 = parse inline); applies to the sequential and pooled modes
+            parse_queue_size: Page sources allowed to wait for a parser before fetching blocks
+            card_cache: Reuse parsed records for event cards unchanged since the last read_event_cards poll
+                (used by the card-HTML path, i.e. with js_extract=False or when the JS extractor finds nothing)
+            snapshot_deadline: Seconds a scrape_all_odds snapshot may take; books not back by then are dropped
+                and the rest are returned as a partial snapshot (None = no deadline)
+            circuit_breakers: Per-bookmaker breakers that skip a repeatedly failing book with exponential backoff
+            metrics_file: Append each snapshot's cycle latency, late/skipped books and breaker states here (JSONL)
+            rate_limiter: Per-domain token buckets every page navigation waits on (default 20/min, burst 2)
+            team_registry: Alias -> team ID table used to join the same fixture across books (default AFL clubs)
+        """
         
         self.chrome_options = Options()
         
@@ -31,35 +108,183 @@ class AFLSeleniumScraper:
         self.chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.chrome_options.add_experimental_option('useAutomationExtension', False)
+        self.chrome_options.page_load_strategy = page_load_strategy
         
         self.driver = None
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.driver_pool = driver_pool
+        
+        self.fast_parse = fast_parse
+        self.js_extract = js_extract
+        self.debug_html_dir = debug_html_dir
+        
+        # Odds feed capture from the DevTools Network events (feed bodies are recorded alongside the debug HTML)
+        self.network_capture = network_capture
+        self.feed_capture = NetworkCapture(record_dir=debug_html_dir)
+        
+        # Per-bookmaker URL blocking applied to each tab before it navigates
+        self.resource_blocker = ResourceBlocker(block_profile) if block_profile else None
+        
+        # Feed capture and the blocker's per-page byte counts both read the DevTools performance log
+        if network_capture or self.resource_blocker:
+            NetworkCapture.enable(self.chrome_options)
+        
+        # bookmaker -> bytes/requests/time-to-odds of its most recent page load
+        self.load_reports = {}
+        
+        # bookmaker -> epoch seconds its page was last read; countdown badges are relative to this
+        self.fetched_at: Dict[str, float] = {}
+        
+        self.profile_cache = profile_cache
+        
+        # ChromeDriver is only looked up online when the installed Chrome's major version changes
+        self.driver_cache = driver_cache or DriverCache()
+        
+        # Seconds spent resolving the driver vs launching the browser, from the most recent start; parallel
+        # sessions launch browsers from worker threads, so it is only touched under _startup_lock
+        self.startup_timings = {}
+        self._startup_lock = threading.Lock()
+        
+        # Adaptive DOM-readiness / price-stability waits, with per-site time-to-ready histograms
+        self.page_waiter = PageReadyWaiter()
+        
+        # Wall-clock timings (seconds) from the most recent scrape_all_odds call
+        self.last_timings = {}
+        
+        # Fetch/parse overlap: queue depth and stage utilisation from the most recent pipelined scrape
+        self.parse_workers = parse_workers
+        self.parse_queue_size = parse_queue_size
+        self.pipeline_report = {}
+        
+        self.card_cache = card_cache
+        
+        # Partial snapshots: books still loading at the deadline are dropped, failing books are skipped
+        self.snapshot_deadline = snapshot_deadline
+        self.breakers = circuit_breakers or CircuitBreakers()
+        self.metrics_file = metrics_file
+        self.snapshot_metrics = {}
+        self._deadline_at: Optional[float] = None
+        self._late = set()
+        # bookmaker -> parallel session that missed its deadline and may still be driving a browser
+        self._in_flight: Dict[str, Future] = {}
+        
+        # Politeness is per domain: each bookmaker has its own budget instead of a fixed pause between sites
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        
+        # Every alias a book uses for a club resolves to one integer team ID
+        self.teams = team_registry or TeamRegistry()
+        
+        # bookmaker -> listings the last consolidate_odds call had to flip onto the canonical home/away order
+        self.orientation_conflicts: Counter = Counter()
         
         self.bookmakers = {
             'sportsbet': {
                 'url': 'https://www.sportsbet.com.au/betting/australian-rules/afl',
                 'wait_selector': '[data-automation-id*="competition-event-card"]',
-                'parser': self._parse_sportsbet_selenium
+                'card_selector': 'div[data-automation-id*="-competition-event-card"]',
+                'card_closest': None,
+                'price_selector': 'span[data-automation-id="price-text"]',
+                # Raw patterns, compiled once into config['selectors'] by _compile_selectors; like the *= selectors
+                # in the JS extractors they match anywhere in the attribute
+                'patterns': {
+                    'event_card': r'\d-competition-event-card',
+                    'feed_url': r'/apigw/sportsbook-sports/Sportsbook/Sports/Competitions/\d+',
+                    'ws_url': r'^wss://push\.sportsbet\.com\.au/'
+                },
+                'js_extractor': SPORTSBET_EXTRACTOR,
+                'feed_decoder': decode_sportsbet_feed,
+                'frame_decoder': decode_sportsbet_frame,
+                'parser': self._parse_sportsbet_selenium,
+                'card_parser': self._parse_sportsbet_card
             },
             'ladbrokes': {
                 'url': 'https://www.ladbrokes.com.au/sports/australian-rules/afl',
                 'wait_selector': '[data-testid="team-vs-team"]',
-                'parser': self._parse_ladbrokes_selenium
+                'card_selector': 'div[data-testid="team-vs-team"]',
+                'card_closest': 'div.cursor-pointer[class*="flex"]',
+                'price_selector': 'span[data-testid="price-button-odds"]',
+                'patterns': {
+                    'match_card': r'flex.*cursor-pointer',
+                    'price_button': r'price-button-',
+                    'countdown': r'countdown-badge',
+                    'feed_url': r'api\.ladbrokes\.com\.au/v2/sport/event-request',
+                    'ws_url': r'^wss://[\w.-]*ladbrokes\.com\.au/'
+                },
+                'js_extractor': LADBROKES_EXTRACTOR,
+                'feed_decoder': decode_ladbrokes_feed,
+                'frame_decoder': decode_ladbrokes_frame,
+                'parser': self._parse_ladbrokes_selenium,
+                'card_parser': self._parse_ladbrokes_card
             },
             'pointsbet': {
                 'url': 'https://pointsbet.com.au/sports/aussie-rules/AFL',
                 'wait_selector': '[data-test="event"]',
-                'parser': self._parse_pointsbet_selenium
+                'card_selector': 'div[data-test="event"]',
+                'card_closest': None,
+                'price_selector': 'span.fheif50',
+                'patterns': {
+                    'team_link': r'EventTeamNameWrapperLinkLink',
+                    'top_h2h_button': r'EventTopMarket0OddsButton',
+                    'bottom_h2h_button': r'EventBottomMarket0OddsButton',
+                    'event_footer': r'EventEventFooter',
+                    'feed_url': r'api\.pointsbet\.com/api/v2/competitions/\d+/events/featured',
+                    'ws_url': r'^wss://[\w.-]*pointsbet\.com/'
+                },
+                'js_extractor': POINTSBET_EXTRACTOR,
+                'feed_decoder': decode_pointsbet_feed,
+                'frame_decoder': decode_pointsbet_frame,
+                'parser': self._parse_pointsbet_selenium,
+                'card_parser': self._parse_pointsbet_card
             }
         }
+        
+        self._compile_selectors()
+    
+    def _compile_selectors(self):
+        """Compile every bookmaker's parser patterns and attribute filters once, up front"""
+        for name, config in self.bookmakers.items():
+            selectors = {key: re.compile(pattern) for key, pattern in config['patterns'].items()}
+            config['selectors'] = selectors
+        
+        sportsbet = self.bookmakers['sportsbet']['selectors']
+        sportsbet['event_card_attrs'] = {'data-automation-id': sportsbet['event_card']}
+        sportsbet['participant_one_attrs'] = {'data-automation-id': 'participant-one'}
+        sportsbet['participant_two_attrs'] = {'data-automation-id': 'participant-two'}
+        sportsbet['market_label_attrs'] = {'data-automation-id': 'market-coupon-label'}
+        sportsbet['price_text_attrs'] = {'data-automation-id': 'price-text'}
+        sportsbet['card_time_attrs'] = {'data-automation-id': 'competition-event-card-time'}
+        
+        ladbrokes = self.bookmakers['ladbrokes']['selectors']
+        ladbrokes['team_vs_team_attrs'] = {'data-testid': 'team-vs-team'}
+        ladbrokes['price_button_attrs'] = {'data-testid': ladbrokes['price_button']}
+        ladbrokes['price_odds_attrs'] = {'data-testid': 'price-button-odds'}
+        
+        pointsbet = self.bookmakers['pointsbet']['selectors']
+        pointsbet['event_attrs'] = {'data-test': 'event'}
+        pointsbet['team_link_attrs'] = {'data-test': pointsbet['team_link']}
+        pointsbet['top_h2h_attrs'] = {'data-test': pointsbet['top_h2h_button']}
+        pointsbet['bottom_h2h_attrs'] = {'data-test': pointsbet['bottom_h2h_button']}
+        pointsbet['event_footer_attrs'] = {'data-test': pointsbet['event_footer']}
+        pointsbet['time_of_day_attrs'] = {'data-test': 'timeOfDay'}
+        
+        # Subtrees each parser needs; everything else is skipped by the fast path
+        self.bookmakers['sportsbet']['strainer'] = SoupStrainer('div', attrs=sportsbet['event_card_attrs'])
+        self.bookmakers['ladbrokes']['strainer'] = SoupStrainer('div', class_=ladbrokes['match_card'])
+        self.bookmakers['pointsbet']['strainer'] = SoupStrainer('div', attrs=pointsbet['event_attrs'])
+        
+        # The element each card parser starts from (ladbrokes works outward from the team-vs-team block)
+        self.bookmakers['sportsbet']['card_finder'] = lambda soup: soup.find_all('div', sportsbet['event_card_attrs'])
+        self.bookmakers['ladbrokes']['card_finder'] = lambda soup: soup.find_all('div', ladbrokes['team_vs_team_attrs'])
+        self.bookmakers['pointsbet']['card_finder'] = lambda soup: soup.find_all('div', pointsbet['event_attrs'])
     
     def start_driver(self):
         """Start the Chrome driver with automatic driver management"""
         try:
-            # Automatically download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            print("✓ Chrome driver started successfully")
+            self.driver = self._create_driver(self._resolve_driver_path())
+            startup = self._startup_snapshot()
+            print(f"✓ Chrome driver started successfully (driver {startup['driver_resolution']:.2f}s "
+                  f"from {startup['driver_source']}, browser launch {startup['browser_launch']:.2f}s)")
             return True
         except Exception as e:
             print(f"✗ Error starting Chrome driver: {e}")
@@ -72,376 +297,957 @@ class AFLSeleniumScraper:
             self.driver.quit()
             self.driver = None
     
-    def scrape_all_odds(self) -> Dict[str, List[Dict]]:
+    def _resolve_driver_path(self) -> str:
+        """ChromeDriver path for the installed Chrome, from the local cache or ChromeDriverManager on a mismatch"""
+        driver_path = self.driver_cache.resolve()
+        with self._startup_lock:
+            self.startup_timings['driver_resolution'] = self.driver_cache.last_resolution['seconds']
+            self.startup_timings['driver_source'] = self.driver_cache.last_resolution['source']
+        return driver_path
+    
+    def _startup_snapshot(self) -> Dict:
+        """Consistent copy of startup_timings while worker threads may still be launching browsers"""
+        with self._startup_lock:
+            return dict(self.startup_timings)
+    
+    def create_driver_pool(self, size: Optional[int] = None, **pool_options) -> DriverPool:
+        """Create a warm browser pool and use it for subsequent scrapes"""
+        driver_path = self._resolve_driver_path()
+        if size is None:
+            size = self.max_workers if self.parallel else 1
+        
+        self.driver_pool = DriverPool(lambda: self._create_driver(driver_path), size=size, **pool_options)
+        return self.driver_pool
+    
+    def _create_driver(self, driver_path: str, profile: Optional[str] = None):
+        """Launch a new Chrome session using the given ChromeDriver binary (and persistent profile, if any)"""
+        options = self.chrome_options
+        if self.profile_cache and profile:
+            options = self.profile_cache.options_for(self.chrome_options, profile)
+        
+        launch_start = time.perf_counter()
+        service = Service(driver_path)
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        with self._startup_lock:
+            self.startup_timings['browser_launch'] = time.perf_counter() - launch_start
+        return driver
+    
+    def scrape_all_odds(self, parallel: Optional[bool] = None) -> Dict[str, List[Dict]]:
         """Scrape odds from all configured bookmakers"""
+        if parallel is None:
+            parallel = self.parallel
+        
+        cycle_start = time.perf_counter()
+        self._deadline_at = cycle_start + self.snapshot_deadline if self.snapshot_deadline else None
+        self._late = set()
+        
+        # Books whose circuit is open sit this snapshot out
+        bookmakers = {name: config for name, config in self.bookmakers.items() if self.breakers.allow(name)}
+        skipped = [name for name in self.bookmakers if name not in bookmakers]
+        for name in skipped:
+            print(f"⏸ Skipping {name}: circuit open ({self.breakers.describe(name)})")
+        
+        # A late session can't be cancelled once running, so its book sits out until that session ends
+        self._in_flight = {name: future for name, future in self._in_flight.items() if not future.done()}
+        busy = [name for name in bookmakers if name in self._in_flight]
+        for name in busy:
+            print(f"⏳ Skipping {name}: the last snapshot's session is still running")
+            del bookmakers[name]
+        skipped += busy
+        
+        if not bookmakers:
+            all_odds = {}
+        elif parallel:
+            all_odds = self._scrape_all_odds_parallel(bookmakers)
+        elif self.driver_pool:
+            all_odds = self._scrape_all_odds_pooled(bookmakers)
+        elif self.profile_cache:
+            all_odds = self._scrape_all_odds_profiled(bookmakers)
+        else:
+            all_odds = self._scrape_all_odds_sequential(bookmakers)
+        
+        # One walk of the profile tree per snapshot rather than one per browser quit
+        if self.profile_cache:
+            self.profile_cache.enforce_budget()
+        
+        return self._finish_snapshot(bookmakers, skipped, all_odds, time.perf_counter() - cycle_start)
+    
+    def _scrape_all_odds_sequential(self, bookmakers: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Scrape all bookmakers one after another in a single browser session"""
+        total_start = time.perf_counter()
+        site_timings = {}
+        
         if not self.start_driver():
             return {}
         
         all_odds = {}
         
         try:
-            for bookmaker_name, config in self.bookmakers.items():
+            if self.parse_workers:
+                all_odds = self._scrape_sites_pipelined(
+                    lambda name, config: self._fetch_bookmaker(name, config), bookmakers, site_timings)
+                return all_odds
+            
+            for bookmaker_name, config in bookmakers.items():
+                if self._deadline_passed():
+                    print(f"⏱ Snapshot deadline reached; dropping {bookmaker_name}")
+                    continue
+                
                 print(f"Scraping {bookmaker_name}...")
+                site_start = time.perf_counter()
                 try:
                     odds = self._scrape_bookmaker_selenium(bookmaker_name, config)
                     all_odds[bookmaker_name] = odds
+                    site_timings[bookmaker_name] = time.perf_counter() - site_start
                     print(f"✓ Found {len(odds)} matches from {bookmaker_name}")
-                    
-                    # Be respectful - add delay between sites
-                    time.sleep(3)
-                    
                 except Exception as e:
                     print(f"✗ Error scraping {bookmaker_name}: {str(e)}")
                     all_odds[bookmaker_name] = []
+                    site_timings[bookmaker_name] = time.perf_counter() - site_start
         
         finally:
             self.stop_driver()
+            self._record_timings('sequential-pipelined' if self.parse_workers else 'sequential',
+                                 site_timings, time.perf_counter() - total_start)
+        
+        return all_odds
+    
+    def _scrape_all_odds_pooled(self, bookmakers: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Scrape all bookmakers sequentially in a warm session from the driver pool"""
+        total_start = time.perf_counter()
+        site_timings = {}
+        all_odds = {}
+        
+        try:
+            session = self.driver_pool.acquire()
+        except Exception as e:
+            print(f"✗ Error getting a browser session from the pool: {e}")
+            return {}
+        
+        try:
+            if self.parse_workers:
+                all_odds = self._scrape_sites_pipelined(
+                    lambda name, config: self._fetch_bookmaker_pooled_tab(session, name, config), bookmakers, site_timings)
+            else:
+                for bookmaker_name, config in bookmakers.items():
+                    if self._deadline_passed():
+                        print(f"⏱ Snapshot deadline reached; dropping {bookmaker_name}")
+                        continue
+                    
+                    print(f"Scraping {bookmaker_name}...")
+                    site_start = time.perf_counter()
+                    try:
+                        odds = self._scrape_bookmaker_pooled_tab(session, bookmaker_name, config)
+                        all_odds[bookmaker_name] = odds
+                        print(f"✓ Found {len(odds)} matches from {bookmaker_name}")
+                    except Exception as e:
+                        print(f"✗ Error scraping {bookmaker_name}: {str(e)}")
+                        all_odds[bookmaker_name] = []
+                    site_timings[bookmaker_name] = time.perf_counter() - site_start
+        finally:
+            self.driver_pool.release(session)
+        
+        self._record_timings('pooled-pipelined' if self.parse_workers else 'pooled',
+                             site_timings, time.perf_counter() - total_start)
+        return all_odds
+    
+    def _scrape_all_odds_profiled(self, bookmakers: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Scrape all bookmakers sequentially, each in a browser on its own persistent profile"""
+        total_start = time.perf_counter()
+        site_timings = {}
+        all_odds = {}
+        
+        try:
+            driver_path = self._resolve_driver_path()
+        except Exception as e:
+            print(f"✗ Error resolving ChromeDriver: {e}")
+            return {}
+        
+        for bookmaker_name, config in bookmakers.items():
+            if self._deadline_passed():
+                print(f"⏱ Snapshot deadline reached; dropping {bookmaker_name}")
+                continue
+            
+            print(f"Scraping {bookmaker_name} ({self.profile_cache.state.get(bookmaker_name) or 'persistent'} profile)...")
+            site_start = time.perf_counter()
+            try:
+                odds, site_timings[bookmaker_name] = self._scrape_bookmaker_session(bookmaker_name, config, driver_path)
+                all_odds[bookmaker_name] = odds
+                print(f"✓ Found {len(odds)} matches from {bookmaker_name}")
+            except Exception as e:
+                print(f"✗ Error scraping {bookmaker_name}: {str(e)}")
+                all_odds[bookmaker_name] = []
+                site_timings[bookmaker_name] = time.perf_counter() - site_start
+        
+        self._record_timings('profiled', site_timings, time.perf_counter() - total_start)
+        return all_odds
+    
+    def warm_profile_cache(self, force: bool = False):
+        """Load each bookmaker whose persistent profile is still cold, so the first snapshot hits a warm cache"""
+        if not self.profile_cache:
+            return
+        
+        driver_path = self._resolve_driver_path()
+        for name, config in self.bookmakers.items():
+            if self.profile_cache.is_warm(name) and not force:
+                print(f"✓ {name} profile already warm")
+                continue
+            
+            print(f"Warming the {name} profile cache...")
+            driver = self._create_driver(driver_path, profile=name)
+            try:
+                if self.resource_blocker:
+                    self.resource_blocker.apply(driver, name)
+                load_start = time.perf_counter()
+                self._load_url(driver, config['url'])
+                result = self.page_waiter.wait(driver, name, config)
+                self._record_load(name, driver, result, time.perf_counter() - load_start)
+            except Exception as e:
+                print(f"✗ Error warming {name}: {e}")
+            finally:
+                driver.quit()
+                self.profile_cache.release(name)
+        
+        self.profile_cache.enforce_budget()
+    
+    def _scrape_bookmaker_pooled_tab(self, session, name: str, config: Dict) -> List[Dict]:
+        """Scrape one bookmaker in the tab the pooled session keeps open for it"""
+        return self._parse_fetched(name, *self._fetch_bookmaker_pooled_tab(session, name, config))
+    
+    def _fetch_bookmaker_pooled_tab(self, session, name: str, config: Dict) -> Tuple[List[Dict], Optional[str]]:
+        warm = self.driver_pool.open_tab(session, name)
+        print(f"  Using {'warm' if warm else 'new'} tab in browser session {session.session_id}")
+        return self._fetch_bookmaker(name, config, session.driver)
+    
+    def _scrape_sites_pipelined(self, fetch: Callable[[str, Dict], Tuple[List[Dict], Optional[str]]],
+                                bookmakers: Dict[str, Dict], site_timings: Dict[str, float]) -> Dict[str, List[Dict]]:
+        """Fetch each bookmaker on this thread while the parser pool works through the pages already fetched"""
+        pipeline = ParsePipeline(self.parse_page, workers=self.parse_workers, max_pending=self.parse_queue_size)
+        names = list(bookmakers)
+        
+        with pipeline:
+            for bookmaker_name in names:
+                if self._deadline_passed():
+                    print(f"⏱ Snapshot deadline reached; dropping {bookmaker_name}")
+                    continue
+                
+                print(f"Scraping {bookmaker_name}...")
+                site_start = time.perf_counter()
+                try:
+                    odds, page_source = fetch(bookmaker_name, bookmakers[bookmaker_name])
+                except Exception as e:
+                    print(f"✗ Error scraping {bookmaker_name}: {str(e)}")
+                    odds, page_source = [], None
+                site_timings[bookmaker_name] = time.perf_counter() - site_start
+                
+                if page_source is None:
+                    pipeline.put_result(bookmaker_name, odds, site_timings[bookmaker_name])
+                    print(f"✓ Found {len(odds)} matches from {bookmaker_name}")
+                else:
+                    pipeline.submit(bookmaker_name, page_source, site_timings[bookmaker_name])
+                    print(f"  Queued {bookmaker_name} page for parsing ({len(page_source) / 1024:.0f} KB)")
+        
+        self.pipeline_report = pipeline.report()
+        pipeline.print_report()
+        return {name: pipeline.results[name] for name in names if name in pipeline.results}
+    
+    def _scrape_all_odds_parallel(self, bookmakers: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Scrape all bookmakers concurrently, one browser session per bookmaker"""
+        total_start = time.perf_counter()
+        site_timings = {}
+        
+        if self.driver_pool:
+            driver_path = None
+        else:
+            try:
+                # Resolve the driver once so workers don't race on the download
+                driver_path = self._resolve_driver_path()
+            except Exception as e:
+                print(f"✗ Error resolving ChromeDriver: {e}")
+                return {}
+        
+        results = {}
+        workers = max(1, min(self.max_workers, len(bookmakers)))
+        print(f"Scraping {len(bookmakers)} bookmakers with {workers} parallel sessions...")
+        
+        # A failed session's own duration, so it isn't charged for the sites that ran before it
+        failed_after: Dict[str, float] = {}
+        
+        def run_session(name: str, config: Dict):
+            site_start = time.perf_counter()
+            try:
+                return self._scrape_bookmaker_session(name, config, driver_path)
+            except Exception:
+                failed_after[name] = time.perf_counter() - site_start
+                raise
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            executor.submit(run_session, name, config): name
+            for name, config in bookmakers.items()
+        }
         
+        try:
+            for future in as_completed(futures, timeout=self._remaining()):
+                bookmaker_name = futures[future]
+                try:
+                    odds, elapsed = future.result()
+                    print(f"✓ Found {len(odds)} matches from {bookmaker_name} ({elapsed:.1f}s)")
+                except Exception as e:
+                    print(f"✗ Error scraping {bookmaker_name}: {str(e)}")
+                    odds, elapsed = [], failed_after.get(bookmaker_name, 0.0)
+                results[bookmaker_name] = odds
+                site_timings[bookmaker_name] = elapsed
+        except FuturesTimeout:
+            for future, bookmaker_name in futures.items():
+                if not future.done():
+                    if not future.cancel():
+                        self._in_flight[bookmaker_name] = future
+                    self._late.add(bookmaker_name)
+                    print(f"⏱ {bookmaker_name} missed the snapshot deadline; dropping it")
+        finally:
+            # Running late sessions finish and clean up in the background; _in_flight keeps their books
+            # out of later snapshots until they do
+            executor.shutdown(wait=False)
+        
+        # Keep the same bookmaker ordering as the sequential mode
+        all_odds = {name: results[name] for name in bookmakers if name in results}
+        
+        self._record_timings('parallel-pooled' if self.driver_pool else 'parallel', site_timings, time.perf_counter() - total_start)
         return all_odds
     
-    def _scrape_bookmaker_selenium(self, name: str, config: Dict) -> List[Dict]:
+    def _scrape_bookmaker_session(self, name: str, config: Dict, driver_path: str):
+        """Scrape one bookmaker in its own browser session, returning (odds, seconds)"""
+        site_start = time.perf_counter()
+        
+        if self.driver_pool:
+            with self.driver_pool.session() as session:
+                odds = self._scrape_bookmaker_pooled_tab(session, name, config)
+            return odds, time.perf_counter() - site_start
+        
+        driver = self._create_driver(driver_path, profile=name)
+        try:
+            odds = self._scrape_bookmaker_selenium(name, config, driver)
+        finally:
+            driver.quit()
+            if self.profile_cache:
+                self.profile_cache.release(name)
+        return odds, time.perf_counter() - site_start
+    
+    def _remaining(self) -> Optional[float]:
+        """Seconds left before the snapshot deadline (None when there is no deadline)"""
+        if self._deadline_at is None:
+            return None
+        return max(0.0, self._deadline_at - time.perf_counter())
+    
+    def _deadline_passed(self) -> bool:
+        return self._deadline_at is not None and time.perf_counter() >= self._deadline_at
+    
+    def _finish_snapshot(self, bookmakers: Dict[str, Dict], skipped: List[str],
+                         all_odds: Dict[str, List[Dict]], cycle_seconds: float) -> Dict[str, List[Dict]]:
+        """Feed the circuit breakers, export the snapshot metrics and fill in the books that didn't report"""
+        for name in bookmakers:
+            if all_odds.get(name):
+                self.breakers.record_success(name)
+            elif name in all_odds:
+                self.breakers.record_failure(name, 'no odds')
+            elif name in self._late:
+                self.breakers.record_failure(name, 'missed deadline')
+        
+        # One kickoff format for every book, read against the moment each page was read
+        for name, odds in all_odds.items():
+            normalize_kickoffs(odds, self.fetched_at.get(name))
+        
+        # Books never started because an earlier one used up the deadline aren't held against them
+        dropped = [name for name in bookmakers if name not in all_odds and name not in self._late]
+        
+        self.snapshot_metrics = {
+            'timestamp': datetime.now().isoformat(),
+            'cycle_seconds': cycle_seconds,
+            'deadline': self.snapshot_deadline,
+            'complete': [name for name in bookmakers if all_odds.get(name)],
+            'empty': [name for name in bookmakers if name in all_odds and not all_odds[name]],
+            'late': sorted(self._late),
+            'dropped': dropped,
+            'skipped': skipped,
+            'breakers': self.breakers.report()
+        }
+        if self.metrics_file:
+            with open(self.metrics_file, 'a') as f:
+                f.write(json.dumps(self.snapshot_metrics) + "\n")
+        
+        missing = sorted(self._late) + dropped + skipped
+        print(f"📸 Snapshot in {cycle_seconds:.1f}s: {len(self.snapshot_metrics['complete'])}/{len(self.bookmakers)} "
+              f"books with odds" + (f" (missing: {', '.join(missing)})" if missing else ""))
+        
+        self._deadline_at = None
+        
+        # Late, dropped and skipped books simply contribute no odds to consolidation
+        return {name: all_odds.get(name, []) for name in self.bookmakers}
+    
+    def _record_timings(self, mode: str, site_timings: Dict[str, float], total: float):
+        """Store and report per-site and total wall-clock timings"""
+        startup = self._startup_snapshot()
+        self.last_timings = {
+            'mode': mode,
+            'sites': site_timings,
+            'total': total,
+            'sum_of_sites': sum(site_timings.values()),
+            'startup': startup
+        }
+        
+        print(f"\nScrape timings ({mode}):")
+        for bookmaker_name, elapsed in site_timings.items():
+            print(f"  {bookmaker_name}: {elapsed:.1f}s")
+        print(f"  Total wall-clock: {total:.1f}s (sum of sites: {self.last_timings['sum_of_sites']:.1f}s)")
+        if 'driver_resolution' in startup:
+            print(f"  Driver resolution: {startup['driver_resolution']:.2f}s "
+                  f"({startup['driver_source']}), "
+                  f"last browser launch: {startup.get('browser_launch', 0.0):.2f}s")
+    
+    def _scrape_bookmaker_selenium(self, name: str, config: Dict, driver=None) -> List[Dict]:
         """Scrape odds from a single bookmaker using Selenium"""
+        return self._parse_fetched(name, *self._fetch_bookmaker(name, config, driver))
+    
+    def _parse_fetched(self, name: str, odds: List[Dict], page_source: Optional[str]) -> List[Dict]:
+        """Parse the page source a fetch handed back, unless the odds were already extracted"""
+        if page_source is None:
+            return odds
+        
         try:
+            return self.parse_page(name, page_source)
+        except Exception as e:
+            print(f"  Error parsing {name}: {str(e)}")
+            return []
+    
+    def _fetch_bookmaker(self, name: str, config: Dict, driver=None) -> Tuple[List[Dict], Optional[str]]:
+        """Load a bookmaker page, returning (odds, None) when no parsing is needed, else ([], page source)"""
+        driver = driver or self.driver
+        try:
+            if self.network_capture or self.resource_blocker:
+                self.feed_capture.drain(driver)
+            
+            if self.resource_blocker:
+                self.resource_blocker.apply(driver, name)
+            
             print(f"  Loading {config['url']}...")
-            self.driver.get(config['url'])
+            load_start = time.perf_counter()
+            self._load_url(driver, config['url'])
             
-            # Wait for page to load
-            print(f"  Waiting for content to load...")
-            wait = WebDriverWait(self.driver, 15)
+            if self.network_capture:
+                odds = self.feed_capture.capture(driver, name, config)
+                stats = self.feed_capture.last_capture[name]
+                self.fetched_at[name] = time.time()
+                if odds:
+                    print(f"  ✓ Decoded {len(odds)} matches from {stats['responses']} feed responses "
+                          f"in {stats['elapsed']:.1f}s")
+                    return odds, None
+                reason = "no response matched the feed pattern" if not stats['matched_urls'] else "no odds decoded"
+                print(f"  ⚠ No odds feed captured after {stats['elapsed']:.1f}s ({reason}), falling back to the page")
             
-            try:
-                # Wait for the expected elements to appear
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, config['wait_selector'])))
-                print(f"  ✓ Content loaded")
-            except TimeoutException:
-                print(f"  ⚠ Timeout waiting for {config['wait_selector']}")
+            # Wait until the odds are rendered and have stopped changing
+            print(f"  Waiting for odds to settle...")
+            result = self.page_waiter.wait(driver, name, config, timeout=self._remaining())
+            self.fetched_at[name] = time.time()
+            self._record_load(name, driver, result, time.perf_counter() - load_start)
+            
+            if result.ready:
+                print(f"  ✓ Odds ready in {result.elapsed:.1f}s ({result.price_count} prices)")
+            elif result.failed:
+                print(f"  ✗ Page failed to load after {result.elapsed:.1f}s: {result.reason}")
+                return [], None
+            else:
+                print(f"  ⚠ Odds not settled after {result.elapsed:.1f}s ({result.reason})")
                 # Continue anyway, might still find some content
             
-            # Additional wait for dynamic content
-            time.sleep(5)
+            if self.debug_html_dir:
+                self.save_debug_html(name, driver.page_source)
             
-            # Get page source and parse
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            if self.js_extract:
+                odds = self.extract_with_js(name, config, driver)
+                if odds:
+                    print(f"  ✓ Extracted {len(odds)} matches in-browser")
+                    return odds, None
+                print(f"  ⚠ In-browser extraction found nothing, falling back to page source")
             
-            # Use the appropriate parser
-            return config['parser'](soup)
+            # Hand the page source back for parsing (inline or on the parser pool)
+            return [], driver.page_source
             
         except Exception as e:
             print(f"  Error loading {name}: {str(e)}")
+            return [], None
+    
+    def _load_url(self, driver, url: str):
+        """Navigate once the domain's rate limit allows, cutting a slow page load off at the snapshot deadline"""
+        if not self.rate_limiter.acquire(url, timeout=self._remaining()):
+            raise TimeoutError(f"rate limit for {DomainRateLimiter.domain(url)} would run past the snapshot deadline")
+        
+        remaining = self._remaining()
+        if remaining is None:
+            driver.get(url)
+            return
+        
+        driver.set_page_load_timeout(max(1.0, remaining))
+        try:
+            driver.get(url)
+        finally:
+            driver.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+    
+    def _record_load(self, name: str, driver, result, time_to_odds: float):
+        """Keep the page's transfer size and time-to-odds so blocking profiles can be compared"""
+        usage = ResourceBlocker.usage(driver, self.feed_capture.last_entries.pop(name, []))
+        self.load_reports[name] = {
+            'profile': self.resource_blocker.profile_for(name) if self.resource_blocker else 'off',
+            'page_load_strategy': self.chrome_options.page_load_strategy,
+            'time_to_odds': time_to_odds,
+            'ready': result.ready,
+            'bytes': usage.get('bytes', 0),
+            'requests': usage.get('requests', 0),
+            'bytes_by_type': usage.get('byType', {}),
+            'cache': self.profile_cache.state.get(name, 'none') if self.profile_cache else 'none'
+        }
+        if self.profile_cache and name in self.profile_cache.state:
+            self.profile_cache.record_load(name, self.load_reports[name])
+        print(f"  Page: {self.load_reports[name]['bytes'] / 1024:.0f} KB in {self.load_reports[name]['requests']} requests, "
+              f"odds after {time_to_odds:.1f}s")
+    
+    def save_debug_html(self, name: str, page_source: str):
+        """Save debug HTML file"""
+        os.makedirs(self.debug_html_dir, exist_ok=True)
+        path = os.path.join(self.debug_html_dir, f"{name}_selenium_debug.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page_source)
+        print(f"  Saved debug HTML to {path}")
+    
+    def extract_with_js(self, name: str, config: Dict, driver=None) -> List[Dict]:
+        """Run the bookmaker's in-browser extractor and return its match records"""
+        driver = driver or self.driver
+        script = config.get('js_extractor')
+        if not script:
             return []
+        
+        try:
+            raw_records = driver.execute_script(script) or []
+        except Exception as e:
+            print(f"  ⚠ In-browser extraction failed for {name}: {e}")
+            return []
+        
+        matches = []
+        for record in raw_records:
+            try:
+                matches.append({
+                    'home_team': record['home_team'],
+                    'away_team': record['away_team'],
+                    'home_odds': float(record['home_odds']),
+                    'away_odds': float(record['away_odds']),
+                    'match_time': record.get('match_time'),
+                    'bookmaker': name
+                })
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"    ✗ Skipping malformed record from {name}: {e}")
+        
+        return matches
+    
+    def parse_page(self, name: str, page_source: str, fast: Optional[bool] = None) -> List[Dict]:
+        """Parse a bookmaker page (or card fragment) with that bookmaker's parser"""
+        config = self.bookmakers[name]
+        return config['parser'](self.make_soup(name, page_source, fast))
+    
+    def make_soup(self, name: str, page_source: str, fast: Optional[bool] = None) -> BeautifulSoup:
+        """Build the soup for a bookmaker page using the fast (lxml + strainer) or full html.parser path"""
+        if fast is None:
+            fast = self.fast_parse
+        
+        if fast and LXML_AVAILABLE:
+            return BeautifulSoup(page_source, 'lxml', parse_only=self.bookmakers[name]['strainer'])
+        
+        return BeautifulSoup(page_source, 'html.parser')
+    
+    def read_event_cards(self, name: str, config: Dict, driver=None) -> List[Dict]:
+        """
+        Re-read only the event cards of an already loaded bookmaker page (no navigation)
+        
+        With js_extract the records come straight from the in-browser extractor and the card cache is
+        bypassed; otherwise each card's outer HTML is pulled and only changed cards are re-parsed.
+        """
+        driver = driver or self.driver
+        
+        if self.js_extract:
+            odds = self.extract_with_js(name, config, driver)
+            if odds:
+                return normalize_kickoffs(odds)
+        
+        # Pull just the outer HTML of each event card instead of the whole page source
+        card_html = driver.execute_script(EVENT_CARDS_SCRIPT, config['card_selector'], config.get('card_closest'))
+        if not card_html:
+            return []
+        
+        # Kickoffs are stamped after the card cache: a cached countdown badge is only valid for the poll that read it
+        if self.card_cache:
+            odds = self.card_cache.parse(name, card_html, lambda fragments: self.parse_card_fragments(name, fragments))
+        else:
+            odds = self.parse_page(name, ''.join(card_html))
+        return normalize_kickoffs(odds)
+    
+    def parse_card_fragments(self, name: str, fragments: List[str]) -> List[List[Dict]]:
+        """Parse each card's outer HTML, returning the records found in each fragment (in order)"""
+        config = self.bookmakers[name]
+        cards = config['card_finder'](self.make_soup(name, ''.join(fragments)))
+        
+        if len(cards) == len(fragments):
+            records = [config['card_parser'](card, i) for i, card in enumerate(cards)]
+            return [[record] if record else [] for record in records]
+        
+        # Some fragment held no card or several, so the cards can't be lined up; parse them one by one
+        return [self.parse_page(name, fragment) for fragment in fragments]
+    
+    def _parse_cards(self, cards: List, card_parser: Callable) -> List[Dict]:
+        """Run a bookmaker's card parser over every card, keeping the usable records"""
+        matches = []
+        for i, card in enumerate(cards):
+            match_data = card_parser(card, i)
+            if match_data:
+                matches.append(match_data)
+        return matches
     
     def _parse_sportsbet_selenium(self, soup: BeautifulSoup) -> List[Dict]:
         """Parse Sportsbet odds from Selenium-rendered HTML"""
-        matches = []
-        
         print("  Parsing Sportsbet content...")
         
         # Find all event cards
-        event_cards = soup.find_all('div', {'data-automation-id': re.compile(r'\d+-competition-event-card')})
+        event_cards = self.bookmakers['sportsbet']['card_finder'](soup)
         print(f"  Found {len(event_cards)} event cards")
         
-        for i, card in enumerate(event_cards):
-            try:
-                print(f"  Processing card {i+1}...")
-                
-                # Find team names using participant-one and participant-two divs
-                participant_one = card.find('div', {'data-automation-id': 'participant-one'})
-                participant_two = card.find('div', {'data-automation-id': 'participant-two'})
-                
-                if not participant_one or not participant_two:
-                    print(f"    ✗ Could not find participant divs")
-                    continue
-                
-                home_team = participant_one.get_text().strip()
-                away_team = participant_two.get_text().strip()
-                print(f"    ✓ Found teams: {home_team} vs {away_team}")
-                
-                # Find Head to Head market section
-                head_to_head_section = None
-                market_labels = card.find_all('div', {'data-automation-id': 'market-coupon-label'})
-                
-                for label in market_labels:
-                    if 'Head to Head' in label.get_text():
-                        # Find the parent column that contains this label
-                        head_to_head_section = label.find_parent('div', class_='gridColumn_frfjtr6')
-                        if head_to_head_section:
-                            print(f"    ✓ Found Head to Head section")
-                            break
-                
-                if not head_to_head_section:
-                    print(f"    ✗ Could not find Head to Head section")
-                    # Fallback: try to get any price-text elements from the card
-                    print(f"    Trying fallback method...")
-                    all_price_elements = card.find_all('span', {'data-automation-id': 'price-text'})
-                    if len(all_price_elements) >= 2:
-                        print(f"    ✓ Found {len(all_price_elements)} price elements via fallback")
-                        try:
-                            home_odds = float(all_price_elements[0].get_text().strip())
-                            away_odds = float(all_price_elements[1].get_text().strip())
-                            print(f"    ✓ Using fallback odds: {home_odds} vs {away_odds}")
-                        except (ValueError, IndexError) as e:
-                            print(f"    ✗ Error parsing fallback odds: {e}")
-                            continue
-                    else:
-                        print(f"    ✗ Fallback failed - only found {len(all_price_elements)} price elements")
-                        continue
-                else:
-                    # Get odds from Head to Head section
-                    price_elements = head_to_head_section.find_all('span', {'data-automation-id': 'price-text'})
-                    
-                    if len(price_elements) < 2:
-                        print(f"    ✗ Not enough odds in H2H section ({len(price_elements)})")
-                        continue
-                    
+        matches = self._parse_cards(event_cards, self._parse_sportsbet_card)
+        
+        print(f"  Sportsbet parsing complete. Found {len(matches)} matches.")
+        return matches
+    
+    def _parse_sportsbet_card(self, card, i: int) -> Optional[Dict]:
+        """Parse one Sportsbet event card into a match record (None if it isn't usable)"""
+        selectors = self.bookmakers['sportsbet']['selectors']
+        
+        try:
+            print(f"  Processing card {i+1}...")
+            
+            # Find team names using participant-one and participant-two divs
+            participant_one = card.find('div', selectors['participant_one_attrs'])
+            participant_two = card.find('div', selectors['participant_two_attrs'])
+            
+            if not participant_one or not participant_two:
+                print(f"    ✗ Could not find participant divs")
+                return None
+            
+            home_team = participant_one.get_text().strip()
+            away_team = participant_two.get_text().strip()
+            print(f"    ✓ Found teams: {home_team} vs {away_team}")
+            
+            # Find Head to Head market section
+            head_to_head_section = None
+            market_labels = card.find_all('div', selectors['market_label_attrs'])
+            
+            for label in market_labels:
+                if 'Head to Head' in label.get_text():
+                    # Find the parent column that contains this label
+                    head_to_head_section = label.find_parent('div', class_='gridColumn_frfjtr6')
+                    if head_to_head_section:
+                        print(f"    ✓ Found Head to Head section")
+                        break
+            
+            if not head_to_head_section:
+                print(f"    ✗ Could not find Head to Head section")
+                # Fallback: try to get any price-text elements from the card
+                print(f"    Trying fallback method...")
+                all_price_elements = card.find_all('span', selectors['price_text_attrs'])
+                if len(all_price_elements) >= 2:
+                    print(f"    ✓ Found {len(all_price_elements)} price elements via fallback")
                     try:
-                        home_odds = float(price_elements[0].get_text().strip())
-                        away_odds = float(price_elements[1].get_text().strip())
-                        print(f"    ✓ H2H odds: {home_odds} vs {away_odds}")
+                        home_odds = float(all_price_elements[0].get_text().strip())
+                        away_odds = float(all_price_elements[1].get_text().strip())
+                        print(f"    ✓ Using fallback odds: {home_odds} vs {away_odds}")
                     except (ValueError, IndexError) as e:
-                        print(f"    ✗ Error parsing H2H odds: {e}")
-                        continue
-                
-                # Get match time
-                time_element = card.find('span', {'data-automation-id': 'competition-event-card-time'})
-                match_time = None
-                if time_element:
-                    time_elem = time_element.find('time')
-                    if time_elem:
-                        match_time = time_elem.get('datetime')
-                        print(f"    ✓ Found match time: {match_time}")
-                
-                match_data = {
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'home_odds': home_odds,
-                    'away_odds': away_odds,
-                    'match_time': match_time,
-                    'bookmaker': 'sportsbet'
-                }
+                        print(f"    ✗ Error parsing fallback odds: {e}")
+                        return None
+                else:
+                    print(f"    ✗ Fallback failed - only found {len(all_price_elements)} price elements")
+                    return None
+            else:
+                # Get odds from Head to Head section
+                price_elements = head_to_head_section.find_all('span', selectors['price_text_attrs'])
                 
-                matches.append(match_data)
-                print(f"    ✓ MATCH ADDED: {home_team} vs {away_team}: {home_odds} vs {away_odds}")
+                if len(price_elements) < 2:
+                    print(f"    ✗ Not enough odds in H2H section ({len(price_elements)})")
+                    return None
                 
-            except Exception as e:
-                print(f"    ✗ Error processing card {i+1}: {e}")
-                continue
-        
-        print(f"  Sportsbet parsing complete. Found {len(matches)} matches.")
-        return matches
+                try:
+                    home_odds = float(price_elements[0].get_text().strip())
+                    away_odds = float(price_elements[1].get_text().strip())
+                    print(f"    ✓ H2H odds: {home_odds} vs {away_odds}")
+                except (ValueError, IndexError) as e:
+                    print(f"    ✗ Error parsing H2H odds: {e}")
+                    return None
+            
+            # Get match time
+            time_element = card.find('span', selectors['card_time_attrs'])
+            match_time = None
+            if time_element:
+                time_elem = time_element.find('time')
+                if time_elem:
+                    match_time = time_elem.get('datetime')
+                    print(f"    ✓ Found match time: {match_time}")
+            
+            match_data = {
+                'home_team': home_team,
+                'away_team': away_team,
+                'home_odds': home_odds,
+                'away_odds': away_odds,
+                'match_time': match_time,
+                'bookmaker': 'sportsbet'
+            }
+            
+            print(f"    ✓ MATCH ADDED: {home_team} vs {away_team}: {home_odds} vs {away_odds}")
+            return match_data
+            
+        except Exception as e:
+            print(f"    ✗ Error processing card {i+1}: {e}")
+            return None
     
     def _parse_ladbrokes_selenium(self, soup: BeautifulSoup) -> List[Dict]:
         """Parse Ladbrokes odds from Selenium-rendered HTML"""
-        matches = []
-        
         print("  Parsing Ladbrokes content...")
         
         # Debug: Check what we actually have
-        team_vs_team = soup.find_all('div', {'data-testid': 'team-vs-team'})
+        team_vs_team = self.bookmakers['ladbrokes']['card_finder'](soup)
         print(f"  Found {len(team_vs_team)} team-vs-team containers")
         
-        for i, container in enumerate(team_vs_team):
-            try:
-                print(f"  Processing container {i+1}...")
-                
-                # Find parent match card
-                match_card = container.find_parent('div', class_=re.compile(r'.*flex.*cursor-pointer.*'))
-                if not match_card:
-                    print(f"    ✗ Could not find parent match card")
-                    continue
-                
-                # Extract team names
-                team_divs = container.find_all('div', class_='flex-shrink')
-                if len(team_divs) < 2:
-                    print(f"    ✗ Could not find team names")
-                    continue
-                
-                home_team = team_divs[0].get_text().strip()
-                away_team = team_divs[1].get_text().strip()
-                
-                print(f"    ✓ Teams: {home_team} vs {away_team}")
-                
-                # Extract odds
-                price_buttons = match_card.find_all('button', {'data-testid': re.compile(r'price-button-.*')})
-                if len(price_buttons) < 2:
-                    print(f"    ✗ Could not find price buttons")
-                    continue
-                
-                home_odds_element = price_buttons[0].find('span', {'data-testid': 'price-button-odds'})
-                away_odds_element = price_buttons[1].find('span', {'data-testid': 'price-button-odds'})
-                
-                if not home_odds_element or not away_odds_element:
-                    print(f"    ✗ Could not find odds elements")
-                    continue
-                
-                home_odds = float(home_odds_element.get_text().strip())
-                away_odds = float(away_odds_element.get_text().strip())
-                
-                # Extract time
-                countdown_element = match_card.find('div', class_=re.compile(r'.*countdown-badge.*'))
-                match_time = None
-                if countdown_element:
-                    time_span = countdown_element.find('span')
-                    if time_span:
-                        match_time = time_span.get_text().strip()
-                
-                match_data = {
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'home_odds': home_odds,
-                    'away_odds': away_odds,
-                    'match_time': match_time,
-                    'bookmaker': 'ladbrokes'
-                }
-                
-                matches.append(match_data)
-                print(f"    ✓ {home_team} vs {away_team}: {home_odds} vs {away_odds}")
-                
-            except Exception as e:
-                print(f"    ✗ Error processing container {i+1}: {e}")
-                continue
+        return self._parse_cards(team_vs_team, self._parse_ladbrokes_card)
+    
+    def _parse_ladbrokes_card(self, container, i: int) -> Optional[Dict]:
+        """Parse one Ladbrokes event card into a match record (None if it isn't usable)"""
+        selectors = self.bookmakers['ladbrokes']['selectors']
         
-        return matches
+        try:
+            print(f"  Processing container {i+1}...")
+            
+            # Find parent match card
+            match_card = container.find_parent('div', class_=selectors['match_card'])
+            if not match_card:
+                print(f"    ✗ Could not find parent match card")
+                return None
+            
+            # Extract team names
+            team_divs = container.find_all('div', class_='flex-shrink')
+            if len(team_divs) < 2:
+                print(f"    ✗ Could not find team names")
+                return None
+            
+            home_team = team_divs[0].get_text().strip()
+            away_team = team_divs[1].get_text().strip()
+            
+            print(f"    ✓ Teams: {home_team} vs {away_team}")
+            
+            # Extract odds
+            price_buttons = match_card.find_all('button', selectors['price_button_attrs'])
+            if len(price_buttons) < 2:
+                print(f"    ✗ Could not find price buttons")
+                return None
+            
+            home_odds_element = price_buttons[0].find('span', selectors['price_odds_attrs'])
+            away_odds_element = price_buttons[1].find('span', selectors['price_odds_attrs'])
+            
+            if not home_odds_element or not away_odds_element:
+                print(f"    ✗ Could not find odds elements")
+                return None
+            
+            home_odds = float(home_odds_element.get_text().strip())
+            away_odds = float(away_odds_element.get_text().strip())
+            
+            # Extract time
+            countdown_element = match_card.find('div', class_=selectors['countdown'])
+            match_time = None
+            if countdown_element:
+                time_span = countdown_element.find('span')
+                if time_span:
+                    match_time = time_span.get_text().strip()
+            
+            match_data = {
+                'home_team': home_team,
+                'away_team': away_team,
+                'home_odds': home_odds,
+                'away_odds': away_odds,
+                'match_time': match_time,
+                'bookmaker': 'ladbrokes'
+            }
+            
+            print(f"    ✓ {home_team} vs {away_team}: {home_odds} vs {away_odds}")
+            return match_data
+            
+        except Exception as e:
+            print(f"    ✗ Error processing container {i+1}: {e}")
+            return None
     
     def _parse_pointsbet_selenium(self, soup: BeautifulSoup) -> List[Dict]:
         """Parse Pointsbet odds from Selenium-rendered HTML"""
-        matches = []
-        
         print("  Parsing Pointsbet content...")
         
         # Find all event containers
-        event_containers = soup.find_all('div', {'data-test': 'event'})
+        event_containers = self.bookmakers['pointsbet']['card_finder'](soup)
         print(f"  Found {len(event_containers)} event containers")
         
-        for i, event_container in enumerate(event_containers):
-            try:
-                print(f"  Processing event {i+1}...")
-                
-                # Extract team names from team name wrapper links
-                team_links = event_container.find_all('a', {'data-test': re.compile(r'.*EventTeamNameWrapperLinkLink')})
-                
-                if len(team_links) < 2:
-                    print(f"    ✗ Found only {len(team_links)} team links, need 2")
-                    continue
-                
-                # Get team names from the paragraph elements within the team links
-                teams = []
-                for team_link in team_links:
-                    team_p = team_link.find('p')
-                    if team_p:
-                        team_name = team_p.get_text().strip()
-                        teams.append(team_name)
-                
-                if len(teams) < 2:
-                    print(f"    ✗ Could not extract 2 team names")
-                    continue
-                
-                home_team, away_team = teams[0], teams[1]
-                print(f"    ✓ Teams: {home_team} vs {away_team}")
-                
-                # Find H2H odds buttons - look for Market0 which is typically Head to Head
-                top_h2h_button = event_container.find('button', {'data-test': re.compile(r'.*EventTopMarket0OddsButton')})
-                bottom_h2h_button = event_container.find('button', {'data-test': re.compile(r'.*EventBottomMarket0OddsButton')})
-                
-                if not top_h2h_button or not bottom_h2h_button:
-                    print(f"    ✗ Could not find H2H odds buttons")
-                    continue
-                
-                # Extract odds values from the buttons
-                def extract_odds_from_button(button):
-                    odds_span = button.find('span', class_='fheif50')
-                    if odds_span:
-                        return float(odds_span.get_text().strip())
-                    return None
-                
-                home_odds = extract_odds_from_button(top_h2h_button)
-                away_odds = extract_odds_from_button(bottom_h2h_button)
-                
-                if home_odds is None or away_odds is None:
-                    print(f"    ✗ Could not extract odds values")
-                    continue
-                
-                print(f"    ✓ H2H odds: {home_odds} vs {away_odds}")
-                
-                # Extract match time
-                match_time = None
-                event_footer = event_container.find('div', {'data-test': re.compile(r'.*EventEventFooter')})
-                if event_footer:
-                    time_span = event_footer.find('span', {'data-test': 'timeOfDay'})
-                    if time_span:
-                        time_text = time_span.get_text().strip()
-                        
-                        # Look for date part
-                        date_spans = event_footer.find_all('span')
-                        date_text = ""
-                        for span in date_spans:
-                            text = span.get_text().strip()
-                            if text in ['Today', 'Tomorrow'] or 'day' in text.lower():
-                                date_text = text
-                                break
-                        
-                        if date_text:
-                            match_time = f"{date_text}, {time_text}"
-                        else:
-                            match_time = time_text
-                        
-                        print(f"    ✓ Match time: {match_time}")
-                
-                match_data = {
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'home_odds': home_odds,
-                    'away_odds': away_odds,
-                    'match_time': match_time,
-                    'bookmaker': 'pointsbet'
-                }
-                
-                matches.append(match_data)
-                print(f"    ✓ MATCH ADDED: {home_team} vs {away_team}: {home_odds} vs {away_odds}")
-                
-            except Exception as e:
-                print(f"    ✗ Error processing event {i+1}: {e}")
-                continue
+        matches = self._parse_cards(event_containers, self._parse_pointsbet_card)
         
         print(f"  Pointsbet parsing complete. Found {len(matches)} matches.")
         return matches
     
+    def _parse_pointsbet_card(self, event_container, i: int) -> Optional[Dict]:
+        """Parse one Pointsbet event card into a match record (None if it isn't usable)"""
+        selectors = self.bookmakers['pointsbet']['selectors']
+        
+        try:
+            print(f"  Processing event {i+1}...")
+            
+            # Extract team names from team name wrapper links
+            team_links = event_container.find_all('a', selectors['team_link_attrs'])
+            
+            if len(team_links) < 2:
+                print(f"    ✗ Found only {len(team_links)} team links, need 2")
+                return None
+            
+            # Get team names from the paragraph elements within the team links
+            teams = []
+            for team_link in team_links:
+                team_p = team_link.find('p')
+                if team_p:
+                    team_name = team_p.get_text().strip()
+                    teams.append(team_name)
+            
+            if len(teams) < 2:
+                print(f"    ✗ Could not extract 2 team names")
+                return None
+            
+            home_team, away_team = teams[0], teams[1]
+            print(f"    ✓ Teams: {home_team} vs {away_team}")
+            
+            # Find H2H odds buttons - look for Market0 which is typically Head to Head
+            top_h2h_button = event_container.find('button', selectors['top_h2h_attrs'])
+            bottom_h2h_button = event_container.find('button', selectors['bottom_h2h_attrs'])
+            
+            if not top_h2h_button or not bottom_h2h_button:
+                print(f"    ✗ Could not find H2H odds buttons")
+                return None
+            
+            # Extract odds values from the buttons
+            home_odds = self._extract_pointsbet_button_odds(top_h2h_button)
+            away_odds = self._extract_pointsbet_button_odds(bottom_h2h_button)
+            
+            if home_odds is None or away_odds is None:
+                print(f"    ✗ Could not extract odds values")
+                return None
+            
+            print(f"    ✓ H2H odds: {home_odds} vs {away_odds}")
+            
+            # Extract match time
+            match_time = None
+            event_footer = event_container.find('div', selectors['event_footer_attrs'])
+            if event_footer:
+                time_span = event_footer.find('span', selectors['time_of_day_attrs'])
+                if time_span:
+                    time_text = time_span.get_text().strip()
+                    
+                    # Look for date part
+                    date_spans = event_footer.find_all('span')
+                    date_text = ""
+                    for span in date_spans:
+                        text = span.get_text().strip()
+                        if text in ['Today', 'Tomorrow'] or 'day' in text.lower():
+                            date_text = text
+                            break
+                    
+                    if date_text:
+                        match_time = f"{date_text}, {time_text}"
+                    else:
+                        match_time = time_text
+                    
+                    print(f"    ✓ Match time: {match_time}")
+            
+            match_data = {
+                'home_team': home_team,
+                'away_team': away_team,
+                'home_odds': home_odds,
+                'away_odds': away_odds,
+                'match_time': match_time,
+                'bookmaker': 'pointsbet'
+            }
+            
+            print(f"    ✓ MATCH ADDED: {home_team} vs {away_team}: {home_odds} vs {away_odds}")
+            return match_data
+            
+        except Exception as e:
+            print(f"    ✗ Error processing event {i+1}: {e}")
+            return None
+    
+    def _extract_pointsbet_button_odds(self, button) -> Optional[float]:
+        """Extract the odds value from a Pointsbet H2H button"""
+        odds_span = button.find('span', class_='fheif50')
+        if odds_span:
+            return float(odds_span.get_text().strip())
+        return None
+    
     def consolidate_odds(self, all_odds: Dict[str, List[Dict]]) -> List[Dict]:
-        """Consolidate odds from multiple bookmakers by match"""
-        consolidated = {}
+        """Consolidate odds from multiple bookmakers by match, with every book's prices in the same home/away order"""
+        listings = {}
         
         for bookmaker, matches in all_odds.items():
             for match in matches:
-                # Create a match key
-                key = self._create_match_key(match['home_team'], match['away_team'])
+                # Records from older snapshot files predate scrape-time kickoff normalization
+                if 'kickoff_ts' not in match:
+                    normalize_kickoffs([match])
                 
-                if key not in consolidated:
-                    consolidated[key] = {
-                        'home_team': match['home_team'],
-                        'away_team': match['away_team'],
-                        'match_time': match.get('match_time'),
-                        'odds': {}
-                    }
-                
-                consolidated[key]['odds'][bookmaker] = {
-                    'home': match['home_odds'],
-                    'away': match['away_odds']
-                }
-        
-        return list(consolidated.values())
-    
-    def _create_match_key(self, home_team: str, away_team: str) -> str:
-        """Create a normalized key for match identification"""
-        def normalize_team(team):
-            team = team.strip().lower()
-            # Remove common suffixes
-            team = re.sub(r'\s+(fc|afl)$', '', team)
-            return team
-        
-        home_norm = normalize_team(home_team)
-        away_norm = normalize_team(away_team)
-        teams = sorted([home_norm, away_norm])
-        return f"{teams[0]}_vs_{teams[1]}"
+                home_id = self.teams.team_id(match['home_team'])
+                away_id = self.teams.team_id(match['away_team'])
+                key = (home_id, away_id) if home_id <= away_id else (away_id, home_id)
+                listings.setdefault(key, []).append((bookmaker, home_id, match))
+        
+        consolidated = []
+        self.orientation_conflicts = Counter()
+        
+        for key, book_listings in listings.items():
+            # Canonical orientation is the one most books use (the first listing's on a tie)
+            home_id = Counter(listed_home for _, listed_home, _ in book_listings).most_common(1)[0][0]
+            _, _, first = next(listing for listing in book_listings if listing[1] == home_id)
+            
+            match = {
+                'home_team': first['home_team'],
+                'away_team': first['away_team'],
+                'home_id': home_id,
+                'away_id': key[1] if key[0] == home_id else key[0],
+                'match_time': first.get('match_time'),
+                'kickoff_ts': None,
+                'kickoff_source': None,
+                'odds': {},
+                'realigned': []
+            }
+            
+            for bookmaker, listed_home, record in book_listings:
+                if listed_home == home_id:
+                    match['odds'][bookmaker] = {'home': record['home_odds'], 'away': record['away_odds']}
+                else:
+                    # Listed the other way round: each price belongs to the opposite side
+                    match['odds'][bookmaker] = {'home': record['away_odds'], 'away': record['home_odds']}
+                    match['realigned'].append(bookmaker)
+                    self.orientation_conflicts[bookmaker] += 1
+            
+            # One kickoff per match, from whichever book states it most precisely
+            source = authoritative_kickoff([dict(record, bookmaker=bookmaker) for bookmaker, _, record in book_listings])
+            if source:
+                match['kickoff_ts'] = source['kickoff_ts']
+                match['kickoff_source'] = source['bookmaker']
+                match['match_time'] = format_kickoff(source['kickoff_ts'])
+            
+            consolidated.append(match)
+        
+        return consolidated
     
     def save_odds(self, odds_data: List[Dict], filename: str = None):
         """Save odds data to JSON file"""
@@ -462,13 +1268,36 @@ def main():
     print("Starting AFL Selenium Scraper...")
     print("=" * 50)
     
-    scraper = AFLSeleniumScraper(headless=False)  # Set to True for headless mode
+    # Keep a persistent Chrome profile per bookmaker so JS bundles come from a warm disk cache
+    # (opt-in: each bookmaker then gets its own browser launch, and a cold cache is warmed first)
+    PERSISTENT_PROFILES = False
+    
+    # Parse each page on a worker thread while the browser loads the next site (0 = parse inline)
+    PARSE_WORKERS = 0
+    
+    # Consolidate whatever books are back after this many seconds (None = wait for every book)
+    SNAPSHOT_DEADLINE = None
+    
+    profile_cache = ProfileCache() if PERSISTENT_PROFILES else None
+    scraper = AFLSeleniumScraper(headless=False, profile_cache=profile_cache,  # Set to True for headless mode
+                                 parse_workers=PARSE_WORKERS, snapshot_deadline=SNAPSHOT_DEADLINE)
+    
+    if profile_cache:
+        scraper.warm_profile_cache()
     
     # Scrape all bookmakers
     all_odds = scraper.scrape_all_odds()
     
+    # Report how long each site took to become ready
+    scraper.page_waiter.print_report()
+    if profile_cache:
+        profile_cache.print_report()
+    
     # Consolidate odds by match
     consolidated_odds = scraper.consolidate_odds(all_odds)
+    if scraper.orientation_conflicts:
+        books = ', '.join(f"{name}: {count}" for name, count in scraper.orientation_conflicts.items())
+        print(f"↔ Realigned {sum(scraper.orientation_conflicts.values())} reversed home/away listings ({books})")
     
     # Display results
     print("\n" + "=" * 50)
@@ -0,0 +1,175 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Canonical club name -> other names the bookmakers list it under
+AFL_TEAMS = {
+    'Adelaide': ['Adelaide Crows', 'Crows'],
+    'Brisbane': ['Brisbane Lions', 'Lions'],
+    'Carlton': ['Carlton Blues', 'Blues'],
+    'Collingwood': ['Collingwood Magpies', 'Magpies', 'Pies'],
+    'Essendon': ['Essendon Bombers', 'Bombers'],
+    'Fremantle': ['Fremantle Dockers', 'Dockers', 'Freo'],
+    'Geelong': ['Geelong Cats', 'Cats'],
+    'Gold Coast': ['Gold Coast Suns', 'Suns'],
+    'GWS': ['GWS Giants', 'Greater Western Sydney', 'Greater Western Sydney Giants', 'Giants'],
+    'Hawthorn': ['Hawthorn Hawks', 'Hawks'],
+    'Melbourne': ['Melbourne Demons', 'Demons'],
+    'North Melbourne': ['North Melbourne Kangaroos', 'Kangaroos', 'North', 'Nth Melbourne', 'Nth Melb'],
+    'Port Adelaide': ['Port Adelaide Power', 'Power', 'Port'],
+    'Richmond': ['Richmond Tigers', 'Tigers'],
+    'St Kilda': ['St Kilda Saints', 'Saints'],
+    'Sydney': ['Sydney Swans', 'Swans'],
+    'West Coast': ['West Coast Eagles', 'Eagles'],
+    'Western Bulldogs': ['Bulldogs', 'Footscray', 'Dogs', 'W Bulldogs', 'Wstn Bulldogs']
+}
+
+# Name tokens marking another competition's side of a club; those never share the club's team ID
+COMPETITIONS = {
+    'women': 'AFLW', 'womens': 'AFLW', 'aflw': 'AFLW',
+    'vfl': 'VFL', 'vflw': 'VFLW', 'reserves': 'Reserves', 'res': 'Reserves', 'u18': 'U18', 'u18s': 'U18'
+}
+
+# A bare 'W' only marks the women's side as the last word ('Carlton W', 'Carlton (W)');
+# leading it abbreviates 'Western' ('W Bulldogs')
+TRAILING_COMPETITIONS = {'w': 'AFLW'}
+
+def normalize_team(name: str) -> str:
+    """Lowercase, drop punctuation and a trailing FC/AFL, collapse whitespace"""
+    name = re.sub(r'[^a-z0-9 ]+', ' ', name.lower())
+    name = re.sub(r'\s+(fc|afl)\s*$', '', name)
+    return ' '.join(name.split())
+
+def split_competition(normalized: str) -> Tuple[str, Optional[str]]:
+    """('brisbane lions', 'AFLW') for 'brisbane lions aflw'; the competition is None for a senior men's name"""
+    tokens = normalized.split()
+    competitions = {COMPETITIONS[token] for token in tokens if token in COMPETITIONS}
+    base = [token for token in tokens if token not in COMPETITIONS]
+    if len(base) > 1 and base[-1] in TRAILING_COMPETITIONS:
+        competitions.add(TRAILING_COMPETITIONS[base.pop()])
+    if not competitions:
+        return normalized, None
+    return ' '.join(base), '/'.join(sorted(competitions))
+
+def trigrams(name: str) -> Counter:
+    padded = f"  {name} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+class TeamRegistry:
+    def __init__(self, teams: Dict[str, List[str]] = AFL_TEAMS, min_similarity: float = 0.85):
+        """
+        Map every name a bookmaker uses for a team to one small integer team ID
+        
+        Args:
+            teams: Canonical team name -> aliases; IDs follow this order
+            min_similarity: Trigram (Dice) similarity a misspelt name needs to join an existing team;
+                below it (or with more words than the alias it resembles) the name gets a team ID of its own
+        """
+        self.min_similarity = min_similarity
+        
+        self.names: List[str] = []
+        # Raw and normalized names -> team ID; unknown names are added here once resolved
+        self.ids: Dict[str, int] = {}
+        
+        # Trigram index over the normalized aliases for the similarity fallback
+        self._alias_ids: List[int] = []
+        self._alias_names: List[str] = []
+        self._alias_grams: List[Counter] = []
+        self._gram_index: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        
+        # name -> (team ID, similarity) for every name resolved by the fallback
+        self.fuzzy_matches: Dict[str, Tuple[int, float]] = {}
+        
+        for canonical, aliases in teams.items():
+            team_id = self._add_team(canonical)
+            for alias in aliases:
+                self._add_alias(alias, team_id)
+    
+    def team_id(self, name: str) -> int:
+        """
+        Team ID for a name as listed; unknown names go through the trigram index once
+        
+        Women's, VFL and reserves sides ('Brisbane Lions AFLW', 'Sydney Swans Women') get IDs of their
+        own per club and competition, so their fixtures never join the senior men's market.
+        """
+        team_id = self.ids.get(name)
+        if team_id is not None:
+            return team_id
+        
+        with self._lock:
+            base, competition = split_competition(normalize_team(name))
+            if competition:
+                club_id = self.ids.get(base)
+                label = f"{self.names[club_id] if club_id is not None else base.title()} {competition}"
+                team_id = self.ids.get(label)
+                if team_id is None:
+                    # Not added to the trigram index: a senior name must never resolve to it
+                    team_id = len(self.names)
+                    self.names.append(label)
+                    self.ids[label] = team_id
+                    print(f"  ⚠ '{name}' registered as {label} (team {team_id})")
+            else:
+                team_id = self.ids.get(base)
+                if team_id is None:
+                    team_id = self._resolve_unknown(name, base)
+            # Remembers this exact spelling only; a fuzzy hit is not indexed as an alias for later matches
+            self.ids[name] = team_id
+            return team_id
+    
+    def match_key(self, home_team: str, away_team: str) -> Tuple[int, int]:
+        """Orientation-free key for joining a fixture across books: its two team IDs, lowest first"""
+        home_id, away_id = self.team_id(home_team), self.team_id(away_team)
+        return (home_id, away_id) if home_id <= away_id else (away_id, home_id)
+    
+    def name(self, team_id: int) -> str:
+        return self.names[team_id]
+    
+    def _resolve_unknown(self, name: str, normalized: str) -> int:
+        """A misspelling of a known alias, or else a team of its own"""
+        team_id, similarity, alias = self._closest(normalized)
+        # Extra words ('Adelaide United', 'Melbourne Victory') make it a different club, however similar
+        if similarity >= self.min_similarity and len(normalized.split()) <= len(alias.split()):
+            self.fuzzy_matches[name] = (team_id, similarity)
+            print(f"  ⚠ Unknown team '{name}' matched to {self.names[team_id]} ({similarity:.2f})")
+            return team_id
+        
+        team_id = self._add_team(name)
+        print(f"  ⚠ Unknown team '{name}' registered as team {team_id}")
+        return team_id
+    
+    def _add_team(self, canonical: str) -> int:
+        team_id = len(self.names)
+        self.names.append(canonical)
+        self._add_alias(canonical, team_id)
+        return team_id
+    
+    def _add_alias(self, alias: str, team_id: int):
+        normalized = normalize_team(alias)
+        self.ids[alias] = team_id
+        self.ids[normalized] = team_id
+        
+        grams = trigrams(normalized)
+        alias_index = len(self._alias_ids)
+        self._alias_ids.append(team_id)
+        self._alias_names.append(normalized)
+        self._alias_grams.append(grams)
+        for gram in grams:
+            self._gram_index.setdefault(gram, []).append(alias_index)
+    
+    def _closest(self, normalized: str) -> Tuple[Optional[int], float, str]:
+        """Best (team ID, Dice similarity, alias) among aliases sharing a trigram with the name"""
+        grams = trigrams(normalized)
+        shared = Counter()
+        for gram, count in grams.items():
+            for alias_index in self._gram_index.get(gram, ()):
+                shared[alias_index] += min(count, self._alias_grams[alias_index][gram])
+        
+        best_id, best, best_alias = None, 0.0, ''
+        size = sum(grams.values())
+        for alias_index, overlap in shared.items():
+            similarity = 2 * overlap / (size + sum(self._alias_grams[alias_index].values()))
+            if similarity > best:
+                best_id, best, best_alias = self._alias_ids[alias_index], similarity, self._alias_names[alias_index]
+        return best_id, best, best_alias
@@ -0,0 +1,280 @@
+"""
+Benchmark the opportunity analysis paths on synthetic odds snapshots
+    
+    python bench_analysis.py scan --matches 500 --books 30     # per-match dict scans vs the numpy OddsMatrix
+    python bench_analysis.py book --updates 20000              # dict scans vs the sortedcontainers MarketBook
+    python bench_analysis.py incremental --matches 2000 --books 40   # per-update re-evaluation latency
+    python bench_analysis.py alerts --matches 200 --books 10   # raw opportunity reports vs tracked alerts
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from typing import Dict, List
+
+from afl_alerts import OpportunityTracker
+from afl_incremental import IncrementalEvaluator
+from afl_market_book import MarketBook
+from afl_odds_matrix import NUMPY_AVAILABLE, OddsMatrix
+from main_hedge_analysis import AFLOpportunityFinder
+
+def synthetic_matches(n_matches: int, n_books: int, noise_level: float = 0.02, seed: int = 42) -> List[Dict]:
+    """Consolidated matches with noisy prices around a random true probability"""
+    rng = random.Random(seed)
+    books = [f"book{b:02d}" for b in range(n_books)]
+    matches = []
+    
+    for m in range(n_matches):
+        home_prob = rng.uniform(0.15, 0.85)
+        odds = {}
+        # Not every book prices every match
+        for bookmaker in rng.sample(books, rng.randint(max(1, n_books // 2), n_books)):
+            margin = rng.uniform(1.03, 1.07)
+            noise = rng.uniform(-noise_level, noise_level)
+            p_home = min(0.97, max(0.03, home_prob + noise))
+            odds[bookmaker] = {
+                'home': round(1 / (p_home * margin), 2),
+                'away': round(1 / ((1 - p_home) * margin), 2)
+            }
+        matches.append({
+            'home_team': f"Team {2 * m}",
+            'away_team': f"Team {2 * m + 1}",
+            'home_id': 2 * m,
+            'away_id': 2 * m + 1,
+            'match_time': None,
+            'odds': odds
+        })
+    
+    return matches
+
+def time_call(fn, repeats: int) -> float:
+    """Best-of-N wall-clock seconds for fn(), with its logging discarded"""
+    best = float('inf')
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def opportunity_key(opp) -> tuple:
+    return (opp.match, opp.opportunity_type, sorted(opp.stake_distribution), round(opp.profit_percentage, 9))
+
+def benchmark_scan(n_matches: int = 500, n_books: int = 30, repeats: int = 5) -> bool:
+    """Full snapshot scans: per-match dict walks vs one batched numpy pass over an OddsMatrix"""
+    if not NUMPY_AVAILABLE:
+        print("numpy is not installed; the columnar scan needs it (pip install numpy)")
+        return False
+    
+    matches = synthetic_matches(n_matches, n_books)
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=1.0, max_stake_percentage=25.0)
+    matrix = OddsMatrix(matches)
+    
+    def dict_scan():
+        return ([opp for opp in map(finder._match_arbitrage, matches) if opp]
+                + [opp for match in matches for opp in finder._match_value_bets(match)])
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = dict_scan()
+        identical = (expected == finder.calculate_arbitrage_opportunities(matches) + finder.calculate_value_bets(matches)
+                     and expected == finder.calculate_opportunities_columnar(matches))
+    
+    dict_s = time_call(dict_scan, repeats)
+    columnar_s = time_call(lambda: finder.calculate_opportunities_columnar(matches), repeats)
+    build_s = time_call(lambda: OddsMatrix(matches), repeats)
+    rescan_s = time_call(lambda: finder.calculate_opportunities_columnar(matches, matrix), repeats)
+    array_s = time_call(lambda: (matrix.arbitrage_rows(1.0), matrix.value_edges(5.0, 1.0)), repeats)
+    
+    print(f"Opportunity scan: {n_matches} matches x {n_books} bookmakers, {matrix.n_matches * matrix.n_slots} "
+          f"slots ({len(expected)} opportunities)")
+    print("=" * 60)
+    print(f"  per-match dict scan:         {dict_s * 1000:>9.2f} ms")
+    print(f"  columnar scan (incl. build): {columnar_s * 1000:>9.2f} ms  ({dict_s / columnar_s:.1f}x)")
+    print(f"    OddsMatrix build:          {build_s * 1000:>9.2f} ms")
+    print(f"    rescan of a built matrix:  {rescan_s * 1000:>9.2f} ms  ({dict_s / rescan_s:.1f}x)")
+    print(f"    array ops only:            {array_s * 1000:>9.2f} ms  (no BettingOpportunity objects)")
+    print(f"  {'✓ identical opportunities' if identical else '✗ OPPORTUNITIES DIFFER'}")
+    return identical
+
+def benchmark_book(n_matches: int = 500, n_books: int = 30, n_updates: int = 20000, repeats: int = 5) -> bool:
+    """Full scans and streamed single-price updates: consolidated dicts vs the MarketBook"""
+    matches = synthetic_matches(n_matches, n_books)
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=1.0, max_stake_percentage=25.0)
+    book = MarketBook.from_matches(matches)
+    
+    def dict_scan():
+        return finder.calculate_arbitrage_opportunities(matches) + finder.calculate_value_bets(matches)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = sorted(map(opportunity_key, dict_scan()))
+        actual = sorted(map(opportunity_key, finder.calculate_opportunities_from_book(book)))
+    identical = expected == actual
+    
+    dict_s = time_call(dict_scan, repeats)
+    load_s = time_call(lambda: MarketBook.from_matches(matches), repeats)
+    book_s = time_call(lambda: finder.calculate_opportunities_from_book(book), repeats)
+    dict_arb_s = time_call(lambda: [finder._match_arbitrage(match) for match in matches], repeats)
+    book_arb_s = time_call(lambda: [finder._book_arbitrage(book, key) for key in book.arbitrage_keys()], repeats)
+    
+    # Stream single-price moves; after each, re-check arbitrage on the touched match
+    rng = random.Random(7)
+    quoted = [(m, bookmaker) for m, match in enumerate(matches) for bookmaker in match['odds']]
+    updates = []
+    for _ in range(n_updates):
+        m, bookmaker = rng.choice(quoted)
+        side = rng.choice(('home', 'away'))
+        updates.append((m, bookmaker, side, round(matches[m]['odds'][bookmaker][side] * rng.uniform(0.95, 1.05), 2)))
+    keys = [(match['home_id'], match['away_id']) for match in matches]
+    
+    dict_arbs = book_arbs = 0
+    start = time.perf_counter()
+    for m, bookmaker, side, price in updates:
+        matches[m]['odds'][bookmaker][side] = price
+        dict_arbs += finder._match_arbitrage(matches[m]) is not None
+    dict_update_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for m, bookmaker, side, price in updates:
+        book.set_quote(keys[m], bookmaker, side, price)
+        book_arbs += finder._book_arbitrage(book, keys[m]) is not None
+    book_update_s = time.perf_counter() - start
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = sorted(map(opportunity_key, dict_scan()))
+        actual = sorted(map(opportunity_key, finder.calculate_opportunities_from_book(book)))
+    identical = identical and expected == actual
+    
+    print(f"Market book: {n_matches} matches x {n_books} bookmakers, {n_updates} streamed price updates")
+    print("=" * 60)
+    print(f"  per-match dict scan:      {dict_s * 1000:>9.2f} ms")
+    print(f"  MarketBook load:          {load_s * 1000:>9.2f} ms  (once)")
+    print(f"  MarketBook scan:          {book_s * 1000:>9.2f} ms  ({dict_s / book_s:.1f}x)")
+    print(f"  arbitrage only, dict:     {dict_arb_s * 1000:>9.2f} ms")
+    print(f"  arbitrage only, book:     {book_arb_s * 1000:>9.2f} ms  ({dict_arb_s / book_arb_s:.1f}x)")
+    print(f"  price update + arbitrage: {dict_update_s / n_updates * 1e6:>9.2f} us  (dict rescan of the match)")
+    print(f"                            {book_update_s / n_updates * 1e6:>9.2f} us  (MarketBook, "
+          f"{dict_update_s / book_update_s:.1f}x)")
+    identical = identical and book_arbs == dict_arbs
+    print(f"  {'✓ identical opportunities' if identical else '✗ OPPORTUNITIES DIFFER'}")
+    return identical
+
+def benchmark_incremental(n_matches: int = 2000, n_books: int = 40, n_updates: int = 20000,
+                          repeats: int = 5) -> bool:
+    """Per-update latency of re-evaluating only the touched match vs rescanning the whole book"""
+    matches = synthetic_matches(n_matches, n_books)
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=1.0, max_stake_percentage=25.0)
+    evaluator = IncrementalEvaluator(finder)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        evaluator.load(matches)
+        load_s = time.perf_counter() - start
+    book = evaluator.book
+    
+    rng = random.Random(7)
+    keys = book.keys()
+    quoted = [(key, bookmaker) for key in keys for bookmaker in book.quotes[key]]
+    updates = []
+    for _ in range(n_updates):
+        key, bookmaker = rng.choice(quoted)
+        side = rng.choice(('home', 'away'))
+        # Occasionally a book pulls a price, then quotes it again later
+        price = round(book.quotes[key][bookmaker].get(side, 2.0) * rng.uniform(0.95, 1.05), 2)
+        updates.append((key, bookmaker, side, None if rng.random() < 0.02 else price))
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        changes = evaluator.apply(updates)
+    report = evaluator.report()
+    
+    # What each update costs without the incremental path: a full scan of the book
+    full_s = time_call(lambda: finder.calculate_opportunities_from_book(book), repeats)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = sorted(map(opportunity_key, finder.calculate_opportunities_from_book(book)))
+        actual = sorted(map(opportunity_key, evaluator.opportunities()))
+    identical = expected == actual
+    kinds = {kind: sum(change.kind == kind for change in changes) for kind in ('added', 'changed', 'removed')}
+    
+    print(f"Incremental evaluation: {n_matches} matches x {n_books} bookmakers, {n_updates} price updates")
+    print("=" * 60)
+    print(f"  initial load + evaluation: {load_s * 1000:>9.2f} ms")
+    print(f"  full rescan per update:    {full_s * 1000:>9.2f} ms")
+    print(f"  incremental update p50:    {report['p50'] * 1e6:>9.2f} us  ({full_s / report['p50']:.0f}x)")
+    print(f"  incremental update p99:    {report['p99'] * 1e6:>9.2f} us")
+    print(f"  incremental update max:    {report['max'] * 1e6:>9.2f} us")
+    print(f"  changes: {kinds['added']} added, {kinds['changed']} changed, {kinds['removed']} removed; "
+          f"{report['open']} open")
+    print(f"  {'✓ matches a full rescan' if identical else '✗ OPPORTUNITIES DIFFER FROM A FULL RESCAN'}")
+    return identical
+
+def benchmark_alerts(n_matches: int = 200, n_books: int = 10, n_ticks: int = 360, tick_seconds: float = 5.0) -> bool:
+    """Alert volume of re-reporting every snapshot vs the hysteresis/lifetime/coalescing tracker"""
+    matches = synthetic_matches(n_matches, n_books)
+    # The finder reports down to the exit thresholds; the tracker decides what's worth an alert
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=0.5, max_stake_percentage=25.0,
+                                  min_value_edge=4.5)
+    evaluator = IncrementalEvaluator(finder)
+    tracker = OpportunityTracker(enter_threshold=1.0, exit_threshold=0.5, min_lifetime=3 * tick_seconds,
+                                 value_enter_threshold=5.0, value_exit_threshold=4.5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        evaluator.load(matches)
+    book = evaluator.book
+    
+    # Prices jitter by a tick every poll, so edges near a threshold flicker in and out
+    rng = random.Random(11)
+    keys = book.keys()
+    base = {key: {bookmaker: dict(prices) for bookmaker, prices in book.quotes[key].items()} for key in keys}
+    snapshot_reports = changed = 0
+    kinds = {'opened': 0, 'updated': 0, 'closed': 0}
+    for tick in range(n_ticks):
+        updates = []
+        for key in rng.sample(keys, max(1, n_matches // 4)):
+            bookmaker = rng.choice(list(base[key]))
+            side = rng.choice(('home', 'away'))
+            updates.append((key, bookmaker, side, round(base[key][bookmaker][side] + rng.choice((-0.02, 0, 0.02)), 2)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            changes = evaluator.apply(updates)
+        
+        opportunities = evaluator.opportunities()
+        snapshot_reports += len(opportunities)
+        changed += len(changes)
+        for alert in tracker.observe(opportunities, now=tick * tick_seconds):
+            kinds[alert.kind] += 1
+    
+    # Every announced opportunity must still be open in the evaluator or have been closed
+    open_matches = {opp.match for opp in evaluator.opportunities()}
+    consistent = all(state.opportunity.match in open_matches for state in tracker.active())
+    
+    minutes = n_ticks * tick_seconds / 60
+    print(f"Alerts: {n_matches} matches x {n_books} bookmakers, {n_ticks} polls over {minutes:.0f} minutes")
+    print("=" * 60)
+    print(f"  re-reported every snapshot:   {snapshot_reports:>7}")
+    print(f"  incremental changes:          {changed:>7}  (added, changed or removed)")
+    print(f"  tracker alerts:               {sum(kinds.values()):>7}  "
+          f"({kinds['opened']} opened, {kinds['updated']} updated, {kinds['closed']} closed)")
+    print(f"  flickers suppressed:          {tracker.suppressed:>7}")
+    print(f"  {'✓ tracked opportunities are all still open' if consistent else '✗ TRACKER OUT OF SYNC'}")
+    return consistent
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', default='book', choices=['scan', 'book', 'incremental', 'alerts'])
+    parser.add_argument('--matches', type=int, default=500)
+    parser.add_argument('--books', type=int, default=30)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--updates', type=int, default=20000)
+    args = parser.parse_args()
+    
+    if args.command == 'scan':
+        ok = benchmark_scan(args.matches, args.books, args.repeats)
+    elif args.command == 'alerts':
+        ok = benchmark_alerts(args.matches, args.books)
+    elif args.command == 'incremental':
+        ok = benchmark_incremental(args.matches, args.books, args.updates, args.repeats)
+    else:
+        ok = benchmark_book(args.matches, args.books, args.updates, args.repeats)
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
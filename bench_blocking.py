@@ -0,0 +1,103 @@
+"""
+Compare resource blocking profiles and page load strategies against the live bookmaker sites
+
+Each (profile, strategy) combination loads every bookmaker page a few times and
+reports bytes transferred, request count, time-to-odds and how many matches were
+extracted. A profile that extracts fewer matches than the unblocked baseline has
+broken that site and is flagged.
+
+    python bench_blocking.py                                          # off vs lean, normal page loads
+    python bench_blocking.py --profiles off lean aggressive --strategies normal eager none --runs 3
+    python bench_blocking.py --output blocking_report.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+from typing import Dict, List
+
+from afl_resource_blocking import BLOCK_PROFILES
+from afl_selenium_scraper_NEW import AFLSeleniumScraper
+
+def median(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] if ordered else 0.0
+
+def measure(profile: str, strategy: str, runs: int, headless: bool = True) -> Dict[str, Dict]:
+    """Load every bookmaker `runs` times with one profile/strategy, returning per-site medians"""
+    scraper = AFLSeleniumScraper(headless=headless, block_profile=profile, page_load_strategy=strategy)
+    results = {}
+    
+    if not scraper.start_driver():
+        return results
+    
+    try:
+        for name, config in scraper.bookmakers.items():
+            samples = []
+            for _ in range(runs):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    odds = scraper._scrape_bookmaker_selenium(name, config)
+                report = dict(scraper.load_reports.get(name, {}))
+                report['matches'] = len(odds)
+                samples.append(report)
+            
+            results[name] = {
+                'bytes': median([sample.get('bytes', 0) for sample in samples]),
+                'requests': median([sample.get('requests', 0) for sample in samples]),
+                'time_to_odds': median([sample.get('time_to_odds', 0.0) for sample in samples]),
+                'matches': min(sample['matches'] for sample in samples)
+            }
+    finally:
+        scraper.stop_driver()
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', default=['off', 'lean'], choices=list(BLOCK_PROFILES))
+    parser.add_argument('--strategies', nargs='+', default=['normal'], choices=['normal', 'eager', 'none'])
+    parser.add_argument('--runs', type=int, default=2)
+    parser.add_argument('--show-browser', action='store_true')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    
+    combos = [(profile, strategy) for profile in args.profiles for strategy in args.strategies]
+    reports = {}
+    for profile, strategy in combos:
+        print(f"Measuring profile={profile} strategy={strategy}...")
+        reports[(profile, strategy)] = measure(profile, strategy, args.runs, not args.show_browser)
+    
+    baseline = reports[combos[0]]
+    ok = True
+    print(f"\nResource blocking report (median of {args.runs} loads, baseline {combos[0][0]}/{combos[0][1]})")
+    print("=" * 86)
+    print(f"{'bookmaker':<12}{'profile':<12}{'strategy':<10}{'KB':>9}{'requests':>10}{'odds s':>9}"
+          f"{'matches':>9}  vs baseline")
+    
+    for name in baseline:
+        base = baseline[name]
+        for (profile, strategy), report in reports.items():
+            site = report.get(name)
+            if not site:
+                continue
+            
+            saved = 1 - site['bytes'] / base['bytes'] if base['bytes'] else 0.0
+            delta = site['time_to_odds'] - base['time_to_odds']
+            status = f"{saved:>4.0%} fewer bytes, odds {delta:+.1f}s"
+            if site['matches'] < base['matches']:
+                ok = False
+                status += f"  ✗ lost {base['matches'] - site['matches']} matches"
+            
+            print(f"{name:<12}{profile:<12}{strategy:<10}{site['bytes'] / 1024:>9.0f}{site['requests']:>10.0f}"
+                  f"{site['time_to_odds']:>9.1f}{site['matches']:>9}  {status}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({f"{profile}/{strategy}": report for (profile, strategy), report in reports.items()}, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Replay recorded WebSocket frame logs through the in-play odds book
+
+Frame logs are JSON Lines of {"t", "bookmaker", "payload"} as written by
+InPlayWatcher(record_path=...). The odds book is seeded from
+fixtures/<bookmaker>_expected.json, then every frame is decoded, applied and
+checked for arbitrage exactly as in live in-play mode.
+
+fixtures/inplay_frames.jsonl is a short hand-written log in the decoders' frame
+layouts (handshakes, pings and non-H2H markets included) that opens two
+arbitrages and closes one; test_inplay.py pins what it should do.
+
+    python bench_inplay.py                                  # fixtures/inplay_frames.jsonl, as fast as possible
+    python bench_inplay.py --repeat 20                      # loop the log for a steadier updates/s figure
+    python bench_inplay.py --realtime                       # honour the recorded gaps between frames
+    python bench_inplay.py --frames inplay_frames.jsonl     # a freshly recorded log
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from typing import Dict, List
+
+from afl_inplay import InPlayWatcher
+from afl_selenium_scraper_NEW import AFLSeleniumScraper
+from main_hedge_analysis import AFLOpportunityFinder
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_frames(path: str) -> List[Dict]:
+    """Load a recorded frame log"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def seeded_watcher(fixture_dir: str = FIXTURE_DIR) -> InPlayWatcher:
+    """An in-play watcher whose odds book starts from the recorded page fixtures (no browser)"""
+    scraper = AFLSeleniumScraper(headless=True)
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=1.0, max_stake_percentage=25.0)
+    watcher = InPlayWatcher(scraper, finder)
+    
+    for name in scraper.bookmakers:
+        path = os.path.join(fixture_dir, f"{name}_expected.json")
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                watcher.apply_records(name, json.load(f))
+    return watcher
+
+def replay(frames: List[Dict], repeat: int = 1, realtime: bool = False, fixture_dir: str = FIXTURE_DIR) -> Dict:
+    """Feed every frame through a freshly seeded watcher and report throughput and latency"""
+    watcher = seeded_watcher(fixture_dir)
+    alerts = io.StringIO()
+    
+    with contextlib.redirect_stdout(alerts):
+        watcher._started_at = time.time()
+        for _ in range(repeat):
+            base = time.perf_counter()
+            for frame in frames:
+                if realtime:
+                    time.sleep(max(0.0, base + frame['t'] - time.perf_counter()))
+                watcher.handle_frame(frame['bookmaker'], frame['payload'])
+    
+    report = watcher.report()
+    report['closed'] = alerts.getvalue().count('Arbitrage closed')
+    
+    print(f"Frame replay: {len(frames)} frames x {repeat}{' (realtime)' if realtime else ''}")
+    print("=" * 70)
+    print(f"  frames:            {report['frames']:>10}")
+    print(f"  price updates:     {report['updates']:>10}  ({report['updates_per_s']:,.0f} updates/s)")
+    print(f"  frame handling:    p50 {report['frame_p50_ms']:.3f} ms   p99 {report['frame_p99_ms']:.3f} ms")
+    print(f"  arbitrage alerts:  {report['alerts']:>10}  ({report['closed']} closed again)")
+    print(f"  price-to-alert:    p50 {report['alert_p50_ms']:.3f} ms   p99 {report['alert_p99_ms']:.3f} ms"
+          f"   max {report['alert_max_ms']:.3f} ms")
+    print(f"  realigned frames:  {report['realigned']:>10}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', default=os.path.join(FIXTURE_DIR, 'inplay_frames.jsonl'))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--realtime', action='store_true')
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.frames):
+        print(f"❌ No frame log at {args.frames}; record one from the live sites with "
+              f"InPlayWatcher(record_path=...) (afl_inplay.py RECORD_PATH)")
+        raise SystemExit(1)
+    
+    frames = load_frames(args.frames)
+    report = replay(frames, args.repeat, args.realtime, args.fixtures)
+    raise SystemExit(0 if report['updates'] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+Offline fixture-replay benchmark and regression harness for the bookmaker parsers
+
+Replays saved <bookmaker>_selenium_debug.html pages (capture fresh ones with
+AFLSeleniumScraper(debug_html_dir=...)) through the parsers without touching the
+live sites.
+    
+    python bench_parsers.py replay --iterations 2000     # throughput, p50/p99, allocations
+    python bench_parsers.py compare                      # html.parser vs lxml + strainer
+    python bench_parsers.py selectors --scale 50         # inline regexes vs the precompiled selector registry
+    python bench_parsers.py check                        # parsers still match fixtures/*_expected.json
+    python bench_parsers.py check --update-expected      # re-record the expected output
+    python bench_parsers.py feeds                        # decode fixtures/*_feed.json, check them against the HTML parse
+    python bench_parsers.py pipeline --load-seconds 1.5  # parse inline vs overlapped with (simulated) page loads
+    python bench_parsers.py cards --change-rate 0.2      # repeated card polls with and without the card hash cache
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import re
+import time
+import tracemalloc
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from afl_card_cache import CardCache
+from afl_selenium_scraper_NEW import AFLSeleniumScraper, LXML_AVAILABLE
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR) -> dict:
+    """Load <bookmaker>_selenium_debug.html page dumps for every bookmaker that has one"""
+    fixtures = {}
+    for name in AFLSeleniumScraper(headless=True).bookmakers:
+        path = os.path.join(fixture_dir, f"{name}_selenium_debug.html")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def measure_allocations(parse, samples: int = 5) -> Dict[str, float]:
+    """Average traced allocation stats for a parse callable"""
+    peaks = []
+    blocks = []
+    quiet = io.StringIO()
+    
+    for _ in range(samples):
+        tracemalloc.start()
+        with contextlib.redirect_stdout(quiet):
+            result = parse()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        peaks.append(peak)
+        blocks.append(sum(stat.count for stat in snapshot.statistics('filename')))
+        del result
+    
+    return {
+        'peak_kb': sum(peaks) / len(peaks) / 1024,
+        'blocks': sum(blocks) / len(blocks)
+    }
+
+def measure_parse(scraper: AFLSeleniumScraper, name: str, page_source: str, fast: bool, iterations: int) -> dict:
+    """Replay one page through a parse path, collecting per-parse latency and allocation stats"""
+    parse = lambda: scraper.parse_page(name, page_source, fast=fast)
+    quiet = io.StringIO()
+    
+    with contextlib.redirect_stdout(quiet):
+        result = parse()  # warm-up, and the output to compare
+    
+    latencies = []
+    with contextlib.redirect_stdout(quiet):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            parse()
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+        quiet.seek(0)
+        quiet.truncate()
+    
+    allocations = measure_allocations(parse)
+    
+    return {
+        'result': result,
+        'iterations': iterations,
+        'pages_per_s': iterations / elapsed,
+        'mean_ms': elapsed / iterations * 1000,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_kb': allocations['peak_kb'],
+        'blocks': allocations['blocks']
+    }
+
+def replay(iterations: int = 1000, fast: bool = True, fixture_dir: str = FIXTURE_DIR,
+           output_file: str = None) -> Dict[str, dict]:
+    """Parse every fixture page many times and report throughput, latency percentiles and allocations"""
+    scraper = AFLSeleniumScraper(headless=True)
+    fixtures = load_fixtures(fixture_dir)
+    
+    if not fixtures:
+        print(f"❌ No *_selenium_debug.html fixtures found in {fixture_dir}")
+        return {}
+    
+    path_name = 'lxml+strainer' if fast and LXML_AVAILABLE else 'html.parser'
+    print(f"Fixture replay: {path_name}, {iterations} parses per page")
+    print("=" * 78)
+    print(f"{'bookmaker':<12}{'matches':>8}{'pages/s':>10}{'mean ms':>10}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'peak KB':>10}{'blocks':>10}")
+    
+    report = {}
+    for name, page_source in fixtures.items():
+        stats = measure_parse(scraper, name, page_source, fast, iterations)
+        print(f"{name:<12}{len(stats['result']):>8}{stats['pages_per_s']:>10.1f}{stats['mean_ms']:>10.2f}"
+              f"{stats['p50_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['peak_kb']:>10.0f}{stats['blocks']:>10.0f}")
+        report[name] = {key: value for key, value in stats.items() if key != 'result'}
+        report[name]['matches'] = len(stats['result'])
+    
+    if output_file:
+        with open(output_file, 'w') as f:
+            json.dump({'parse_path': path_name, 'results': report}, f, indent=2)
+        print(f"\nResults saved to {output_file}")
+    
+    return report
+
+def compare_parse_paths(iterations: int = 20, fixture_dir: str = FIXTURE_DIR) -> bool:
+    """Compare html.parser over the full page with lxml + SoupStrainer over the event subtrees"""
+    scraper = AFLSeleniumScraper(headless=True)
+    fixtures = load_fixtures(fixture_dir)
+    
+    if not fixtures:
+        print(f"❌ No *_selenium_debug.html fixtures found in {fixture_dir}")
+        return False
+    
+    if not LXML_AVAILABLE:
+        print("⚠ lxml is not installed - the fast path falls back to html.parser")
+    
+    print(f"Parse path comparison ({iterations} iterations per page)")
+    print("=" * 70)
+    print(f"{'bookmaker':<12}{'size':>9}{'full ms':>10}{'fast ms':>10}{'speedup':>9}{'full KB':>10}{'fast KB':>10}")
+    
+    all_identical = True
+    for name, page_source in fixtures.items():
+        full = measure_parse(scraper, name, page_source, False, iterations)
+        fast = measure_parse(scraper, name, page_source, True, iterations)
+        identical = full['result'] == fast['result']
+        all_identical = all_identical and identical
+        
+        print(f"{name:<12}{len(page_source) / 1024:>8.0f}K{full['mean_ms']:>10.2f}{fast['mean_ms']:>10.2f}"
+              f"{full['mean_ms'] / fast['mean_ms']:>8.1f}x{full['peak_kb']:>10.0f}{fast['peak_kb']:>10.0f}"
+              f"  {'✓ identical' if identical else '✗ OUTPUT DIFFERS'} ({len(full['result'])} matches)")
+    
+    return all_identical
+
+def _legacy_lookups(name: str, soup: BeautifulSoup) -> int:
+    """Pattern lookups as the parsers did them before the selector registry: compiled per card, leading .*"""
+    found = 0
+    if name == 'sportsbet':
+        found += len(soup.find_all('div', {'data-automation-id': re.compile(r'\d+-competition-event-card')}))
+    elif name == 'ladbrokes':
+        for container in soup.find_all('div', {'data-testid': 'team-vs-team'}):
+            card = container.find_parent('div', class_=re.compile(r'.*flex.*cursor-pointer.*'))
+            if card:
+                found += len(card.find_all('button', {'data-testid': re.compile(r'price-button-.*')}))
+                found += card.find('div', class_=re.compile(r'.*countdown-badge.*')) is not None
+    elif name == 'pointsbet':
+        for event in soup.find_all('div', {'data-test': 'event'}):
+            found += len(event.find_all('a', {'data-test': re.compile(r'.*EventTeamNameWrapperLinkLink')}))
+            found += event.find('button', {'data-test': re.compile(r'.*EventTopMarket0OddsButton')}) is not None
+            found += event.find('button', {'data-test': re.compile(r'.*EventBottomMarket0OddsButton')}) is not None
+            found += event.find('div', {'data-test': re.compile(r'.*EventEventFooter')}) is not None
+    return found
+
+def _registry_lookups(name: str, soup: BeautifulSoup, selectors: dict) -> int:
+    """The same lookups using the scraper's precompiled, anchored selector registry"""
+    found = 0
+    if name == 'sportsbet':
+        found += len(soup.find_all('div', selectors['event_card_attrs']))
+    elif name == 'ladbrokes':
+        for container in soup.find_all('div', selectors['team_vs_team_attrs']):
+            card = container.find_parent('div', class_=selectors['match_card'])
+            if card:
+                found += len(card.find_all('button', selectors['price_button_attrs']))
+                found += card.find('div', class_=selectors['countdown']) is not None
+    elif name == 'pointsbet':
+        for event in soup.find_all('div', selectors['event_attrs']):
+            found += len(event.find_all('a', selectors['team_link_attrs']))
+            found += event.find('button', selectors['top_h2h_attrs']) is not None
+            found += event.find('button', selectors['bottom_h2h_attrs']) is not None
+            found += event.find('div', selectors['event_footer_attrs']) is not None
+    return found
+
+def benchmark_selectors(scale: int = 50, iterations: int = 20, fixture_dir: str = FIXTURE_DIR) -> bool:
+    """Microbenchmark the parser pattern lookups on a large page of repeated event cards"""
+    scraper = AFLSeleniumScraper(headless=True)
+    fixtures = load_fixtures(fixture_dir)
+    
+    if not fixtures:
+        print(f"❌ No *_selenium_debug.html fixtures found in {fixture_dir}")
+        return False
+    
+    print(f"Selector lookups on pages with every event card repeated {scale}x ({iterations} iterations)")
+    print("=" * 70)
+    print(f"{'bookmaker':<12}{'events':>8}{'inline ms':>11}{'registry ms':>13}{'speedup':>9}")
+    
+    ok = True
+    for name, page_source in fixtures.items():
+        cards_html = str(scraper.make_soup(name, page_source, fast=True))
+        with contextlib.redirect_stdout(io.StringIO()):
+            events = len(scraper.parse_page(name, page_source)) * scale
+        soup = BeautifulSoup(f"<html><body>{cards_html * scale}</body></html>", 'html.parser')
+        selectors = scraper.bookmakers[name]['selectors']
+        
+        legacy_found = _legacy_lookups(name, soup)
+        registry_found = _registry_lookups(name, soup, selectors)
+        ok = ok and legacy_found == registry_found
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            re.purge()  # the old code paid re.compile's cache lookup (or a recompile) every card
+            _legacy_lookups(name, soup)
+        legacy_ms = (time.perf_counter() - start) / iterations * 1000
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            _registry_lookups(name, soup, selectors)
+        registry_ms = (time.perf_counter() - start) / iterations * 1000
+        
+        status = '✓ same matches' if legacy_found == registry_found else '✗ MATCHES DIFFER'
+        print(f"{name:<12}{events:>8}{legacy_ms:>11.2f}{registry_ms:>13.2f}"
+              f"{legacy_ms / registry_ms:>8.1f}x  {status}")
+    
+    return ok
+
+def check_expected(fixture_dir: str = FIXTURE_DIR, update: bool = False) -> bool:
+    """Regression check: both parse paths must reproduce fixtures/<bookmaker>_expected.json"""
+    scraper = AFLSeleniumScraper(headless=True)
+    fixtures = load_fixtures(fixture_dir)
+    quiet = io.StringIO()
+    ok = True
+    
+    for name, page_source in fixtures.items():
+        expected_path = os.path.join(fixture_dir, f"{name}_expected.json")
+        with contextlib.redirect_stdout(quiet):
+            full = scraper.parse_page(name, page_source, fast=False)
+            fast = scraper.parse_page(name, page_source, fast=True)
+        
+        if update:
+            with open(expected_path, 'w') as f:
+                json.dump(full, f, indent=2)
+            print(f"✓ {name}: recorded {len(full)} matches to {expected_path}")
+            continue
+        
+        if not os.path.exists(expected_path):
+            print(f"⚠ {name}: no {os.path.basename(expected_path)} (run with --update-expected)")
+            continue
+        
+        with open(expected_path, 'r') as f:
+            expected = json.load(f)
+        
+        for path_name, result in (('html.parser', full), ('lxml+strainer', fast)):
+            if result == expected:
+                print(f"✓ {name} [{path_name}]: {len(result)} matches as expected")
+            else:
+                ok = False
+                print(f"✗ {name} [{path_name}]: output differs from {os.path.basename(expected_path)}")
+    
+    return ok
+
+def load_feed_fixtures(fixture_dir: str = FIXTURE_DIR) -> dict:
+    """Load <bookmaker>_feed.json response bodies (capture live ones with network_capture + debug_html_dir)"""
+    feeds = {}
+    for name in AFLSeleniumScraper(headless=True).bookmakers:
+        path = os.path.join(fixture_dir, f"{name}_feed.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                feeds[name] = json.load(f)
+    return feeds
+
+def feed_prices(records: List[Dict]) -> set:
+    """(home, away, home odds, away odds) per match: what a feed and the page it backs must agree on"""
+    return {(r['home_team'], r['away_team'], r['home_odds'], r['away_odds']) for r in records}
+
+def check_feeds(iterations: int = 200, fixture_dir: str = FIXTURE_DIR, update: bool = False) -> bool:
+    """
+    Decode feed fixtures against fixtures/<bookmaker>_feed_expected.json, check they price the same
+    matches as the HTML parse of the same book's page, and time decoding against HTML parsing
+    """
+    scraper = AFLSeleniumScraper(headless=True)
+    feeds = load_feed_fixtures(fixture_dir)
+    pages = load_fixtures(fixture_dir)
+    quiet = io.StringIO()
+    ok = True
+    
+    if not feeds:
+        print(f"❌ No *_feed.json fixtures found in {fixture_dir}; record them from the live sites with "
+              f"AFLSeleniumScraper(network_capture=True, debug_html_dir='{fixture_dir}')")
+        return False
+    
+    print(f"Feed decoding vs HTML parsing ({iterations} iterations)")
+    print("=" * 70)
+    
+    for name, responses in feeds.items():
+        config = scraper.bookmakers[name]
+        decode = lambda: scraper.feed_capture.decode_responses(name, config, responses)
+        result = decode()
+        
+        expected_path = os.path.join(fixture_dir, f"{name}_feed_expected.json")
+        if update:
+            with open(expected_path, 'w') as f:
+                json.dump(result, f, indent=2)
+            print(f"✓ {name}: recorded {len(result)} matches to {expected_path}")
+            continue
+        
+        if os.path.exists(expected_path):
+            with open(expected_path, 'r') as f:
+                status = '✓' if result == json.load(f) else '✗ differs from expected'
+        else:
+            status = f"⚠ no {os.path.basename(expected_path)} (run with --update-expected)"
+        ok = ok and not status.startswith('✗')
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            decode()
+        decode_ms = (time.perf_counter() - start) / iterations * 1000
+        
+        line = f"{name:<12}{len(result):>4} matches  decode {decode_ms:>7.3f} ms"
+        if name in pages:
+            with contextlib.redirect_stdout(quiet):
+                html_records = scraper.parse_page(name, pages[name])
+                start = time.perf_counter()
+                for _ in range(max(1, iterations // 10)):
+                    scraper.parse_page(name, pages[name])
+                parse_ms = (time.perf_counter() - start) / max(1, iterations // 10) * 1000
+            line += f"  html parse {parse_ms:>7.2f} ms ({parse_ms / decode_ms:.0f}x)"
+            
+            if feed_prices(result) != feed_prices(html_records):
+                status += f", ✗ prices differ from the HTML parse ({len(html_records)} matches)"
+                ok = False
+            else:
+                status += ", same prices as the HTML parse"
+        print(f"{line}  {status}")
+    
+    return ok
+
+def benchmark_pipeline(load_seconds: float = 1.0, workers: int = 2, fast: bool = True,
+                       fixture_dir: str = FIXTURE_DIR) -> bool:
+    """Scrape the fixture pages with a simulated browser load time, parsing inline and then on the parser pool"""
+    pages = load_fixtures(fixture_dir)
+    if not pages:
+        print(f"❌ No *_selenium_debug.html fixtures found in {fixture_dir}")
+        return False
+    
+    def fetch(name, config):
+        time.sleep(load_seconds)  # stands in for driver.get + the price-stability wait
+        return [], pages.get(name)
+    
+    scraper = AFLSeleniumScraper(headless=True, parse_workers=workers)
+    scraper.fast_parse = fast
+    quiet = io.StringIO()
+    
+    with contextlib.redirect_stdout(quiet):
+        start = time.perf_counter()
+        inline = {name: scraper._parse_fetched(name, *fetch(name, config)) for name, config in scraper.bookmakers.items()}
+        inline_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        pipelined = scraper._scrape_sites_pipelined(fetch, scraper.bookmakers, {})
+        pipelined_seconds = time.perf_counter() - start
+    
+    report = scraper.pipeline_report
+    ok = inline == pipelined
+    print(f"Fetch/parse pipeline ({len(pages)} pages, {load_seconds:.2f}s simulated load, {workers} parser workers, "
+          f"{'lxml+strainer' if fast else 'html.parser'})")
+    print("=" * 70)
+    print(f"  inline parsing:     {inline_seconds:>7.2f}s")
+    print(f"  pipelined parsing:  {pipelined_seconds:>7.2f}s  ({1 - pipelined_seconds / inline_seconds:.0%} less wall time)")
+    print(f"  fetch stage busy {report['fetch_utilisation']:.0%}, parse stage busy {report['parse_utilisation']:.0%}, "
+          f"queue depth max {report['max_depth']}")
+    print(f"  {'✓ identical' if ok else '✗ different'} results "
+          f"({sum(len(odds) for odds in pipelined.values())} matches)")
+    return ok
+
+def benchmark_card_cache(polls: int = 50, change_rate: float = 0.2, fixture_dir: str = FIXTURE_DIR) -> bool:
+    """Poll the fixture cards repeatedly, re-pricing a share of them each time, with and without the card cache"""
+    scraper = AFLSeleniumScraper(headless=True)
+    pages = load_fixtures(fixture_dir)
+    quiet = io.StringIO()
+    ok = True
+    
+    if not pages:
+        print(f"❌ No *_selenium_debug.html fixtures found in {fixture_dir}")
+        return False
+    
+    print(f"Card hash cache ({polls} polls, {change_rate:.0%} of cards re-priced per poll)")
+    print("=" * 70)
+    
+    for name, page in pages.items():
+        with contextlib.redirect_stdout(quiet):
+            soup = scraper.make_soup(name, page)
+        # The same card outer HTML read_event_cards gets from EVENT_CARDS_SCRIPT
+        cards = [str(card) for card in soup.find_all(scraper.bookmakers[name]['strainer'])]
+        
+        # Deterministic re-pricing: each poll bumps the first price on a rotating subset of cards
+        rounds = []
+        per_poll = max(1, round(len(cards) * change_rate))
+        for poll in range(polls):
+            for j in range(per_poll):
+                i = (poll * per_poll + j) % len(cards)
+                cards[i] = re.sub(r'>(\d+\.\d+)<', lambda m: f">{float(m.group(1)) + 0.01:.2f}<", cards[i], count=1)
+            rounds.append(list(cards))
+        
+        cache = CardCache()
+        with contextlib.redirect_stdout(quiet):
+            start = time.perf_counter()
+            uncached = [scraper.parse_page(name, ''.join(fragments)) for fragments in rounds]
+            uncached_ms = (time.perf_counter() - start) / polls * 1000
+            
+            start = time.perf_counter()
+            cached = [cache.parse(name, fragments, lambda f: scraper.parse_card_fragments(name, f)) for fragments in rounds]
+            cached_ms = (time.perf_counter() - start) / polls * 1000
+        
+        same = cached == uncached
+        ok = ok and same
+        stats = cache.report()[name]
+        print(f"{name:<12}{len(cards):>4} cards  full {uncached_ms:>6.2f} ms/poll  cached {cached_ms:>6.2f} ms/poll "
+              f"({uncached_ms / cached_ms:.1f}x)  hit rate {stats['hit_rate']:.0%}  "
+              f"{'✓ identical' if same else '✗ different'}")
+    
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', default='replay', choices=['replay', 'compare', 'selectors', 'check', 'feeds', 'pipeline', 'cards'])
+    parser.add_argument('--iterations', type=int, default=None,
+                        help="parses per page (default 1000 for replay, 20 for compare, 200 for feeds, 50 polls for cards)")
+    parser.add_argument('--scale', type=int, default=50, help="event card repetitions for the selectors benchmark")
+    parser.add_argument('--full', action='store_true', help="replay with html.parser instead of the fast path")
+    parser.add_argument('--load-seconds', type=float, default=1.0, help="simulated page load for the pipeline benchmark")
+    parser.add_argument('--workers', type=int, default=2, help="parser workers for the pipeline benchmark")
+    parser.add_argument('--change-rate', type=float, default=0.2, help="share of cards re-priced per poll (cards)")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--output', default=None, help="write replay results to this JSON file")
+    parser.add_argument('--update-expected', action='store_true')
+    args = parser.parse_args()
+    
+    if args.command == 'replay':
+        ok = bool(replay(args.iterations or 1000, not args.full, args.fixtures, args.output))
+    elif args.command == 'compare':
+        ok = compare_parse_paths(args.iterations or 20, args.fixtures)
+    elif args.command == 'selectors':
+        ok = benchmark_selectors(args.scale, args.iterations or 20, args.fixtures)
+    elif args.command == 'feeds':
+        ok = check_feeds(args.iterations or 200, args.fixtures, args.update_expected)
+    elif args.command == 'cards':
+        ok = benchmark_card_cache(args.iterations or 50, args.change_rate, args.fixtures)
+    elif args.command == 'pipeline':
+        ok = benchmark_pipeline(args.load_seconds, args.workers, not args.full, args.fixtures)
+    else:
+        ok = check_expected(args.fixtures, args.update_expected)
+    
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
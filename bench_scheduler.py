@@ -0,0 +1,139 @@
+"""
+Simulate fixed-cadence polling against the adaptive refresh scheduler
+
+Prices on each bookmaker page move as a Poisson process whose rate climbs as
+kickoff approaches. Both strategies poll the same simulated market; the report
+compares browser polls spent, how many of them saw a price change, and how long
+moves took to be noticed.
+
+    python bench_scheduler.py                          # 6 simulated hours, fixed 5s polls vs adaptive
+    python bench_scheduler.py --hours 24 --fixed 10
+    python bench_scheduler.py --min-interval 3 --max-interval 300
+"""
+
+import argparse
+import heapq
+import random
+from typing import Dict, List, Optional, Tuple
+
+from afl_odds_watch import OddsDelta
+from afl_scheduler import RefreshScheduler
+
+BOOKMAKERS = ['sportsbet', 'ladbrokes', 'pointsbet']
+
+# (home, away, kickoff in hours from the start of the simulation)
+FIXTURES = [
+    ('Carlton', 'Collingwood', 0.5),
+    ('Geelong', 'Hawthorn', 3.0),
+    ('Sydney', 'Brisbane', 26.0),
+    ('Essendon', 'Richmond', 50.0),
+    ('Fremantle', 'West Coast', 120.0)
+]
+KICKOFFS = {f"{home}|{away}": kickoff_h for home, away, kickoff_h in FIXTURES}
+
+def move_rate(hours_to_kickoff: float) -> float:
+    """Price moves per minute on one book for one match"""
+    return 0.02 + 2.0 / (1 + 4 * max(0.0, hours_to_kickoff)) ** 2
+
+def simulate_moves(hours: float, seed: int) -> Dict[str, List[Tuple[float, str]]]:
+    """Per-bookmaker sorted (time, match_key) price moves, generated by thinning"""
+    rng = random.Random(seed)
+    peak = move_rate(0) / 60
+    moves = {name: [] for name in BOOKMAKERS}
+    
+    for name in BOOKMAKERS:
+        for home, away, kickoff_h in FIXTURES:
+            t = 0.0
+            end = min(hours, kickoff_h) * 3600
+            while True:
+                t += rng.expovariate(peak)
+                if t >= end:
+                    break
+                if rng.random() < move_rate(kickoff_h - t / 3600) / 60 / peak:
+                    moves[name].append((t, f"{home}|{away}"))
+        moves[name].sort()
+    return moves
+
+def records_at(now: float) -> List[Dict]:
+    return [
+        {'home_team': home, 'away_team': away, 'home_odds': 1.9, 'away_odds': 1.9,
+         'match_time': None, 'kickoff_ts': kickoff_h * 3600}
+        for home, away, kickoff_h in FIXTURES
+    ]
+
+def run(moves: Dict[str, List[Tuple[float, str]]], hours: float, fixed: Optional[float],
+        scheduler: Optional[RefreshScheduler]) -> Dict:
+    """Poll the simulated pages with a fixed interval or the scheduler; returns polls and detection delays"""
+    end = hours * 3600
+    cursor = {name: 0 for name in BOOKMAKERS}
+    polls = useful = 0
+    delays = []
+    late_delays = []  # moves in the last hour before kickoff, where stale prices cost the most
+    
+    queue = [(0.0, name) for name in BOOKMAKERS]
+    if scheduler:
+        for name in BOOKMAKERS:
+            scheduler.add_page(name, now=0.0)
+    
+    while queue:
+        now, name = heapq.heappop(queue)
+        if now > end:
+            break
+        
+        seen = []
+        events = moves[name]
+        while cursor[name] < len(events) and events[cursor[name]][0] <= now:
+            seen.append(events[cursor[name]])
+            cursor[name] += 1
+        
+        polls += 1
+        useful += bool(seen)
+        delays.extend(now - t for t, _ in seen)
+        late_delays.extend(now - t for t, key in seen if KICKOFFS[key] * 3600 - t <= 3600)
+        
+        if scheduler:
+            scheduler.filter_active(name, records_at(now), now=now)
+            deltas = [OddsDelta(key, name, 'home', *key.split('|'), 1.9, 1.95) for _, key in seen]
+            heapq.heappush(queue, (now + scheduler.observe(name, deltas, now=now), name))
+        else:
+            heapq.heappush(queue, (now + fixed, name))
+    
+    delays.sort()
+    late_delays.sort()
+    return {
+        'polls': polls,
+        'useful': useful,
+        'moves': len(delays),
+        'mean_delay': sum(delays) / len(delays) if delays else 0.0,
+        'p90_delay': delays[int(0.9 * (len(delays) - 1))] if delays else 0.0,
+        'late_delay': sum(late_delays) / len(late_delays) if late_delays else 0.0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=6.0)
+    parser.add_argument('--fixed', type=float, default=5.0, help="fixed polling interval in seconds")
+    parser.add_argument('--min-interval', type=float, default=5.0)
+    parser.add_argument('--max-interval', type=float, default=600.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    moves = simulate_moves(args.hours, args.seed)
+    scheduler = RefreshScheduler(lambda home, away: f"{home}|{away}",
+                                 min_interval=args.min_interval, max_interval=args.max_interval)
+    results = {
+        f"fixed {args.fixed:.0f}s": run(moves, args.hours, args.fixed, None),
+        'adaptive': run(moves, args.hours, None, scheduler)
+    }
+    
+    print(f"Refresh scheduling over {args.hours:.0f} simulated hours ({len(FIXTURES)} matches x {len(BOOKMAKERS)} books)")
+    print("=" * 89)
+    print(f"{'strategy':<12}{'polls':>8}{'useful':>8}{'useful %':>10}{'moves':>8}{'mean delay':>12}{'p90 delay':>11}{'last hour':>11}")
+    for label, result in results.items():
+        print(f"{label:<12}{result['polls']:>8}{result['useful']:>8}{result['useful'] / result['polls']:>10.0%}"
+              f"{result['moves']:>8}{result['mean_delay']:>11.1f}s{result['p90_delay']:>10.1f}s{result['late_delay']:>10.1f}s")
+    
+    scheduler.print_report()
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 import json
 import re
 import glob
+import heapq
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, TextIO, Tuple
+from dataclasses import dataclass, asdict
 import math
+from afl_market_book import MarketBook
+from afl_odds_matrix import NUMPY_AVAILABLE, OddsMatrix
 
 @dataclass
 class BettingOpportunity:
@@ -20,8 +24,74 @@ class BettingOpportunity:
     guaranteed_profit: float
     roi: float
 
+class JsonlOpportunitySink:
+    def __init__(self, filename: str = None):
+        """
+        Append opportunities to a JSON Lines file as they are found
+        
+        Args:
+            filename: Output path (defaults to a timestamped afl_betting_opportunities_*.jsonl)
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"afl_betting_opportunities_{timestamp}.jsonl"
+        
+        self.filename = filename
+        self.count = 0
+        self._file: Optional[TextIO] = None
+    
+    def write(self, opp: BettingOpportunity):
+        """Write one opportunity and flush so tailing readers see it immediately"""
+        if self._file is None:
+            self._file = open(self.filename, 'a')
+        
+        self._file.write(json.dumps({'timestamp': datetime.now().isoformat(), **asdict(opp)}) + "\n")
+        self._file.flush()
+        self.count += 1
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class TopOpportunities:
+    def __init__(self, k: int = 10):
+        """
+        Keep the k highest-ROI opportunities seen so far in a bounded min-heap
+        
+        Args:
+            k: Number of opportunities to keep
+        """
+        self.k = k
+        self.seen = 0
+        self._heap: List[Tuple[float, int, BettingOpportunity]] = []
+    
+    def push(self, opp: BettingOpportunity):
+        # Earlier arrivals win ROI ties, matching a stable sort of the full list
+        entry = (opp.roi, -self.seen, opp)
+        self.seen += 1
+        
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+    
+    def sorted(self) -> List[BettingOpportunity]:
+        """Kept opportunities, best ROI first"""
+        return [opp for _, _, opp in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+    
+    def __len__(self):
+        return len(self._heap)
+
 class AFLOpportunityFinder:
-    def __init__(self, bankroll: float, min_profit_percentage: float = 1.0, max_stake_percentage: float = 5.0):
+    def __init__(self, bankroll: float, min_profit_percentage: float = 1.0, max_stake_percentage: float = 5.0,
+                 min_value_edge: float = 5.0, columnar: bool = False):
         """
         Initialize the AFL opportunity finder
         
@@ -29,11 +99,16 @@ class AFLOpportunityFinder:
             bankroll: Total available bankroll
             min_profit_percentage: Minimum profit percentage to consider (1% = 1.0)
             max_stake_percentage: Maximum percentage of bankroll to stake per opportunity
+            min_value_edge: Percentage a price must beat the fair odds by to count as a value bet (5% = 5.0)
+            columnar: Scan every match in one numpy pass over an OddsMatrix instead of per-match dict walks
+                (falls back to the dict scans when numpy isn't installed)
         """
         self.bankroll = bankroll
         self.min_profit_percentage = min_profit_percentage
+        self.min_value_edge = min_value_edge
         self.max_stake_percentage = max_stake_percentage
         self.max_stake_per_opportunity = bankroll * (max_stake_percentage / 100)
+        self.columnar = columnar and NUMPY_AVAILABLE
         self.odds_data = None
     
     def load_odds_from_file(self, specific_file: str = None) -> Optional[Dict]:
@@ -80,37 +155,52 @@ class AFLOpportunityFinder:
             
             print(f"\n📊 Analyzing: {match_name}")
             
-            # Get best odds for each outcome
-            best_home_odds = 0
-            best_away_odds = 0
-            best_home_book = None
-            best_away_book = None
-            
-            for bookmaker, odds in match['odds'].items():
-                if odds['home'] > best_home_odds:
-                    best_home_odds = odds['home']
-                    best_home_book = bookmaker
-                
-                if odds['away'] > best_away_odds:
-                    best_away_odds = odds['away']
-                    best_away_book = bookmaker
-            
-            # Calculate arbitrage
-            if best_home_odds > 0 and best_away_odds > 0:
-                arbitrage_calc = self._calculate_arbitrage(
-                    best_home_odds, best_away_odds, 
-                    best_home_book, best_away_book,
-                    home_team, away_team, match_name
-                )
-                
-                if arbitrage_calc and arbitrage_calc.profit_percentage >= self.min_profit_percentage:
-                    opportunities.append(arbitrage_calc)
-                    print(f"   ✅ Arbitrage found: {arbitrage_calc.profit_percentage:.2f}% profit")
-                else:
-                    print(f"   ❌ No arbitrage: {self._get_arbitrage_percentage(best_home_odds, best_away_odds):.2f}%")
+            arbitrage_calc = self._match_arbitrage(match, verbose=True)
+            if arbitrage_calc:
+                opportunities.append(arbitrage_calc)
         
         return opportunities
     
+    def _match_arbitrage(self, match: Dict, verbose: bool = False) -> Optional[BettingOpportunity]:
+        """Best-price arbitrage for one match, if it clears min_profit_percentage"""
+        home_team = match['home_team']
+        away_team = match['away_team']
+        match_name = f"{home_team} vs {away_team}"
+        
+        # Get best odds for each outcome
+        best_home_odds = 0
+        best_away_odds = 0
+        best_home_book = None
+        best_away_book = None
+        
+        for bookmaker, odds in match['odds'].items():
+            if odds['home'] > best_home_odds:
+                best_home_odds = odds['home']
+                best_home_book = bookmaker
+            
+            if odds['away'] > best_away_odds:
+                best_away_odds = odds['away']
+                best_away_book = bookmaker
+        
+        if best_home_odds <= 0 or best_away_odds <= 0:
+            return None
+        
+        # Calculate arbitrage
+        arbitrage_calc = self._calculate_arbitrage(
+            best_home_odds, best_away_odds, 
+            best_home_book, best_away_book,
+            home_team, away_team, match_name
+        )
+        
+        if arbitrage_calc and arbitrage_calc.profit_percentage >= self.min_profit_percentage:
+            if verbose:
+                print(f"   ✅ Arbitrage found: {arbitrage_calc.profit_percentage:.2f}% profit")
+            return arbitrage_calc
+        
+        if verbose:
+            print(f"   ❌ No arbitrage: {self._get_arbitrage_percentage(best_home_odds, best_away_odds):.2f}%")
+        return None
+    
     def calculate_value_bets(self, matches: List[Dict]) -> List[BettingOpportunity]:
         """Find value betting opportunities by comparing odds across bookmakers"""
         opportunities = []
@@ -124,37 +214,124 @@ class AFLOpportunityFinder:
             
             print(f"\n📊 Analyzing: {match_name}")
             
-            # Calculate fair odds by averaging implied probabilities
-            fair_home_prob, fair_away_prob = self._calculate_fair_probabilities(match['odds'])
-            fair_home_odds = 1 / fair_home_prob if fair_home_prob > 0 else 0
-            fair_away_odds = 1 / fair_away_prob if fair_away_prob > 0 else 0
-            
-            # Find value bets
-            for bookmaker, odds in match['odds'].items():
-                # Check home team value
-                if odds['home'] > fair_home_odds * 1.05:  # 5% edge minimum
-                    value_percentage = ((odds['home'] / fair_home_odds) - 1) * 100
-                    if value_percentage >= self.min_profit_percentage:
-                        value_bet = self._create_value_bet(
-                            match_name, home_team, away_team, 'home',
-                            odds['home'], bookmaker, value_percentage
-                        )
-                        opportunities.append(value_bet)
+            opportunities.extend(self._match_value_bets(match, verbose=True))
+        
+        return opportunities
+    
+    def _match_value_bets(self, match: Dict, verbose: bool = False,
+                          fair_probabilities: Optional[Tuple[float, float]] = None) -> List[BettingOpportunity]:
+        """Value bets for one match against its averaged fair odds (pass fair_probabilities if already known)"""
+        home_team = match['home_team']
+        away_team = match['away_team']
+        match_name = f"{home_team} vs {away_team}"
+        value_bets = []
+        
+        # Calculate fair odds by averaging implied probabilities
+        fair_home_prob, fair_away_prob = fair_probabilities or self._calculate_fair_probabilities(match['odds'])
+        fair_home_odds = 1 / fair_home_prob if fair_home_prob > 0 else 0
+        fair_away_odds = 1 / fair_away_prob if fair_away_prob > 0 else 0
+        edge_factor = 1 + self.min_value_edge / 100
+        
+        # Find value bets (no fair odds when no book prices both sides above 0, e.g. one book suspended a side)
+        for bookmaker, odds in match['odds'].items():
+            # Check home team value
+            if fair_home_odds > 0 and odds['home'] > fair_home_odds * edge_factor:
+                value_percentage = ((odds['home'] / fair_home_odds) - 1) * 100
+                if value_percentage >= self.min_profit_percentage:
+                    value_bet = self._create_value_bet(
+                        match_name, home_team, away_team, 'home',
+                        odds['home'], bookmaker, value_percentage
+                    )
+                    value_bets.append(value_bet)
+                    if verbose:
                         print(f"   ✅ Value bet: {home_team} @ {odds['home']:.2f} ({value_percentage:.1f}% edge)")
-                
-                # Check away team value
-                if odds['away'] > fair_away_odds * 1.05:  # 5% edge minimum
-                    value_percentage = ((odds['away'] / fair_away_odds) - 1) * 100
-                    if value_percentage >= self.min_profit_percentage:
-                        value_bet = self._create_value_bet(
-                            match_name, home_team, away_team, 'away',
-                            odds['away'], bookmaker, value_percentage
-                        )
-                        opportunities.append(value_bet)
+            
+            # Check away team value
+            if fair_away_odds > 0 and odds['away'] > fair_away_odds * edge_factor:
+                value_percentage = ((odds['away'] / fair_away_odds) - 1) * 100
+                if value_percentage >= self.min_profit_percentage:
+                    value_bet = self._create_value_bet(
+                        match_name, home_team, away_team, 'away',
+                        odds['away'], bookmaker, value_percentage
+                    )
+                    value_bets.append(value_bet)
+                    if verbose:
                         print(f"   ✅ Value bet: {away_team} @ {odds['away']:.2f} ({value_percentage:.1f}% edge)")
         
+        return value_bets
+    
+    def iter_opportunities(self, matches: Iterable[Dict]) -> Iterator[BettingOpportunity]:
+        """Yield each match's arbitrage and value bets as soon as that match is evaluated"""
+        for match in matches:
+            arbitrage_calc = self._match_arbitrage(match)
+            if arbitrage_calc:
+                yield arbitrage_calc
+            yield from self._match_value_bets(match)
+    
+    def calculate_opportunities_columnar(self, matches: List[Dict],
+                                         matrix: Optional[OddsMatrix] = None) -> List[BettingOpportunity]:
+        """
+        Arbitrage then value bets for every match from one OddsMatrix scan; the same opportunities, in the
+        same order, as calculate_arbitrage_opportunities followed by calculate_value_bets
+        """
+        matrix = matrix or OddsMatrix(matches)
+        opportunities = []
+        
+        for row in matrix.arbitrage_rows(self.min_profit_percentage):
+            match = matches[row.match_index]
+            opportunities.append(self._calculate_arbitrage(
+                row.home_odds, row.away_odds,
+                row.home_book, row.away_book,
+                match['home_team'], match['away_team'], f"{match['home_team']} vs {match['away_team']}"
+            ))
+        
+        for edge in matrix.value_edges(self.min_value_edge, self.min_profit_percentage):
+            match = matches[edge.match_index]
+            opportunities.append(self._create_value_bet(
+                f"{match['home_team']} vs {match['away_team']}", match['home_team'], match['away_team'],
+                edge.side, edge.odds, edge.bookmaker, edge.value_percentage
+            ))
+        
+        print(f"\n🔍 Scanned {matrix.n_matches} matches x {matrix.n_books} bookmakers: "
+              f"{len(opportunities)} opportunities")
+        return opportunities
+    
+    def calculate_opportunities_from_book(self, book: MarketBook,
+                                          keys: Optional[Iterable[Hashable]] = None) -> List[BettingOpportunity]:
+        """Find arbitrage and value bets from a MarketBook's maintained best prices (only for `keys` if given)"""
+        if keys is None:
+            keys = book.keys()
+            arbitrage_keys = book.arbitrage_keys()
+        else:
+            keys = [key for key in dict.fromkeys(keys) if key in book.matches]
+            arbitrage_keys = [key for key in keys if book.overround(key) is not None and book.overround(key) < 1]
+        
+        opportunities = [opp for opp in map(lambda key: self._book_arbitrage(book, key), arbitrage_keys) if opp]
+        
+        # Value bets compare every book with the match's fair odds, so they still walk the match's quotes
+        for key in keys:
+            opportunities.extend(self._match_value_bets(book.as_match(key)))
+        
         return opportunities
     
+    def _book_arbitrage(self, book: MarketBook, key: Hashable) -> Optional[BettingOpportunity]:
+        """Best-price arbitrage for one MarketBook match, if it clears min_profit_percentage"""
+        overround = book.overround(key)
+        if overround is None or overround >= 1:
+            return None
+        
+        match = book.matches[key]
+        best_home_odds, best_home_book = book.best(key, 'home')
+        best_away_odds, best_away_book = book.best(key, 'away')
+        arbitrage_calc = self._calculate_arbitrage(
+            best_home_odds, best_away_odds,
+            best_home_book, best_away_book,
+            match['home_team'], match['away_team'], f"{match['home_team']} vs {match['away_team']}"
+        )
+        if arbitrage_calc and arbitrage_calc.profit_percentage >= self.min_profit_percentage:
+            return arbitrage_calc
+        return None
+    
     def _calculate_arbitrage(self, home_odds: float, away_odds: float, 
                            home_book: str, away_book: str,
                            home_team: str, away_team: str, match_name: str) -> Optional[BettingOpportunity]:
@@ -300,21 +477,24 @@ class AFLOpportunityFinder:
         
         all_opportunities = []
         
-        # Find arbitrage opportunities
-        arbitrage_opps = self.calculate_arbitrage_opportunities(matches)
-        all_opportunities.extend(arbitrage_opps)
-        
-        # Find value betting opportunities
-        value_opps = self.calculate_value_bets(matches)
-        all_opportunities.extend(value_opps)
+        if self.columnar:
+            all_opportunities.extend(self.calculate_opportunities_columnar(matches))
+        else:
+            # Find arbitrage opportunities
+            arbitrage_opps = self.calculate_arbitrage_opportunities(matches)
+            all_opportunities.extend(arbitrage_opps)
+            
+            # Find value betting opportunities
+            value_opps = self.calculate_value_bets(matches)
+            all_opportunities.extend(value_opps)
         
         # Sort by profit potential
         all_opportunities.sort(key=lambda x: x.roi, reverse=True)
         
         return all_opportunities
     
-    def display_opportunities(self, opportunities: List[BettingOpportunity]):
-        """Display all opportunities in a readable format"""
+    def display_opportunities(self, opportunities: List[BettingOpportunity], totals: Optional[Dict] = None):
+        """Display opportunities in a readable format (totals: counts/profit over all found, when only the top few are shown)"""
         
         if not opportunities:
             print("\n" + "="*70)
@@ -323,20 +503,34 @@ class AFLOpportunityFinder:
             print("All current odds appear to be efficiently priced.")
             return
         
+        if totals is None:
+            totals = self._totals(opportunities)
+        
         print("\n" + "="*70)
-        print(f"🎯 FOUND {len(opportunities)} PROFITABLE OPPORTUNITIES")
+        if totals['count'] > len(opportunities):
+            print(f"🎯 FOUND {totals['count']} PROFITABLE OPPORTUNITIES (showing the top {len(opportunities)})")
+        else:
+            print(f"🎯 FOUND {totals['count']} PROFITABLE OPPORTUNITIES")
         print("="*70)
         
-        arbitrage_count = sum(1 for opp in opportunities if opp.opportunity_type == 'arbitrage')
-        value_count = sum(1 for opp in opportunities if opp.opportunity_type == 'value_bet')
-        
-        print(f"🔄 Arbitrage Opportunities: {arbitrage_count}")
-        print(f"💎 Value Betting Opportunities: {value_count}")
-        print(f"💰 Total Potential Profit: ${sum(opp.guaranteed_profit for opp in opportunities):.2f}")
+        print(f"🔄 Arbitrage Opportunities: {totals['arbitrage']}")
+        print(f"💎 Value Betting Opportunities: {totals['value_bet']}")
+        print(f"💰 Total Potential Profit: ${totals['profit']:.2f}")
         
         for i, opp in enumerate(opportunities, 1):
             self._display_single_opportunity(i, opp)
     
+    @staticmethod
+    def _totals(opportunities: Iterable[BettingOpportunity], totals: Optional[Dict] = None) -> Dict:
+        """Add opportunities to running count / per-type / potential profit totals"""
+        totals = totals or {'count': 0, 'arbitrage': 0, 'value_bet': 0, 'profit': 0.0}
+        for opp in opportunities:
+            totals['count'] += 1
+            if opp.opportunity_type in ('arbitrage', 'value_bet'):
+                totals[opp.opportunity_type] += 1
+            totals['profit'] += opp.guaranteed_profit
+        return totals
+    
     def _display_single_opportunity(self, index: int, opp: BettingOpportunity):
         """Display a single opportunity"""
         icon = "🔄" if opp.opportunity_type == 'arbitrage' else "💎"
@@ -370,19 +564,7 @@ class AFLOpportunityFinder:
             filename = f"afl_betting_opportunities_{timestamp}.json"
         
         # Convert dataclasses to dict for JSON serialization
-        opportunities_data = []
-        for opp in opportunities:
-            opportunities_data.append({
-                'match': opp.match,
-                'home_team': opp.home_team,
-                'away_team': opp.away_team,
-                'opportunity_type': opp.opportunity_type,
-                'profit_percentage': opp.profit_percentage,
-                'stake_distribution': opp.stake_distribution,
-                'total_stake': opp.total_stake,
-                'guaranteed_profit': opp.guaranteed_profit,
-                'roi': opp.roi
-            })
+        opportunities_data = [asdict(opp) for opp in opportunities]
         
         with open(filename, 'w') as f:
             json.dump({
@@ -416,6 +598,49 @@ class AFLOpportunityFinder:
             self.save_opportunities(opportunities)
         
         return opportunities
+    
+    def run_streaming_analysis(self, odds_file: str = None, top_k: int = 10,
+                               output_file: str = None) -> List[BettingOpportunity]:
+        """Alert and append each opportunity to a JSONL file as it's found, then show the top-K by ROI"""
+        print("🎯 AFL BETTING OPPORTUNITY FINDER (streaming)")
+        print("=" * 50)
+        print(f"💰 Bankroll: ${self.bankroll:,.2f}")
+        print(f"📊 Min Profit: {self.min_profit_percentage}%")
+        print(f"🎲 Max Stake per Opportunity: ${self.max_stake_per_opportunity:,.2f}")
+        
+        matches = self.load_odds_from_file(odds_file)
+        if not matches:
+            return []
+        
+        top = TopOpportunities(top_k)
+        totals = self._totals([])
+        start = time.perf_counter()
+        first_alert = None
+        
+        with JsonlOpportunitySink(output_file) as sink:
+            for opp in self.iter_opportunities(matches):
+                if first_alert is None:
+                    first_alert = time.perf_counter() - start
+                
+                icon = "🔄" if opp.opportunity_type == 'arbitrage' else "💎"
+                print(f"{icon} {opp.match}: {opp.profit_percentage:.2f}% "
+                      f"(ROI {opp.roi:.1f}%, stake ${opp.total_stake})")
+                sink.write(opp)
+                top.push(opp)
+                self._totals([opp], totals)
+        
+        elapsed = time.perf_counter() - start
+        if first_alert is not None:
+            print(f"\n⏱️  First alert after {first_alert * 1000:.1f}ms, "
+                  f"{top.seen} opportunities in {elapsed * 1000:.1f}ms")
+            print(f"💾 Opportunities streamed to: {sink.filename}")
+        
+        # Sorted view of the best few only; the full list lives in the JSONL file
+        best = top.sorted()
+        if best:
+            print(f"\n🏆 Top {len(best)} of {top.seen} by ROI")
+        self.display_opportunities(best, totals)
+        return best
 
 # Main execution
 def main():
@@ -429,15 +654,26 @@ def main():
     # Optional: specify exact odds file, or leave None to auto-detect latest
     ODDS_FILE = None  # "afl_odds_selenium_20250608_150026.json" or None for auto-detect
     
+    # Stream alerts as each match is evaluated and only keep the best few sorted
+    STREAMING = True
+    TOP_K = 10
+    
+    # Non-streaming runs: scan every match in one numpy pass (pays off from ~50 matches; needs numpy)
+    COLUMNAR = False
+    
     # Initialize the opportunity finder
     finder = AFLOpportunityFinder(
         bankroll=BANKROLL,
         min_profit_percentage=MIN_PROFIT_PERCENTAGE,
-        max_stake_percentage=MAX_STAKE_PERCENTAGE
+        max_stake_percentage=MAX_STAKE_PERCENTAGE,
+        columnar=COLUMNAR
     )
     
     # Run the analysis
-    opportunities = finder.run_analysis(ODDS_FILE)
+    if STREAMING:
+        opportunities = finder.run_streaming_analysis(ODDS_FILE, top_k=TOP_K)
+    else:
+        opportunities = finder.run_analysis(ODDS_FILE)
     
     return opportunities
 
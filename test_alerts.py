@@ -0,0 +1,69 @@
+"""
+Tests for opportunity alert deduplication and hysteresis
+"""
+
+from afl_alerts import OpportunityTracker, coalesce
+from main_hedge_analysis import BettingOpportunity
+
+def arbitrage(profit, match='Carlton vs Collingwood'):
+    return BettingOpportunity(
+        match=match, home_team='Carlton', away_team='Collingwood', opportunity_type='arbitrage',
+        profit_percentage=profit,
+        stake_distribution={'sportsbet': {'team': 'Carlton', 'amount': 50, 'odds': 2.1},
+                            'ladbrokes': {'team': 'Collingwood', 'amount': 50, 'odds': 2.1}},
+        total_stake=100, guaranteed_profit=profit, roi=profit)
+
+def value_bet(edge, book, match='Carlton vs Collingwood'):
+    return BettingOpportunity(
+        match=match, home_team='Carlton', away_team='Collingwood', opportunity_type='value_bet',
+        profit_percentage=edge, stake_distribution={book: {'team': 'Carlton', 'amount': 10, 'odds': 2.5}},
+        total_stake=10, guaranteed_profit=0, roi=edge)
+
+def kinds(alerts):
+    return [alert.kind for alert in alerts]
+
+def test_opens_after_min_lifetime_and_closes_once():
+    tracker = OpportunityTracker(min_lifetime=10)
+    assert tracker.observe([arbitrage(2.0)], now=0) == []
+    assert kinds(tracker.observe([arbitrage(2.0)], now=10)) == ['opened']
+    assert tracker.observe([arbitrage(2.1)], now=11) == []
+    assert kinds(tracker.observe([], now=12)) == ['closed']
+    assert tracker.report()['opened'] == 1
+
+def test_flicker_is_suppressed():
+    tracker = OpportunityTracker(min_lifetime=10)
+    tracker.observe([arbitrage(2.0)], now=0)
+    assert tracker.observe([], now=5) == []
+    assert tracker.suppressed == 1
+
+def test_not_announced_while_below_enter_threshold():
+    tracker = OpportunityTracker(enter_threshold=1.0, exit_threshold=0.5, min_lifetime=10)
+    tracker.observe([arbitrage(1.2)], now=0)
+    # Still tracked in the band, but it doesn't meet the enter bar when its lifetime is up
+    assert tracker.observe([arbitrage(0.8)], now=10) == []
+    assert kinds(tracker.observe([arbitrage(1.1)], now=11)) == ['opened']
+
+def test_stays_open_inside_band_and_updates_on_step():
+    tracker = OpportunityTracker(enter_threshold=1.0, exit_threshold=0.5, min_lifetime=0, update_step=0.25)
+    assert kinds(tracker.observe([arbitrage(1.0)], now=0)) == ['opened']
+    assert kinds(tracker.observe([arbitrage(0.6)], now=1)) == ['updated']
+    assert tracker.observe([arbitrage(0.55)], now=2) == []
+    assert kinds(tracker.observe([arbitrage(0.4)], now=3)) == ['closed']
+
+def test_value_bets_at_the_same_edge_coalesce():
+    groups = coalesce([value_bet(6.0, 'sportsbet'), value_bet(6.05, 'ladbrokes'), value_bet(5.0, 'pointsbet')])
+    assert sorted(books for _, books in groups) == [('ladbrokes', 'sportsbet'), ('pointsbet',)]
+
+def test_book_joining_group_keeps_the_same_alert():
+    tracker = OpportunityTracker(min_lifetime=0)
+    assert kinds(tracker.observe([value_bet(6.0, 'sportsbet')], now=0)) == ['opened']
+    alerts = tracker.observe([value_bet(6.0, 'sportsbet'), value_bet(6.0, 'ladbrokes')], now=1)
+    assert kinds(alerts) == ['updated']
+    assert alerts[0].books == ('ladbrokes', 'sportsbet')
+    assert alerts[0].first_seen == 0
+
+def test_partial_scope_leaves_other_matches_open():
+    tracker = OpportunityTracker(min_lifetime=0)
+    tracker.observe([arbitrage(2.0), arbitrage(2.0, match='Geelong vs Hawthorn')], now=0)
+    assert tracker.observe([arbitrage(2.0)], now=1, matches=['Carlton vs Collingwood']) == []
+    assert len(tracker.active()) == 2
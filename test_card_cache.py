@@ -0,0 +1,63 @@
+"""
+Tests for the parsed event-card cache
+"""
+
+from afl_card_cache import CardCache
+
+class CountingParser:
+    """Parses '<home>|<away>|<price>' cards and remembers which cards it was asked for"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def __call__(self, cards):
+        self.calls.append(list(cards))
+        return [[{'home_team': card.split('|')[0], 'away_team': card.split('|')[1],
+                  'home_odds': float(card.split('|')[2])}] for card in cards]
+
+CARDS = ['Carlton|Essendon|1.4', 'Hawthorn|Adelaide Crows|1.9']
+
+def test_unchanged_cards_are_not_reparsed():
+    cache, parser = CardCache(), CountingParser()
+    first = cache.parse('sportsbet', CARDS, parser)
+    second = cache.parse('sportsbet', CARDS, parser)
+    assert first == second
+    assert parser.calls == [CARDS]
+    assert cache.report()['sportsbet'] == {'hits': 2, 'misses': 2, 'evictions': 0, 'hit_rate': 0.5, 'cached': 2}
+
+def test_changed_card_html_is_reparsed_alone():
+    cache, parser = CardCache(), CountingParser()
+    cache.parse('sportsbet', CARDS, parser)
+    repriced = ['Carlton|Essendon|1.45', CARDS[1]]
+    records = cache.parse('sportsbet', repriced, parser)
+    assert parser.calls[-1] == ['Carlton|Essendon|1.45']
+    assert [record['home_odds'] for record in records] == [1.45, 1.9]
+
+def test_bookmakers_are_cached_separately():
+    cache, parser = CardCache(), CountingParser()
+    cache.parse('sportsbet', CARDS, parser)
+    cache.parse('ladbrokes', CARDS, parser)
+    assert len(parser.calls) == 2
+
+def test_returned_records_are_copies():
+    cache, parser = CardCache(), CountingParser()
+    cache.parse('sportsbet', CARDS, parser)[0]['home_odds'] = 99.0
+    assert cache.parse('sportsbet', CARDS, parser)[0]['home_odds'] == 1.4
+
+def test_least_recently_seen_cards_are_evicted():
+    cache, parser = CardCache(max_entries=2), CountingParser()
+    cache.parse('sportsbet', CARDS, parser)
+    cache.parse('sportsbet', [CARDS[0], 'Geelong|Richmond|2.2'], parser)
+    assert cache.report()['sportsbet']['evictions'] == 1
+    # The Hawthorn card went; the Carlton card was seen again and stayed
+    cache.parse('sportsbet', CARDS, parser)
+    assert parser.calls[-1] == [CARDS[1]]
+
+def test_clear_forgets_a_bookmaker():
+    cache, parser = CardCache(), CountingParser()
+    cache.parse('sportsbet', CARDS, parser)
+    cache.parse('ladbrokes', CARDS, parser)
+    cache.clear('sportsbet')
+    cache.parse('sportsbet', CARDS, parser)
+    cache.parse('ladbrokes', CARDS, parser)
+    assert parser.calls == [CARDS, CARDS, CARDS]
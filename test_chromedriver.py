@@ -12,7 +12,8 @@ def test_chromedriver_setup():
         from selenium import webdriver
         from selenium.webdriver.chrome.options import Options
         from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
+        from afl_driver_cache import DriverCache
+        import time
         
         print("✓ All packages imported successfully")
         
@@ -24,15 +25,19 @@ def test_chromedriver_setup():
         
         print("✓ Chrome options configured")
         
-        # Try to get ChromeDriver automatically
-        print("Downloading/updating ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        print("✓ ChromeDriver downloaded successfully")
+        # Look up ChromeDriver locally; only downloads when the installed Chrome version changed
+        print("Resolving ChromeDriver...")
+        driver_cache = DriverCache()
+        service = Service(driver_cache.resolve())
+        resolution = driver_cache.last_resolution
+        print(f"✓ ChromeDriver resolved from {resolution['source']} in {resolution['seconds']:.2f}s "
+              f"(Chrome {resolution['chrome_version'] or 'version unknown'})")
         
         # Try to start the driver
         print("Starting Chrome driver...")
+        launch_start = time.perf_counter()
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        print("✓ Chrome driver started successfully")
+        print(f"✓ Chrome driver started successfully in {time.perf_counter() - launch_start:.2f}s")
         
         # Test basic functionality
         print("Testing basic functionality...")
@@ -59,7 +64,7 @@ def test_chromedriver_setup():
         print("\nTroubleshooting tips:")
         print("1. Make sure Google Chrome browser is installed")
         print("2. Remove old chromedriver: sudo rm /usr/local/bin/chromedriver")
-        print("3. Clear cache: rm -rf ~/.wdm")
+        print("3. Clear cache: rm -rf ~/.wdm ~/.afl_chromedriver.json")
         return False
 
 def check_system_info():
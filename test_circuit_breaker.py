@@ -0,0 +1,60 @@
+"""
+Tests for the per-bookmaker circuit breakers
+"""
+
+import contextlib
+import io
+
+from afl_circuit_breaker import CircuitBreaker, CircuitBreakers
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, base_backoff=60)
+    assert breaker.record_failure('timeout', now=0) is False
+    assert breaker.allow(now=1)
+    assert breaker.record_failure('timeout', now=1) is True
+    assert breaker.state == 'open' and breaker.open_until == 61
+    assert not breaker.allow(now=60)
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure('no odds', now=0)
+    breaker.record_success()
+    assert breaker.record_failure('no odds', now=1) is False
+    assert breaker.state == 'closed'
+
+def test_half_open_trial_failure_reopens_with_doubled_backoff():
+    breaker = CircuitBreaker(failure_threshold=2, base_backoff=60, max_backoff=200)
+    breaker.record_failure('timeout', now=0)
+    breaker.record_failure('timeout', now=0)
+    
+    assert breaker.allow(now=60)
+    assert breaker.state == 'half_open'
+    assert breaker.record_failure('timeout', now=60) is True
+    assert breaker.open_until == 180
+    
+    breaker.allow(now=180)
+    breaker.record_failure('timeout', now=180)
+    # 240s capped at max_backoff
+    assert breaker.open_until == 380
+
+def test_half_open_trial_success_closes():
+    breaker = CircuitBreaker(failure_threshold=1, base_backoff=60)
+    breaker.record_failure('error', now=0)
+    breaker.allow(now=60)
+    breaker.record_success()
+    assert (breaker.state, breaker.trips, breaker.backoff()) == ('closed', 0, 60)
+
+def test_breakers_are_per_bookmaker():
+    breakers = CircuitBreakers(failure_threshold=1, base_backoff=600)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        breakers.record_failure('ladbrokes', 'missed deadline')
+        breakers.record_success('sportsbet')
+    assert 'ladbrokes circuit opened' in output.getvalue()
+    assert not breakers.allow('ladbrokes')
+    assert breakers.allow('sportsbet')
+    assert breakers.allow('pointsbet')
+    
+    report = breakers.report()
+    assert report['ladbrokes']['state'] == 'open' and 0 < report['ladbrokes']['retry_in'] <= 600
+    assert report['ladbrokes']['last_error'] == 'missed deadline'
+    assert (report['sportsbet']['state'], report['sportsbet']['successes']) == ('closed', 1)
@@ -0,0 +1,122 @@
+"""
+Tests for the warm browser session pool, with stub drivers in place of Chrome
+"""
+
+import contextlib
+import io
+import threading
+
+import pytest
+
+from afl_driver_pool import DriverPool
+
+class FakeDriver:
+    """Answers the pool's health check until it is marked crashed"""
+    
+    def __init__(self):
+        self.crashed = False
+        self.quit_called = False
+        self.window_handles = ['main']
+        self.current_window_handle = 'main'
+    
+    def execute_script(self, script):
+        if self.crashed:
+            raise RuntimeError("chrome not reachable")
+        return 1
+    
+    def quit(self):
+        self.quit_called = True
+
+def quiet_pool(create_driver=FakeDriver, **kwargs):
+    pool = DriverPool(create_driver, **kwargs)
+    output = io.StringIO()
+    return pool, contextlib.redirect_stdout(output)
+
+def test_released_session_is_reused():
+    pool, quiet = quiet_pool(size=1)
+    with quiet:
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+    assert pool.stats['created'] == 1
+
+def test_size_bound_and_timeout():
+    pool, quiet = quiet_pool(size=1)
+    with quiet:
+        session = pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+        
+        # A waiter gets the session as soon as it comes back
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+        waiter.start()
+        pool.release(session)
+        waiter.join(5)
+    assert got == [session]
+    assert pool.stats['created'] == 1
+
+def test_cold_pool_launches_browsers_concurrently():
+    # Each launch waits for the other: launches serialised under the pool lock would break the barrier
+    both_started = threading.Barrier(2, timeout=5)
+    
+    def create_driver():
+        both_started.wait()
+        return FakeDriver()
+    
+    pool, quiet = quiet_pool(create_driver, size=2)
+    sessions = []
+    with quiet:
+        threads = [threading.Thread(target=lambda: sessions.append(pool.acquire(timeout=5))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    assert len({session.session_id for session in sessions}) == 2
+
+def test_failed_launch_frees_its_slot():
+    attempts = []
+    
+    def create_driver():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("chromedriver crashed")
+        return FakeDriver()
+    
+    pool, quiet = quiet_pool(create_driver, size=1)
+    with quiet:
+        with pytest.raises(RuntimeError):
+            pool.acquire(timeout=0.05)
+        session = pool.acquire(timeout=0.05)
+    assert session.session_id == 1
+    assert pool.stats['created'] == 1
+
+def test_failed_health_check_recycles_the_session():
+    pool, quiet = quiet_pool(size=1)
+    with quiet:
+        session = pool.acquire()
+        session.driver.crashed = True
+        pool.release(session)
+        replacement = pool.acquire(timeout=0.05)
+    assert session.driver.quit_called
+    assert replacement is not session and replacement.session_id == 2
+    assert (pool.stats['health_failures'], pool.stats['recycled'], pool.stats['created']) == (1, 1, 2)
+
+def test_close_wakes_waiters():
+    pool, quiet = quiet_pool(size=1)
+    errors = []
+    
+    def wait_for_session():
+        try:
+            pool.acquire(timeout=5)
+        except RuntimeError as e:
+            errors.append(e)
+    
+    with quiet:
+        session = pool.acquire()
+        waiter = threading.Thread(target=wait_for_session)
+        waiter.start()
+        pool.close()
+        waiter.join(5)
+    assert len(errors) == 1
+    assert session.driver.quit_called
@@ -0,0 +1,80 @@
+"""
+Tests for incremental opportunity re-evaluation on single price updates
+"""
+
+import pytest
+
+from afl_incremental import IncrementalEvaluator
+from afl_market_book import MarketBook
+from main_hedge_analysis import AFLOpportunityFinder
+
+MATCHES = [
+    {'home_team': 'Carlton', 'away_team': 'Essendon',
+     'odds': {'sportsbet': {'home': 1.4, 'away': 2.96}, 'ladbrokes': {'home': 1.44, 'away': 2.8}}},
+    {'home_team': 'Hawthorn', 'away_team': 'Adelaide Crows',
+     'odds': {'sportsbet': {'home': 1.9, 'away': 1.94}, 'ladbrokes': {'home': 1.85, 'away': 1.95}}},
+]
+
+@pytest.fixture
+def evaluator():
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=1.0, max_stake_percentage=25.0,
+                                  min_value_edge=5.0)
+    evaluator = IncrementalEvaluator(finder)
+    assert evaluator.load(MATCHES) == []
+    return evaluator
+
+def keys(evaluator):
+    return [evaluator.book.resolve(match['home_team'], match['away_team'])[0] for match in MATCHES]
+
+def summary(changes):
+    return [(change.kind, change.opportunity_id) for change in changes]
+
+def test_arbitrage_added_changed_removed(evaluator):
+    carlton, _ = keys(evaluator)
+    assert summary(evaluator.update(carlton, 'ladbrokes', 'home', 1.55)) == [('added', ('arbitrage',))]
+    assert summary(evaluator.update(carlton, 'ladbrokes', 'home', 1.57)) == [('changed', ('arbitrage',))]
+    removed = evaluator.update(carlton, 'ladbrokes', 'home', 1.44)
+    assert summary(removed) == [('removed', ('arbitrage',))]
+    assert removed[0].opportunity.stake_distribution['ladbrokes']['odds'] == 1.57
+    assert evaluator.opportunities() == []
+
+def test_update_only_touches_its_match(evaluator):
+    carlton, hawthorn = keys(evaluator)
+    evaluator.update(hawthorn, 'sportsbet', 'home', 2.15)
+    changes = evaluator.update(carlton, 'ladbrokes', 'away', 2.85)
+    assert changes == []
+    assert {opp.match for opp in evaluator.opportunities()} == {'Hawthorn vs Adelaide Crows'}
+
+def test_value_bet_is_keyed_by_book_and_side(evaluator):
+    _, hawthorn = keys(evaluator)
+    changes = evaluator.update(hawthorn, 'ladbrokes', 'away', 2.3)
+    assert ('added', ('value_bet', 'ladbrokes', 'away')) in summary(changes)
+
+def test_unchanged_price_is_not_reevaluated(evaluator):
+    carlton, _ = keys(evaluator)
+    fair = evaluator.fair[carlton]
+    assert evaluator.update(carlton, 'sportsbet', 'home', 1.4) == []
+    assert evaluator.fair[carlton] == fair
+    assert evaluator.report()['updates'] == 1
+
+def test_apply_streams_updates_in_order(evaluator):
+    carlton, _ = keys(evaluator)
+    changes = evaluator.apply([(carlton, 'ladbrokes', 'home', 1.55), (carlton, 'ladbrokes', 'home', None)])
+    assert summary(changes) == [('added', ('arbitrage',)), ('removed', ('arbitrage',))]
+    assert evaluator.report()['open'] == 0
+
+def test_suspended_price_on_a_single_book_match(evaluator):
+    carlton, _ = keys(evaluator)
+    evaluator.update(carlton, 'ladbrokes', 'home', None)
+    evaluator.update(carlton, 'ladbrokes', 'away', None)
+    # The only book left pricing both sides suspends one at 0: no fair odds, so no value bets either
+    assert evaluator.update(carlton, 'sportsbet', 'home', 0.0) == []
+    assert evaluator.fair[carlton] == (0, 0)
+    assert carlton not in evaluator.current
+
+def test_shares_a_book_that_starts_empty():
+    book = MarketBook()
+    evaluator = IncrementalEvaluator(AFLOpportunityFinder(bankroll=1000), book)
+    assert evaluator.book is book
+    book.load(MATCHES)
+    assert len(evaluator.book) == 2
@@ -0,0 +1,77 @@
+"""
+Tests for the in-play odds book against the fixtures/inplay_frames.jsonl frame log
+"""
+
+import contextlib
+import io
+import os
+from collections import Counter
+
+from bench_inplay import FIXTURE_DIR, load_frames, replay, seeded_watcher
+
+FRAMES = load_frames(os.path.join(FIXTURE_DIR, 'inplay_frames.jsonl'))
+
+def run_frames():
+    """Seeded watcher after every frame in the log, with the opportunities each frame raised"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        watcher = seeded_watcher()
+        raised = [watcher.handle_frame(frame['bookmaker'], frame['payload']) for frame in FRAMES]
+    return watcher, raised, output.getvalue()
+
+def prices(watcher, bookmaker, home, away):
+    record = watcher.records[bookmaker][watcher.scraper.teams.match_key(home, away)]
+    return record['home_odds'], record['away_odds']
+
+def test_frames_move_the_expected_prices():
+    watcher, _, _ = run_frames()
+    assert watcher.frames == len(FRAMES) == 10
+    # Handshakes, pings, heartbeats and the Line market apply nothing; a repeated price isn't a delta
+    assert watcher.updates == 7
+    assert prices(watcher, 'pointsbet', 'Carlton', 'Essendon') == (1.45, 2.9)
+    assert prices(watcher, 'sportsbet', 'Carlton', 'Essendon') == (1.4, 2.75)
+    assert prices(watcher, 'sportsbet', 'Hawthorn', 'Adelaide Crows') == (2.15, 1.94)
+    assert prices(watcher, 'sportsbet', 'Melbourne', 'Collingwood') == (4.1, 1.24)
+    assert prices(watcher, 'pointsbet', 'Melbourne', 'Collingwood') == (4.2, 1.26)
+
+def test_reversed_frame_prices_the_right_side():
+    watcher, _, _ = run_frames()
+    # Ladbrokes pushes Essendon v Carlton with Essendon as HOME at 19/10; the book lists Carlton at home
+    assert prices(watcher, 'ladbrokes', 'Carlton', 'Essendon') == (1.44, 2.9)
+    assert watcher.realigned_updates == Counter({'ladbrokes': 1})
+
+def test_arbitrage_opens_and_closes():
+    watcher, raised, output = run_frames()
+    opened = [(index, opp.match) for index, opps in enumerate(raised) for opp in opps]
+    assert opened == [(1, 'Carlton vs Essendon'), (7, 'Hawthorn vs Adelaide Crows')]
+    assert output.count('Arbitrage closed: Carlton vs Essendon') == 1
+    assert [opp.match for opp in watcher.active_arbitrage.values()] == ['Hawthorn vs Adelaide Crows']
+
+def test_market_book_tracks_the_frames():
+    watcher, _, _ = run_frames()
+    book, teams = watcher.book, watcher.scraper.teams
+    for bookmaker, records in watcher.records.items():
+        for key, record in records.items():
+            assert book.quotes[key][bookmaker] == {'home': record['home_odds'], 'away': record['away_odds']}
+    
+    carlton = teams.match_key('Carlton', 'Essendon')
+    assert book.best(carlton, 'home') == (1.45, 'pointsbet')
+    # Ladbrokes' realigned 2.9 ties PointsBet's and was listed first
+    assert book.best(carlton, 'away') == (2.9, 'ladbrokes')
+    assert book.best(teams.match_key('Melbourne', 'Collingwood'), 'home') == (4.2, 'pointsbet')
+    assert book.arbitrage_keys() == [teams.match_key('Hawthorn', 'Adelaide Crows')]
+    assert set(watcher.evaluator.current) == {teams.match_key('Hawthorn', 'Adelaide Crows')}
+
+def test_frames_leave_the_scraper_conflict_report_alone():
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        watcher = seeded_watcher()
+        watcher.scraper.orientation_conflicts = Counter({'pointsbet': 2})
+        for frame in FRAMES:
+            watcher.handle_frame(frame['bookmaker'], frame['payload'])
+    assert watcher.scraper.orientation_conflicts == Counter({'pointsbet': 2})
+
+def test_replay_report():
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = replay(FRAMES)
+    assert (report['frames'], report['updates'], report['alerts'], report['closed'], report['realigned']) == (10, 7, 2, 1, 1)
@@ -0,0 +1,52 @@
+"""
+Tests for kickoff parsing across the bookmakers' match_time formats
+"""
+
+from datetime import datetime
+
+from afl_kickoff import BOOKMAKER_TZ, authoritative_kickoff, format_kickoff, normalize_kickoffs, parse_kickoff
+
+# Thursday 12 June 2025, noon in Melbourne
+NOW = datetime(2025, 6, 12, 12, 0, tzinfo=BOOKMAKER_TZ).timestamp()
+
+def melbourne(month, day, hour, minute=0, year=2025):
+    return datetime(year, month, day, hour, minute, tzinfo=BOOKMAKER_TZ).timestamp()
+
+def test_iso_timestamps_are_exact():
+    assert parse_kickoff('2025-06-12T09:20:00Z', NOW) == (melbourne(6, 12, 19, 20), 0.0)
+    # No offset: the bookmakers' own time zone
+    assert parse_kickoff('2025-06-12T19:20:00', NOW) == (melbourne(6, 12, 19, 20), 0.0)
+
+def test_countdown_badges_keep_their_smallest_unit():
+    assert parse_kickoff('2h 10m', NOW) == (NOW + 7800, 60.0)
+    assert parse_kickoff('4 days', NOW) == (NOW + 4 * 86400, 86400.0)
+    assert parse_kickoff('45s', NOW) == (NOW + 45, 1.0)
+
+def test_day_and_clock_text():
+    assert parse_kickoff('Today, 7:20pm', NOW) == (melbourne(6, 12, 19, 20), 60.0)
+    assert parse_kickoff('Tomorrow, 1:45pm', NOW) == (melbourne(6, 13, 13, 45), 60.0)
+    assert parse_kickoff('Sat, 4:35pm', NOW) == (melbourne(6, 14, 16, 35), 60.0)
+    assert parse_kickoff('Sat 14 Jun, 7:15pm', NOW) == (melbourne(6, 14, 19, 15), 60.0)
+    assert parse_kickoff('7pm', NOW) == (melbourne(6, 12, 19), 60.0)
+
+def test_date_without_year_takes_the_nearest_year():
+    new_year = datetime(2025, 12, 30, 12, 0, tzinfo=BOOKMAKER_TZ).timestamp()
+    assert parse_kickoff('Fri 2 Jan, 7:40pm', new_year) == (melbourne(1, 2, 19, 40, year=2026), 60.0)
+
+def test_no_kickoff():
+    for text in (None, '', 'LIVE', 'In Play', 'Round 14', 'Someday, 7:20pm'):
+        assert parse_kickoff(text, NOW) is None
+
+def test_exact_timestamp_is_authoritative():
+    records = normalize_kickoffs([
+        {'bookmaker': 'ladbrokes', 'match_time': '7h 20m'},
+        {'bookmaker': 'sportsbet', 'match_time': '2025-06-12T09:20:00Z'},
+        {'bookmaker': 'pointsbet', 'match_time': 'LIVE'},
+    ], observed_at=NOW)
+    assert records[2]['kickoff_ts'] is None and records[2]['kickoff_resolution'] is None
+    assert authoritative_kickoff(records)['bookmaker'] == 'sportsbet'
+    assert authoritative_kickoff(records[2:]) is None
+
+def test_format_kickoff():
+    assert format_kickoff(melbourne(6, 12, 19, 20)) == '2025-06-12T19:20:00+10:00'
+    assert format_kickoff(None) is None
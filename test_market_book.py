@@ -0,0 +1,74 @@
+"""
+Tests for the sorted best-price market book
+"""
+
+import pytest
+
+from afl_market_book import MarketBook
+
+def match(home, away, **odds):
+    return {'home_team': home, 'away_team': away,
+            'odds': {book: {'home': home_odds, 'away': away_odds} for book, (home_odds, away_odds) in odds.items()}}
+
+@pytest.fixture
+def book():
+    return MarketBook.from_matches([
+        match('Carlton', 'Essendon', sportsbet=(1.4, 2.96), ladbrokes=(1.44, 2.8), pointsbet=(1.42, 2.9)),
+        match('Hawthorn', 'Adelaide Crows', sportsbet=(1.9, 1.94), ladbrokes=(1.85, 1.95)),
+    ])
+
+def key_of(book, home, away):
+    return book.resolve(home, away)[0]
+
+def test_best_and_top(book):
+    key = key_of(book, 'Carlton', 'Essendon')
+    assert book.best(key, 'home') == (1.44, 'ladbrokes')
+    assert book.best(key, 'away') == (2.96, 'sportsbet')
+    assert book.top(key, 'away', 2) == [(2.96, 'sportsbet'), (2.9, 'pointsbet')]
+    assert book.overround(key) == pytest.approx(1 / 1.44 + 1 / 2.96)
+
+def test_first_listed_book_wins_price_ties(book):
+    key = key_of(book, 'Carlton', 'Essendon')
+    book.set_quote(key, 'pointsbet', 'away', 2.96)
+    assert book.best(key, 'away') == (2.96, 'sportsbet')
+
+def test_reversed_listing_lands_on_the_canonical_side(book):
+    key = book.update('pointsbet', 'Essendon', 'Carlton', 'home', 3.1)
+    assert key == key_of(book, 'Carlton', 'Essendon')
+    assert book.quotes[key]['pointsbet'] == {'home': 1.42, 'away': 3.1}
+    assert book.best(key, 'away') == (3.1, 'pointsbet')
+
+def test_unchanged_price_is_not_an_update(book):
+    key = key_of(book, 'Carlton', 'Essendon')
+    updates = book.updates
+    assert book.set_quote(key, 'sportsbet', 'home', 1.4) is False
+    assert book.updates == updates
+
+def test_arbitrage_keys_lowest_overround_first(book):
+    carlton = key_of(book, 'Carlton', 'Essendon')
+    hawthorn = key_of(book, 'Hawthorn', 'Adelaide Crows')
+    assert book.arbitrage_keys() == []
+    
+    book.set_quote(hawthorn, 'sportsbet', 'home', 2.15)
+    book.set_quote(carlton, 'pointsbet', 'home', 1.55)
+    assert book.arbitrage_keys() == [hawthorn, carlton]
+    assert book.arbitrage_keys(max_overround=0.98) == [hawthorn]
+
+def test_withdrawn_prices(book):
+    key = key_of(book, 'Carlton', 'Essendon')
+    book.set_quote(key, 'ladbrokes', 'home', None)
+    assert book.best(key, 'home') == (1.42, 'pointsbet')
+    # A book pricing one outcome isn't listed in the consolidated odds
+    assert set(book.odds(key)) == {'sportsbet', 'pointsbet'}
+    
+    book.remove_bookmaker(key, 'sportsbet')
+    book.remove_bookmaker(key, 'pointsbet')
+    assert book.best(key, 'home') is None
+    assert book.overround(key) is None
+    assert book.odds(key) == {}
+
+def test_non_positive_price_is_never_best(book):
+    key = key_of(book, 'Hawthorn', 'Adelaide Crows')
+    book.set_quote(key, 'sportsbet', 'home', 0)
+    assert book.best(key, 'home') == (1.85, 'ladbrokes')
+    assert book.quotes[key]['sportsbet']['home'] == 0
@@ -0,0 +1,51 @@
+"""
+Tests for the bookmaker feed decoders against the fixtures/*_feed.json bodies
+"""
+
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+from afl_selenium_scraper_NEW import AFLSeleniumScraper
+from bench_parsers import FIXTURE_DIR, feed_prices
+
+BOOKMAKERS = ['sportsbet', 'ladbrokes', 'pointsbet']
+
+def load_json(filename):
+    with open(os.path.join(FIXTURE_DIR, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@pytest.fixture(scope='module')
+def scraper():
+    return AFLSeleniumScraper(headless=True)
+
+@pytest.mark.parametrize('name', BOOKMAKERS)
+def test_feed_decodes_to_expected_records(scraper, name):
+    records = scraper.feed_capture.decode_responses(name, scraper.bookmakers[name], load_json(f"{name}_feed.json"))
+    assert records == load_json(f"{name}_feed_expected.json")
+
+@pytest.mark.parametrize('name', BOOKMAKERS)
+def test_feed_prices_match_html_parse(scraper, name):
+    records = scraper.feed_capture.decode_responses(name, scraper.bookmakers[name], load_json(f"{name}_feed.json"))
+    with open(os.path.join(FIXTURE_DIR, f"{name}_selenium_debug.html"), 'r', encoding='utf-8') as f:
+        page = f.read()
+    with contextlib.redirect_stdout(io.StringIO()):
+        html_records = scraper.parse_page(name, page)
+    assert html_records
+    assert feed_prices(records) == feed_prices(html_records)
+
+@pytest.mark.parametrize('name', BOOKMAKERS)
+def test_feed_urls_match_the_capture_pattern(scraper, name):
+    pattern = scraper.bookmakers[name]['selectors']['feed_url']
+    assert all(pattern.search(response['url']) for response in load_json(f"{name}_feed.json"))
+
+def test_only_head_to_head_markets_are_decoded(scraper):
+    payload = {'events': [{'homeTeam': 'Carlton', 'awayTeam': 'Essendon', 'startsAt': None,
+                           'fixedOddsMarkets': [{'eventClass': 'Line', 'outcomes': [
+                               {'name': 'Carlton -12.5', 'side': 'Home', 'price': 1.9},
+                               {'name': 'Essendon +12.5', 'side': 'Away', 'price': 1.9}]}]}]}
+    responses = [{'url': '', 'body': json.dumps(payload)}, {'url': '', 'body': 'not json'}]
+    assert scraper.feed_capture.decode_responses('pointsbet', scraper.bookmakers['pointsbet'], responses) == []
@@ -0,0 +1,58 @@
+"""
+Tests for the numpy OddsMatrix scan against the per-match dict scans
+"""
+
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from afl_odds_matrix import OddsMatrix
+from bench_analysis import synthetic_matches
+from main_hedge_analysis import AFLOpportunityFinder
+
+def dict_scan(finder, matches):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return finder.calculate_arbitrage_opportunities(matches) + finder.calculate_value_bets(matches)
+
+def columnar_scan(finder, matches):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return finder.calculate_opportunities_columnar(matches)
+
+@pytest.mark.parametrize('n_matches, n_books, noise, min_profit', [
+    (9, 3, 0.02, 1.0), (50, 5, 0.05, 0.0), (200, 20, 0.1, 1.0), (300, 30, 0.02, 1.0)
+])
+def test_same_opportunities_as_dict_scans(n_matches, n_books, noise, min_profit):
+    matches = synthetic_matches(n_matches, n_books, noise_level=noise)
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=min_profit, max_stake_percentage=25.0)
+    assert columnar_scan(finder, matches) == dict_scan(finder, matches)
+
+def test_ties_missing_and_zero_prices_follow_the_dict_scan():
+    matches = [
+        # Two books tie on the best home price: the first listed wins
+        {'home_team': 'Carlton', 'away_team': 'Collingwood', 'match_time': None,
+         'odds': {'ladbrokes': {'home': 2.2, 'away': 2.0}, 'sportsbet': {'home': 2.2, 'away': 1.9},
+                  'pointsbet': {'home': 1.8, 'away': 2.3}}},
+        # A zero price is never best and leaves the book out of the fair odds
+        {'home_team': 'Geelong', 'away_team': 'Hawthorn', 'match_time': None,
+         'odds': {'sportsbet': {'home': 0, 'away': 2.6}, 'pointsbet': {'home': 1.5, 'away': 2.5}}},
+        {'home_team': 'Sydney', 'away_team': 'Essendon', 'match_time': None, 'odds': {}},
+    ]
+    finder = AFLOpportunityFinder(bankroll=1000, min_profit_percentage=0.0, max_stake_percentage=25.0,
+                                  min_value_edge=1.0)
+    opportunities = columnar_scan(finder, matches)
+    assert opportunities == dict_scan(finder, matches)
+    arbitrage = [opp for opp in opportunities if opp.opportunity_type == 'arbitrage']
+    assert [sorted(opp.stake_distribution) for opp in arbitrage] == [['ladbrokes', 'pointsbet']]
+
+def test_matrix_layout():
+    matches = synthetic_matches(20, 6)
+    matrix = OddsMatrix(matches)
+    assert matrix.prices.shape == (2, matrix.n_slots, 20)
+    for m, match in enumerate(matches):
+        for slot, (bookmaker, odds) in enumerate(match['odds'].items()):
+            assert matrix.quote_books[matrix.offsets[m] + slot] == bookmaker
+            assert matrix.prices[0, slot, m] == odds['home']
+            assert matrix.prices[1, slot, m] == odds['away']
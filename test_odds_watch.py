@@ -0,0 +1,77 @@
+"""
+Tests for the odds watcher's handling of empty bookmaker reads
+"""
+
+import time
+from types import SimpleNamespace
+
+from afl_odds_watch import OddsWatcher
+from afl_teams import TeamRegistry
+
+def record(home, away, home_odds, away_odds, kickoff_ts):
+    return {'home_team': home, 'away_team': away, 'home_odds': home_odds, 'away_odds': away_odds,
+            'match_time': None, 'kickoff_ts': kickoff_ts}
+
+class FakeScraper:
+    """Serves queued event-card reads for one bookmaker"""
+
+    def __init__(self, reads):
+        self.bookmakers = {'sportsbet': {'url': 'https://example.invalid'}}
+        self.teams = TeamRegistry()
+        self.driver_pool = SimpleNamespace(open_tab=lambda session, name: None)
+        self.reads = list(reads)
+
+    def read_event_cards(self, name, config, driver):
+        return self.reads.pop(0)
+
+class LoadedWatcher(OddsWatcher):
+    """Counts page reloads instead of navigating a browser"""
+
+    reloads = 0
+
+    def _load_page(self, name, config):
+        self.reloads += 1
+        self.loaded_at[name] = time.time()
+
+def watcher_for(reads, **kwargs):
+    watcher = LoadedWatcher(FakeScraper(reads), **kwargs)
+    watcher.session = SimpleNamespace(driver=None)
+    watcher.loaded_at['sportsbet'] = time.time()
+    return watcher
+
+def test_empty_read_keeps_prices_until_max_empty_reads():
+    later = time.time() + 3600
+    listed = [record('Carlton', 'Collingwood', 2.1, 1.8, later)]
+    watcher = watcher_for([listed, [], [], []], max_empty_reads=3)
+    watcher.poll_once()
+
+    assert watcher.poll_once() == []
+    assert watcher.poll_once() == []
+    assert len(watcher.records['sportsbet']) == 1
+    # Each empty read forces a reload before the next poll
+    assert watcher.reloads == 1
+
+    dropped = watcher.poll_once()
+    assert {delta.new_price for delta in dropped} == {None}
+    assert watcher.records['sportsbet'] == {}
+
+def test_retained_prices_drop_at_kickoff():
+    now = time.time()
+    started = record('Carlton', 'Collingwood', 2.1, 1.8, now - 60)
+    upcoming = record('Geelong', 'Hawthorn', 1.5, 2.6, now + 3600)
+    watcher = watcher_for([[started, upcoming], []], max_empty_reads=5)
+    watcher.poll_once()
+
+    deltas = watcher.poll_once()
+    assert {(delta.home_team, delta.new_price) for delta in deltas} == {('Carlton', None)}
+    assert [r['home_team'] for r in watcher.records['sportsbet'].values()] == ['Geelong']
+
+def test_listed_read_resets_the_empty_count():
+    later = time.time() + 3600
+    listed = [record('Carlton', 'Collingwood', 2.1, 1.8, later)]
+    watcher = watcher_for([listed, [], listed, [], []], max_empty_reads=2)
+    for _ in range(4):
+        watcher.poll_once()
+    assert len(watcher.records['sportsbet']) == 1
+    watcher.poll_once()
+    assert watcher.records['sportsbet'] == {}
@@ -0,0 +1,53 @@
+"""
+Tests for the streamed opportunity sinks: the top-K heap and the JSON Lines file
+"""
+
+import json
+
+from main_hedge_analysis import BettingOpportunity, JsonlOpportunitySink, TopOpportunities
+
+def opportunity(match, roi):
+    return BettingOpportunity(
+        match=match, home_team='Carlton', away_team='Essendon', opportunity_type='arbitrage',
+        profit_percentage=roi, stake_distribution={'sportsbet': {'team': 'Carlton', 'amount': 60.0, 'odds': 1.55}},
+        total_stake=100.0, guaranteed_profit=roi, roi=roi)
+
+def test_top_k_keeps_the_best_and_evicts_the_worst():
+    top = TopOpportunities(k=3)
+    for match, roi in (('a', 1.0), ('b', 4.0), ('c', 2.0), ('d', 0.5), ('e', 3.0)):
+        top.push(opportunity(match, roi))
+    assert [opp.match for opp in top.sorted()] == ['b', 'e', 'c']
+    assert (len(top), top.seen) == (3, 5)
+
+def test_top_k_ties_keep_the_earliest():
+    top = TopOpportunities(k=2)
+    for match in ('first', 'second', 'third'):
+        top.push(opportunity(match, 2.0))
+    assert [opp.match for opp in top.sorted()] == ['first', 'second']
+
+def test_top_k_matches_a_stable_sort():
+    rois = [1.5, 3.0, 1.5, 0.2, 3.0, 2.2, 1.5, 4.1]
+    opportunities = [opportunity(str(i), roi) for i, roi in enumerate(rois)]
+    top = TopOpportunities(k=4)
+    for opp in opportunities:
+        top.push(opp)
+    assert top.sorted() == sorted(opportunities, key=lambda opp: opp.roi, reverse=True)[:4]
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / 'opportunities.jsonl'
+    written = [opportunity('Carlton vs Essendon', 1.7), opportunity('Hawthorn vs Adelaide Crows', 2.3)]
+    with JsonlOpportunitySink(str(path)) as sink:
+        for opp in written:
+            sink.write(opp)
+    assert sink.count == 2
+    
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert all('timestamp' in row for row in rows)
+    assert [BettingOpportunity(**{k: v for k, v in row.items() if k != 'timestamp'}) for row in rows] == written
+
+def test_jsonl_sink_appends(tmp_path):
+    path = tmp_path / 'opportunities.jsonl'
+    for match in ('first run', 'second run'):
+        with JsonlOpportunitySink(str(path)) as sink:
+            sink.write(opportunity(match, 1.0))
+    assert [json.loads(line)['match'] for line in path.read_text().splitlines()] == ['first run', 'second run']
@@ -0,0 +1,43 @@
+"""
+Tests for the crossed home/away price check over saved snapshots
+"""
+
+import contextlib
+import io
+import json
+
+from afl_orientation import crossed_books, has_arbitrage, home_probability, validate_snapshots
+
+def match(**odds):
+    return {'home_team': 'Carlton', 'away_team': 'Essendon',
+            'odds': {book: {'home': home, 'away': away} for book, (home, away) in odds.items()}}
+
+def test_home_probability_removes_the_margin():
+    assert abs(home_probability({'home': 1.9, 'away': 1.9}) - 0.5) < 1e-12
+    assert home_probability({'home': 1.9, 'away': None}) is None
+
+def test_one_crossed_book_among_three():
+    assert crossed_books(match(sportsbet=(1.4, 2.96), ladbrokes=(2.8, 1.44), pointsbet=(1.42, 2.9))) == ['ladbrokes']
+    assert crossed_books(match(sportsbet=(1.4, 2.96), ladbrokes=(1.44, 2.8), pointsbet=(1.42, 2.9))) == []
+
+def test_two_books_disagreeing_is_ambiguous():
+    assert crossed_books(match(sportsbet=(1.4, 2.96), ladbrokes=(2.8, 1.44))) is None
+    assert crossed_books(match(sportsbet=(1.9, 1.94), ladbrokes=(1.95, 1.85))) == []
+
+def test_has_arbitrage():
+    assert has_arbitrage(match(sportsbet=(1.4, 2.96), ladbrokes=(2.8, 1.44))['odds'])
+    assert not has_arbitrage(match(sportsbet=(1.4, 2.96), ladbrokes=(1.44, 2.8))['odds'])
+
+def test_validate_snapshots(tmp_path):
+    old = match(sportsbet=(1.4, 2.96), ladbrokes=(2.8, 1.44), pointsbet=(1.42, 2.9))
+    realigned = dict(match(sportsbet=(1.4, 2.96), ladbrokes=(1.44, 2.8)), realigned=['ladbrokes'])
+    ambiguous = match(sportsbet=(1.4, 2.96), pointsbet=(2.9, 1.42))
+    (tmp_path / 'a.json').write_text(json.dumps({'matches': [old, realigned, ambiguous]}))
+    (tmp_path / 'b.json').write_text('not json')
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = validate_snapshots([str(tmp_path / 'a.json'), str(tmp_path / 'b.json')])
+    assert (report['files'], report['unreadable'], report['matches']) == (1, 1, 3)
+    assert (report['ambiguous'], report['phantom_arbitrage']) == (1, 1)
+    assert report['books']['ladbrokes'] == {'quotes': 2, 'realigned': 1, 'suspected': 1}
+    assert report['books']['pointsbet'] == {'quotes': 2, 'realigned': 0, 'suspected': 0}
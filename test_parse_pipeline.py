@@ -0,0 +1,66 @@
+"""
+Tests for the fetch/parse overlap pipeline
+"""
+
+import contextlib
+import io
+import threading
+
+from afl_parse_pipeline import ParsePipeline
+
+def run(pipeline, pages):
+    with contextlib.redirect_stdout(io.StringIO()):
+        with pipeline:
+            for name, source in pages:
+                pipeline.submit(name, source)
+    return pipeline
+
+def test_single_worker_parses_in_submission_order():
+    order = []
+    
+    def parse(name, source):
+        order.append(name)
+        return [{'home_team': source}]
+    
+    pages = [('sportsbet', 'a'), ('ladbrokes', 'b'), ('pointsbet', 'c')]
+    pipeline = run(ParsePipeline(parse, workers=1, max_pending=1), pages)
+    assert order == ['sportsbet', 'ladbrokes', 'pointsbet']
+    assert pipeline.results == {'sportsbet': [{'home_team': 'a'}], 'ladbrokes': [{'home_team': 'b'}],
+                                'pointsbet': [{'home_team': 'c'}]}
+    assert pipeline.report()['parsed'] == 3
+
+def test_results_keyed_by_page_whatever_order_workers_finish():
+    first_may_finish = threading.Event()
+    
+    def parse(name, source):
+        # The first page finishes only after the second one has
+        if name == 'sportsbet':
+            first_may_finish.wait(5)
+        else:
+            first_may_finish.set()
+        return [{'source': source}]
+    
+    pipeline = run(ParsePipeline(parse, workers=2), [('sportsbet', 'a'), ('ladbrokes', 'b')])
+    assert pipeline.results == {'sportsbet': [{'source': 'a'}], 'ladbrokes': [{'source': 'b'}]}
+
+def test_parse_error_is_recorded_and_later_pages_still_parse():
+    failure = ValueError("card layout changed")
+    
+    def parse(name, source):
+        if name == 'ladbrokes':
+            raise failure
+        return [{'source': source}]
+    
+    pages = [('sportsbet', 'a'), ('ladbrokes', 'b'), ('pointsbet', 'c')]
+    pipeline = run(ParsePipeline(parse, workers=1), pages)
+    assert pipeline.results['ladbrokes'] == []
+    assert pipeline.errors == {'ladbrokes': failure}
+    assert pipeline.results['pointsbet'] == [{'source': 'c'}]
+    assert (pipeline.report()['parsed'], pipeline.report()['errors']) == (2, 1)
+
+def test_put_result_needs_no_parse():
+    pipeline = ParsePipeline(lambda name, source: [])
+    with pipeline:
+        pipeline.put_result('sportsbet', [{'source': 'feed'}], fetch_seconds=0.5)
+    assert pipeline.results == {'sportsbet': [{'source': 'feed'}]}
+    assert pipeline.report()['submitted'] == 0
@@ -0,0 +1,102 @@
+"""
+Tests for the per-domain token buckets and the adaptive refresh scheduler
+"""
+
+import pytest
+
+import afl_scheduler
+from afl_odds_watch import OddsDelta
+from afl_scheduler import DomainRateLimiter, RefreshScheduler, TokenBucket
+from afl_teams import TeamRegistry
+
+class FakeClock:
+    """Stands in for the time module: sleeping advances the clock instead of blocking"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def time(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(afl_scheduler, 'time', clock)
+    return clock
+
+def test_bucket_spends_its_burst_then_blocks(clock):
+    bucket = TokenBucket(rate=0.5, capacity=2)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(2.0)
+    assert clock.slept == [pytest.approx(2.0)]
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60
+    assert [bucket.acquire(), bucket.acquire()] == [0, 0]
+    assert bucket.acquire(timeout=0.5) is None
+    assert clock.slept == []
+
+def test_rate_limiter_keeps_one_bucket_per_domain(clock):
+    limiter = DomainRateLimiter(requests_per_minute=6, burst=1)
+    assert limiter.acquire('https://www.sportsbet.com.au/betting/afl')
+    assert limiter.acquire('https://www.ladbrokes.com.au/sports/afl')
+    assert not limiter.acquire('https://sportsbet.com.au/other', timeout=1)
+    assert set(limiter.buckets) == {'sportsbet.com.au', 'ladbrokes.com.au'}
+
+def record(home, away, kickoff_ts):
+    return {'home_team': home, 'away_team': away, 'kickoff_ts': kickoff_ts}
+
+def moved(key, count):
+    return [OddsDelta(key, 'sportsbet', 'home', 'Carlton', 'Essendon', 2.0, 2.1)] * count
+
+@pytest.fixture
+def scheduler():
+    teams = TeamRegistry()
+    return RefreshScheduler(teams.match_key, min_interval=5, max_interval=600, default_interval=60)
+
+def test_interval_tightens_towards_kickoff(scheduler):
+    now = 0.0
+    for minutes_out, interval in ((24 * 60, 600), (60, 60), (20, 20), (2, 5)):
+        scheduler.filter_active('sportsbet', [record('Carlton', 'Essendon', now + minutes_out * 60)], now)
+        assert scheduler.observe('sportsbet', [], now) == pytest.approx(interval)
+
+def test_unknown_kickoff_and_empty_page(scheduler):
+    scheduler.filter_active('sportsbet', [record('Carlton', 'Essendon', None)], 0)
+    assert scheduler.observe('sportsbet', [], 0) == 60
+    scheduler.filter_active('ladbrokes', [], 0)
+    assert scheduler.observe('ladbrokes', [], 0) == 600
+
+def test_price_moves_tighten_then_back_off(scheduler):
+    key = scheduler.match_key('Carlton', 'Essendon')
+    scheduler.filter_active('sportsbet', [record('Carlton', 'Essendon', 3600)], 0)
+    assert scheduler.observe('sportsbet', [], 0) == 60
+    # 10 moves in the 10-minute window is one a minute: the interval halves
+    assert scheduler.observe('sportsbet', moved(key, 10), 0) == pytest.approx(30)
+    # Once the moves age out of the window the interval relaxes to the kickoff-driven one
+    assert scheduler.observe('sportsbet', [], 601) == pytest.approx((3600 - 601) / 60)
+
+def test_started_matches_leave_the_schedule(scheduler):
+    kept = scheduler.filter_active('sportsbet', [record('Carlton', 'Essendon', 100),
+                                                 record('Geelong', 'Hawthorn', 7200)], now=200)
+    assert [r['home_team'] for r in kept] == ['Geelong']
+    scheduler.observe('sportsbet', [], 200)
+    assert scheduler.report()['sportsbet']['dropped_started'] == 1
+
+def test_due_most_overdue_first(scheduler):
+    scheduler.add_page('sportsbet', now=10)
+    scheduler.add_page('ladbrokes', now=5)
+    scheduler.add_page('pointsbet', now=50)
+    assert scheduler.due(now=20) == ['ladbrokes', 'sportsbet']
+    assert scheduler.seconds_until_next(now=20) == 0
@@ -0,0 +1,43 @@
+"""
+Tests for the alias-indexed team registry
+"""
+
+from afl_teams import TeamRegistry, split_competition
+
+def test_aliases_share_one_team_id():
+    registry = TeamRegistry()
+    assert registry.team_id('Sydney Swans') == registry.team_id('Swans') == registry.team_id('Sydney')
+    assert registry.team_id('GWS Giants') == registry.team_id('Greater Western Sydney')
+
+def test_abbreviated_names_join_the_senior_club():
+    registry = TeamRegistry()
+    bulldogs = registry.team_id('Western Bulldogs')
+    assert registry.team_id('W Bulldogs') == bulldogs
+    assert registry.team_id('W. Bulldogs') == bulldogs
+    assert registry.team_id('Nth Melbourne') == registry.team_id('North Melbourne')
+    assert registry.name(bulldogs) == 'Western Bulldogs'
+
+def test_leading_w_is_not_a_competition_marker():
+    assert split_competition('w bulldogs') == ('w bulldogs', None)
+    assert split_competition('carlton w') == ('carlton', 'AFLW')
+
+def test_womens_and_vfl_sides_get_their_own_ids():
+    registry = TeamRegistry()
+    carlton = registry.team_id('Carlton')
+    womens = registry.team_id('Carlton W')
+    assert womens != carlton
+    assert registry.team_id('Carlton (W)') == womens
+    assert registry.name(womens) == 'Carlton AFLW'
+    assert registry.team_id('Bulldogs W') != registry.team_id('Bulldogs')
+    assert registry.name(registry.team_id('Brisbane Lions AFLW')) == 'Brisbane AFLW'
+    assert registry.team_id('Carlton VFL') not in (carlton, womens)
+
+def test_misspelling_joins_club_but_extra_words_do_not():
+    registry = TeamRegistry()
+    assert registry.team_id('Collingwod') == registry.team_id('Collingwood')
+    assert 'Collingwod' in registry.fuzzy_matches
+    assert registry.team_id('Adelaide United') != registry.team_id('Adelaide')
+
+def test_match_key_ignores_orientation():
+    registry = TeamRegistry()
+    assert registry.match_key('Geelong Cats', 'Hawks') == registry.match_key('Hawthorn', 'Geelong')